@@ -10,7 +10,7 @@ from app.config import settings
 from app.core.database import Base
 
 # Import all models to ensure they're registered with Base
-from app.models import Country, Pillar, Dimension, Indicator, IndicatorValue, AIInsight
+from app.models import Country, Pillar, Dimension, Indicator, IndicatorValue, IndicatorFact, AIInsight
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
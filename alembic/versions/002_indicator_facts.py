@@ -0,0 +1,72 @@
+"""Denormalized indicator_facts table for join-free filter queries
+
+Revision ID: 002_indicator_facts
+Revises: 001_initial_schema
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '002_indicator_facts'
+down_revision: Union[str, None] = '001_initial_schema'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'indicator_facts',
+        sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column('country_id', sa.Integer(), nullable=False),
+        sa.Column('indicator_id', sa.Integer(), nullable=False),
+        sa.Column('dimension_id', sa.Integer(), nullable=False),
+        sa.Column('pillar_id', sa.Integer(), nullable=False),
+        sa.Column('year', sa.Integer(), nullable=False),
+        sa.Column('value', sa.DECIMAL(precision=15, scale=4), nullable=True),
+        sa.Column('confidence_score', sa.DECIMAL(precision=3, scale=2), nullable=True),
+        sa.Column('country_code', sa.String(length=3), nullable=False),
+        sa.Column('country_name', sa.String(length=255), nullable=False),
+        sa.Column('latitude', sa.DECIMAL(precision=9, scale=6), nullable=True),
+        sa.Column('longitude', sa.DECIMAL(precision=9, scale=6), nullable=True),
+        sa.Column('indicator_name', sa.String(length=255), nullable=False),
+        sa.Column('unit', sa.String(length=100), nullable=True),
+        sa.Column('dimension_name', sa.String(length=255), nullable=False),
+        sa.Column('pillar_name', sa.String(length=255), nullable=False),
+        sa.Column('is_active', sa.Boolean(), nullable=False),
+        sa.Column('source_updated_at', sa.TIMESTAMP(), nullable=True),
+        sa.Column('refreshed_at', sa.TIMESTAMP(), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('idx_indicator_facts_indicator_year', 'indicator_facts', ['indicator_id', 'year'])
+    op.create_index('idx_indicator_facts_pillar_dimension', 'indicator_facts', ['pillar_id', 'dimension_id'])
+    op.create_index('idx_indicator_facts_country_code', 'indicator_facts', ['country_code'])
+    op.create_index('idx_indicator_facts_source_updated_at', 'indicator_facts', ['source_updated_at'])
+
+    # Initial population; later changes are applied by scripts/refresh_indicator_facts.py
+    op.execute("""
+        INSERT INTO indicator_facts (
+            id, country_id, indicator_id, dimension_id, pillar_id, year, value,
+            confidence_score, country_code, country_name, latitude, longitude,
+            indicator_name, unit, dimension_name, pillar_name, is_active,
+            source_updated_at, refreshed_at
+        )
+        SELECT
+            v.id, v.country_id, v.indicator_id, d.id, p.id, v.year, v.value,
+            v.confidence_score, c.code, c.name, c.latitude, c.longitude,
+            i.name, i.unit, d.name, p.name, COALESCE(i.is_active, true),
+            GREATEST(v.updated_at, c.updated_at, i.updated_at, d.updated_at, p.updated_at),
+            now()
+        FROM indicator_values v
+        JOIN countries c ON v.country_id = c.id
+        JOIN indicators i ON v.indicator_id = i.id
+        JOIN dimensions d ON i.dimension_id = d.id
+        JOIN pillars p ON d.pillar_id = p.id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('indicator_facts')
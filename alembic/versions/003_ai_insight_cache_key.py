@@ -0,0 +1,28 @@
+"""Hash-based cache key on ai_insights
+
+Revision ID: 003_ai_insight_cache_key
+Revises: 002_indicator_facts
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '003_ai_insight_cache_key'
+down_revision: Union[str, None] = '002_indicator_facts'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Existing rows keep a NULL key: they were cached without all filters and are never matched
+    op.add_column('ai_insights', sa.Column('cache_key', sa.String(length=64), nullable=True))
+    op.create_index('idx_ai_insights_cache_key', 'ai_insights', ['cache_key'], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_index('idx_ai_insights_cache_key', table_name='ai_insights')
+    op.drop_column('ai_insights', 'cache_key')
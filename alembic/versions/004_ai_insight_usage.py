@@ -0,0 +1,26 @@
+"""Token and latency accounting on ai_insights
+
+Revision ID: 004_ai_insight_usage
+Revises: 003_ai_insight_cache_key
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+# revision identifiers, used by Alembic.
+revision: str = '004_ai_insight_usage'
+down_revision: Union[str, None] = '003_ai_insight_cache_key'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('ai_insights', sa.Column('usage', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('ai_insights', 'usage')
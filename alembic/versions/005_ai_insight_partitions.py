@@ -0,0 +1,159 @@
+"""Range-partition ai_insights by month on generated_at
+
+Revision ID: 005_ai_insight_partitions
+Revises: 004_ai_insight_usage
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '005_ai_insight_partitions'
+down_revision: Union[str, None] = '004_ai_insight_usage'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = (
+    "id, insight_type, country_id, indicator_id, pillar_id, dimension_id, year_start, "
+    "year_end, filter_params, cache_key, insight_text, confidence_score, model_version, "
+    "usage, generated_at, expires_at, user_feedback, created_at, updated_at"
+)
+
+# Partitions created ahead of time; the insight sweeper keeps this many from then on
+MONTHS_AHEAD = 3
+
+
+def _create_indexes() -> None:
+    op.create_index('idx_ai_insights_insight_type', 'ai_insights', ['insight_type'])
+    op.create_index('idx_ai_insights_country_id', 'ai_insights', ['country_id'])
+    op.create_index('idx_ai_insights_indicator_id', 'ai_insights', ['indicator_id'])
+    op.create_index('idx_ai_insights_generated_at', 'ai_insights', ['generated_at'])
+    op.create_index('idx_ai_insights_filter_params', 'ai_insights', ['filter_params'], postgresql_using='gin')
+
+
+def upgrade() -> None:
+    # Keep the id sequence (and so the ids) when the old table goes
+    op.execute("ALTER SEQUENCE ai_insights_id_seq OWNED BY NONE")
+    op.rename_table('ai_insights', 'ai_insights_unpartitioned')
+    op.execute("ALTER INDEX ai_insights_pkey RENAME TO ai_insights_unpartitioned_pkey")
+
+    # The partition key must be part of the primary key, and cache_key can no
+    # longer be unique: single-flight generation keeps one row per key instead
+    op.execute("""
+        CREATE TABLE ai_insights (
+            id INTEGER NOT NULL DEFAULT nextval('ai_insights_id_seq'),
+            insight_type VARCHAR(50) NOT NULL,
+            country_id INTEGER REFERENCES countries (id) ON DELETE CASCADE,
+            indicator_id INTEGER REFERENCES indicators (id) ON DELETE CASCADE,
+            pillar_id INTEGER REFERENCES pillars (id) ON DELETE CASCADE,
+            dimension_id INTEGER REFERENCES dimensions (id) ON DELETE CASCADE,
+            year_start INTEGER,
+            year_end INTEGER,
+            filter_params JSONB,
+            cache_key VARCHAR(64),
+            insight_text TEXT NOT NULL,
+            confidence_score NUMERIC(3, 2),
+            model_version VARCHAR(100),
+            usage JSONB,
+            generated_at TIMESTAMP NOT NULL DEFAULT now(),
+            expires_at TIMESTAMP,
+            user_feedback INTEGER,
+            created_at TIMESTAMP DEFAULT now(),
+            updated_at TIMESTAMP DEFAULT now(),
+            PRIMARY KEY (id, generated_at)
+        ) PARTITION BY RANGE (generated_at)
+    """)
+    op.execute("ALTER SEQUENCE ai_insights_id_seq OWNED BY ai_insights.id")
+
+    # One partition per month from the oldest insight to a few months ahead,
+    # plus a default one so an insert never fails for want of a partition
+    op.execute(f"""
+        DO $$
+        DECLARE
+            month date;
+        BEGIN
+            FOR month IN
+                SELECT generate_series(
+                    date_trunc('month', LEAST(
+                        (SELECT min(COALESCE(generated_at, created_at)) FROM ai_insights_unpartitioned),
+                        now()
+                    )),
+                    date_trunc('month', now()) + interval '{MONTHS_AHEAD} months',
+                    interval '1 month'
+                )::date
+            LOOP
+                EXECUTE format(
+                    'CREATE TABLE %I PARTITION OF ai_insights FOR VALUES FROM (%L) TO (%L)',
+                    'ai_insights_p' || to_char(month, 'YYYYMM'),
+                    month,
+                    (month + interval '1 month')::date
+                );
+            END LOOP;
+        END $$
+    """)
+    op.execute("CREATE TABLE ai_insights_default PARTITION OF ai_insights DEFAULT")
+
+    op.execute(f"""
+        INSERT INTO ai_insights ({COLUMNS})
+        SELECT {COLUMNS.replace('generated_at', "COALESCE(generated_at, created_at, now())")}
+        FROM ai_insights_unpartitioned
+    """)
+    op.drop_table('ai_insights_unpartitioned')
+
+    _create_indexes()
+    op.create_index('idx_ai_insights_cache_key', 'ai_insights', ['cache_key'])
+    op.create_index('idx_ai_insights_expires_at', 'ai_insights', ['expires_at'])
+
+
+def downgrade() -> None:
+    op.execute("ALTER SEQUENCE ai_insights_id_seq OWNED BY NONE")
+    op.rename_table('ai_insights', 'ai_insights_partitioned')
+    for index in (
+        'idx_ai_insights_insight_type', 'idx_ai_insights_country_id', 'idx_ai_insights_indicator_id',
+        'idx_ai_insights_generated_at', 'idx_ai_insights_filter_params',
+        'idx_ai_insights_cache_key', 'idx_ai_insights_expires_at',
+    ):
+        op.drop_index(index, table_name='ai_insights_partitioned')
+    op.execute(
+        "ALTER TABLE ai_insights_partitioned "
+        "RENAME CONSTRAINT ai_insights_pkey TO ai_insights_partitioned_pkey"
+    )
+
+    op.execute("""
+        CREATE TABLE ai_insights (
+            id INTEGER NOT NULL DEFAULT nextval('ai_insights_id_seq') PRIMARY KEY,
+            insight_type VARCHAR(50) NOT NULL,
+            country_id INTEGER REFERENCES countries (id) ON DELETE CASCADE,
+            indicator_id INTEGER REFERENCES indicators (id) ON DELETE CASCADE,
+            pillar_id INTEGER REFERENCES pillars (id) ON DELETE CASCADE,
+            dimension_id INTEGER REFERENCES dimensions (id) ON DELETE CASCADE,
+            year_start INTEGER,
+            year_end INTEGER,
+            filter_params JSONB,
+            cache_key VARCHAR(64),
+            insight_text TEXT NOT NULL,
+            confidence_score NUMERIC(3, 2),
+            model_version VARCHAR(100),
+            usage JSONB,
+            generated_at TIMESTAMP DEFAULT now(),
+            expires_at TIMESTAMP,
+            user_feedback INTEGER,
+            created_at TIMESTAMP DEFAULT now(),
+            updated_at TIMESTAMP DEFAULT now()
+        )
+    """)
+    op.execute("ALTER SEQUENCE ai_insights_id_seq OWNED BY ai_insights.id")
+
+    # The unique cache key index comes back, so keep only the newest row per key
+    op.execute(f"""
+        INSERT INTO ai_insights ({COLUMNS})
+        SELECT DISTINCT ON (COALESCE(cache_key, id::text)) {COLUMNS}
+        FROM ai_insights_partitioned
+        ORDER BY COALESCE(cache_key, id::text), generated_at DESC
+    """)
+    op.execute("DROP TABLE ai_insights_partitioned")
+
+    _create_indexes()
+    op.create_index('idx_ai_insights_cache_key', 'ai_insights', ['cache_key'], unique=True)
@@ -0,0 +1,43 @@
+"""Unique (cache_key, generated_at) index on ai_insights
+
+Revision ID: 006_ai_insight_unique_key
+Revises: 005_ai_insight_partitions
+Create Date: 2026-10-18
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision: str = '006_ai_insight_unique_key'
+down_revision: Union[str, None] = '005_ai_insight_partitions'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Keep the highest id of rows stored for the same key at the same instant
+    op.execute("""
+        DELETE FROM ai_insights a
+        USING ai_insights b
+        WHERE a.cache_key = b.cache_key
+          AND a.generated_at = b.generated_at
+          AND a.id < b.id
+    """)
+    op.drop_index('idx_ai_insights_cache_key', table_name='ai_insights')
+    # Includes the partition key, so it can be unique on the partitioned table;
+    # also serves the newest-row-per-key lookups. It doesn't make cache_key
+    # unique on its own: single-flight generation keeps a key to one row, and
+    # the insight sweeper deletes all but the newest row of any that slip by
+    op.create_index(
+        'idx_ai_insights_cache_key_generated_at',
+        'ai_insights',
+        ['cache_key', 'generated_at'],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('idx_ai_insights_cache_key_generated_at', table_name='ai_insights')
+    op.create_index('idx_ai_insights_cache_key', 'ai_insights', ['cache_key'])
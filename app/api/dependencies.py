@@ -1,29 +1,77 @@
 """API dependencies."""
 
-from fastapi import Depends
-from sqlalchemy.orm import Session
-from app.core.database import get_db
-from app.services.country_service import CountryService
-from app.services.indicator_service import IndicatorService
-from app.services.filter_service import FilterService
-from app.services.ai_service import AIService
+from fastapi import Depends, HTTPException, Request, Response, status
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.config import settings
+from app.core import data_version
+from app.core.conditional import Validators, validators_for, is_not_modified
+from app.core.database import get_async_db
+from app.services.country_service import AsyncCountryService
+from app.services.indicator_service import AsyncIndicatorService
+from app.services.filter_service import AsyncFilterService
+from app.services.ai_service import AsyncAIService
+from app.services.export_service import AsyncExportService
+from app.services.indicator_cube import cube_manager
 
 
-def get_country_service(db: Session = Depends(get_db)) -> CountryService:
+def get_country_service(db: AsyncSession = Depends(get_async_db)) -> AsyncCountryService:
     """Get country service dependency."""
-    return CountryService(db)
+    return AsyncCountryService(db)
 
 
-def get_indicator_service(db: Session = Depends(get_db)) -> IndicatorService:
+def get_indicator_service(db: AsyncSession = Depends(get_async_db)) -> AsyncIndicatorService:
     """Get indicator service dependency."""
-    return IndicatorService(db)
+    return AsyncIndicatorService(db)
 
 
-def get_filter_service(db: Session = Depends(get_db)) -> FilterService:
+def get_filter_service(db: AsyncSession = Depends(get_async_db)) -> AsyncFilterService:
     """Get filter service dependency."""
-    return FilterService(db)
+    return AsyncFilterService(db)
 
 
-def get_ai_service(db: Session = Depends(get_db)) -> AIService:
+def get_ai_service(db: AsyncSession = Depends(get_async_db)) -> AsyncAIService:
     """Get AI service dependency."""
-    return AIService(db)
+    return AsyncAIService(db)
+
+
+def get_export_service(db: AsyncSession = Depends(get_async_db)) -> AsyncExportService:
+    """Get export service dependency."""
+    return AsyncExportService(db)
+
+
+async def detect_outside_writes(db: AsyncSession = Depends(get_async_db)) -> None:
+    """
+    Dependency bumping the dataset version after writes made outside the ORM.
+
+    Responses served from validators or the response cache never reach the
+    cube, which is what otherwise notices such writes. The table fingerprint
+    is compared at most every ``CUBE_REFRESH_SECONDS``.
+    """
+    await db.run_sync(cube_manager.check_outside_writes)
+
+
+def conditional_get(max_age: int | None = None):
+    """
+    Dependency answering conditional GETs from the dataset version.
+
+    Returns 304 Not Modified (via HTTPException) when the client's copy is
+    current, before the endpoint runs; declare it first so no other
+    dependency does work for nothing. Otherwise sets ETag, Last-Modified and
+    Cache-Control on the response and returns the validators; endpoints that
+    return a Response object themselves must copy ``validators.headers``.
+    """
+    async def dependency(
+        request: Request,
+        response: Response,
+        _: None = Depends(detect_outside_writes),
+    ) -> Validators:
+        await data_version.refresh()
+        validators = validators_for(
+            request, settings.HTTP_CACHE_MAX_AGE_SECONDS if max_age is None else max_age
+        )
+        if is_not_modified(request, validators):
+            raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers=validators.headers)
+        response.headers.update(validators.headers)
+        return validators
+
+    return dependency
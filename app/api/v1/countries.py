@@ -2,8 +2,9 @@
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from app.schemas.country import Country, CountryList
-from app.services.country_service import CountryService
+from app.services.country_service import AsyncCountryService
 from app.api.dependencies import get_country_service
+from app.core.responses import FastJSONResponse, dump_trusted, trusted_response
 
 router = APIRouter()
 
@@ -12,24 +13,27 @@ router = APIRouter()
 async def list_countries(
     skip: int = 0,
     limit: int = 100,
-    service: CountryService = Depends(get_country_service),
+    service: AsyncCountryService = Depends(get_country_service),
 ):
     """Get list of all countries."""
-    countries = service.get_all(skip=skip, limit=limit)
-    total = service.count()
-    return CountryList(countries=countries, total=total)
+    countries = await service.get_all(skip=skip, limit=limit)
+    total = await service.count()
+    return FastJSONResponse({
+        "countries": [dump_trusted(Country, country) for country in countries],
+        "total": total,
+    })
 
 
 @router.get("/countries/{country_code}", response_model=Country)
 async def get_country(
     country_code: str,
-    service: CountryService = Depends(get_country_service),
+    service: AsyncCountryService = Depends(get_country_service),
 ):
     """Get country by code."""
-    country = service.get_by_code(country_code)
+    country = await service.get_by_code(country_code)
     if not country:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Country with code '{country_code}' not found",
         )
-    return country
+    return trusted_response(Country, country)
@@ -1,16 +1,39 @@
 """Indicators API endpoints."""
 
+import csv
+import io
+from typing import AsyncIterator
+
 from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi.responses import Response, StreamingResponse
 from app.schemas.indicator import (
     Pillar,
     Dimension,
     Indicator,
     IndicatorValueWithDetails,
 )
-from app.schemas.filter import FilterParams, MapDataParams
-from app.services.indicator_service import IndicatorService
-from app.services.filter_service import FilterService
-from app.api.dependencies import get_indicator_service, get_filter_service
+from app.schemas.filter import (
+    FilterParams,
+    MapDataParams,
+    CountMode,
+    MapFormat,
+    encode_cursor,
+    decode_cursor,
+)
+from app.services.indicator_service import AsyncIndicatorService
+from app.services.filter_service import AsyncFilterService, columnar_map_data
+from app.services.export_service import AsyncExportService, ExportFormat, MEDIA_TYPES
+from app.api.dependencies import (
+    get_indicator_service,
+    get_filter_service,
+    get_export_service,
+    conditional_get,
+    detect_outside_writes,
+)
+from app.core.conditional import Validators
+from app.core.cache import response_cache
+from app.core.database import AsyncSessionLocal
+from app.core.responses import FastJSONResponse, trusted_response
 
 router = APIRouter()
 
@@ -18,54 +41,62 @@ router = APIRouter()
 # Pillar endpoints
 @router.get("/pillars", response_model=list[Pillar])
 async def list_pillars(
-    service: IndicatorService = Depends(get_indicator_service),
+    validators: Validators = Depends(conditional_get()),
+    service: AsyncIndicatorService = Depends(get_indicator_service),
 ):
     """Get list of all pillars."""
-    return service.get_all_pillars()
+    pillars = await service.get_all_pillars()
+    return trusted_response(Pillar, pillars, headers=validators.headers)
 
 
 @router.get("/pillars/{pillar_id}/dimensions", response_model=list[Dimension])
 async def get_pillar_dimensions(
     pillar_id: int,
-    service: IndicatorService = Depends(get_indicator_service),
+    validators: Validators = Depends(conditional_get()),
+    service: AsyncIndicatorService = Depends(get_indicator_service),
 ):
     """Get dimensions for a specific pillar."""
-    pillar = service.get_pillar_by_id(pillar_id)
+    pillar = await service.get_pillar_by_id(pillar_id)
     if not pillar:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Pillar with ID {pillar_id} not found",
         )
-    return service.get_dimensions_by_pillar(pillar_id)
+    dimensions = await service.get_dimensions_by_pillar(pillar_id)
+    return trusted_response(Dimension, dimensions, headers=validators.headers)
 
 
 # Dimension endpoints
 @router.get("/dimensions/{dimension_id}/indicators", response_model=list[Indicator])
 async def get_dimension_indicators(
     dimension_id: int,
-    service: IndicatorService = Depends(get_indicator_service),
+    validators: Validators = Depends(conditional_get()),
+    service: AsyncIndicatorService = Depends(get_indicator_service),
 ):
     """Get indicators for a specific dimension."""
-    dimension = service.get_dimension_by_id(dimension_id)
+    dimension = await service.get_dimension_by_id(dimension_id)
     if not dimension:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Dimension with ID {dimension_id} not found",
         )
-    return service.get_indicators_by_dimension(dimension_id)
+    indicators = await service.get_indicators_by_dimension(dimension_id)
+    return trusted_response(Indicator, indicators, headers=validators.headers)
 
 
 # Indicator endpoints
 @router.get("/indicators", response_model=list[Indicator])
 async def list_indicators(
-    service: IndicatorService = Depends(get_indicator_service),
+    validators: Validators = Depends(conditional_get()),
+    service: AsyncIndicatorService = Depends(get_indicator_service),
 ):
     """Get list of all active indicators."""
-    return service.get_all_active_indicators()
+    indicators = await service.get_all_active_indicators()
+    return trusted_response(Indicator, indicators, headers=validators.headers)
 
 
 # Indicator values with filtering (must come before /indicators/{indicator_id})
-@router.get("/indicators/values")
+@router.get("/indicators/values", dependencies=[Depends(detect_outside_writes)])
 async def get_indicator_values(
     pillar_id: int | None = Query(None),
     dimension_id: int | None = Query(None),
@@ -75,9 +106,28 @@ async def get_indicator_values(
     year_end: int | None = Query(None, ge=1900, le=2100),
     limit: int = Query(100, ge=1, le=1000),
     offset: int = Query(0, ge=0),
-    service: FilterService = Depends(get_filter_service),
+    cursor: str | None = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    count: CountMode = Query("exact", description="Total: exact, planner estimate, or none"),
+    service: AsyncFilterService = Depends(get_filter_service),
 ):
-    """Get indicator values with comprehensive filtering."""
+    """
+    Get indicator values with comprehensive filtering.
+
+    Rows are ordered by ID. Pass the returned ``next_cursor`` as ``cursor`` to
+    fetch the next page with keyset pagination; ``offset`` is ignored when a
+    cursor is given. Use ``count=estimate`` or ``count=none`` to avoid an
+    exact count over large result sets.
+    """
+    after_id = None
+    if cursor:
+        try:
+            after_id = decode_cursor(cursor)
+        except ValueError:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid pagination cursor",
+            )
+
     filters = FilterParams(
         pillar_id=pillar_id,
         dimension_id=dimension_id,
@@ -87,46 +137,189 @@ async def get_indicator_values(
         year_end=year_end,
         limit=limit,
         offset=offset,
+        after_id=after_id,
     )
 
-    data = service.get_filtered_indicator_values(filters)
-    total = service.count_filtered_values(filters)
+    async def render() -> FastJSONResponse:
+        data, total, total_is_estimate = await service.get_filtered_page(filters, count)
+        next_cursor = encode_cursor(data[-1]["id"]) if len(data) == limit else None
+        return FastJSONResponse({
+            "data": data,
+            "total": total,
+            "total_is_estimate": total_is_estimate,
+            "next_cursor": next_cursor,
+            "filters": filters.model_dump(),
+        })
 
-    return {
-        "data": data,
-        "total": total,
-        "filters": filters.model_dump(),
+    cache_params = {
+        **filters.model_dump(exclude={"country_codes"}),
+        "country_codes": sorted(filters.country_code_list or []),
+        "count": count,
     }
+    return await response_cache.get_or_render("indicator_values", cache_params, render)
+
+
+# Column order of the CSV export
+CSV_COLUMNS = [
+    "id",
+    "country_code",
+    "country_name",
+    "latitude",
+    "longitude",
+    "indicator_name",
+    "unit",
+    "dimension_name",
+    "pillar_name",
+    "year",
+    "value",
+    "confidence_score",
+]
+
+
+async def _stream_csv(filters: FilterParams) -> AsyncIterator[str]:
+    """Yield the CSV export one batch of rows at a time."""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=CSV_COLUMNS)
+    writer.writeheader()
+    yield buffer.getvalue()
+
+    # The stream outlives the endpoint call, so it owns its session rather
+    # than borrowing the request-scoped one
+    async with AsyncSessionLocal() as db:
+        async for rows in AsyncFilterService(db).stream_filtered_values(filters):
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows(rows)
+            yield buffer.getvalue()
+
+
+@router.get("/indicators/values.csv")
+async def export_indicator_values_csv(
+    pillar_id: int | None = Query(None),
+    dimension_id: int | None = Query(None),
+    indicator_id: int | None = Query(None),
+    country_codes: str | None = Query(None, description="Comma-separated country codes"),
+    year_start: int | None = Query(None, ge=1900, le=2100),
+    year_end: int | None = Query(None, ge=1900, le=2100),
+):
+    """
+    Export all indicator values matching the filters as CSV.
+
+    Takes the same filters as ``/indicators/values`` without pagination; rows
+    are streamed in ID order from the same source, the indicator cube when it
+    is enabled.
+    """
+    filters = FilterParams(
+        pillar_id=pillar_id,
+        dimension_id=dimension_id,
+        indicator_id=indicator_id,
+        country_codes=country_codes,
+        year_start=year_start,
+        year_end=year_end,
+    )
+    return StreamingResponse(
+        _stream_csv(filters),
+        media_type="text/csv",
+        headers={"Content-Disposition": 'attachment; filename="indicator_values.csv"'},
+    )
+
+
+def _export_response(body: bytes, export_format: ExportFormat, name: str) -> Response:
+    return Response(
+        content=body,
+        media_type=MEDIA_TYPES[export_format],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{export_format}"'},
+    )
+
+
+@router.get("/indicators/snapshot.{export_format}")
+async def export_indicator_snapshot(
+    export_format: ExportFormat,
+    service: AsyncExportService = Depends(get_export_service),
+):
+    """
+    Export every active indicator value as Arrow IPC or Parquet.
+
+    Intended for bulk consumers; the file is built once per dataset version.
+    """
+    body = await service.get_snapshot(export_format)
+    return _export_response(body, export_format, "indicator_values")
+
+
+@router.get("/indicators/values.{export_format}")
+async def export_indicator_values(
+    export_format: ExportFormat,
+    pillar_id: int | None = Query(None),
+    dimension_id: int | None = Query(None),
+    indicator_id: int | None = Query(None),
+    country_codes: str | None = Query(None, description="Comma-separated country codes"),
+    year_start: int | None = Query(None, ge=1900, le=2100),
+    year_end: int | None = Query(None, ge=1900, le=2100),
+    service: AsyncExportService = Depends(get_export_service),
+):
+    """
+    Export indicator values matching the filters as Arrow IPC or Parquet.
+
+    Takes the same filters as ``/indicators/values`` without pagination.
+    """
+    filters = FilterParams(
+        pillar_id=pillar_id,
+        dimension_id=dimension_id,
+        indicator_id=indicator_id,
+        country_codes=country_codes,
+        year_start=year_start,
+        year_end=year_end,
+    )
+    body = await service.get_filtered_export(filters, export_format)
+    return _export_response(body, export_format, "indicator_values")
 
 
 @router.get("/indicators/{indicator_id}", response_model=Indicator)
 async def get_indicator(
     indicator_id: int,
-    service: IndicatorService = Depends(get_indicator_service),
+    service: AsyncIndicatorService = Depends(get_indicator_service),
 ):
     """Get indicator by ID."""
-    indicator = service.get_indicator_by_id(indicator_id)
+    indicator = await service.get_indicator_by_id(indicator_id)
     if not indicator:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Indicator with ID {indicator_id} not found",
         )
-    return indicator
+    return trusted_response(Indicator, indicator)
 
 
 # Map data endpoint
 @router.get("/map/data")
 async def get_map_data(
+    validators: Validators = Depends(conditional_get()),
     indicator_id: int = Query(..., description="Indicator ID"),
     year: int = Query(..., ge=1900, le=2100, description="Year"),
-    service: FilterService = Depends(get_filter_service),
+    format: MapFormat = Query("rows", description="rows: list of objects; columnar: parallel arrays"),
+    precision: int | None = Query(
+        None, ge=0, le=6, description="Columnar only: send values as integers scaled by 10**precision"
+    ),
+    service: AsyncFilterService = Depends(get_filter_service),
 ):
-    """Get map visualization data for a specific indicator and year."""
-    data = service.get_map_data(indicator_id, year)
-
-    return {
-        "indicator_id": indicator_id,
-        "year": year,
-        "data": data,
-        "total": len(data),
-    }
+    """
+    Get map visualization data for a specific indicator and year.
+
+    ``format=columnar`` returns ``data`` as parallel arrays with the unit sent
+    once, optionally quantized with ``precision``.
+    """
+
+    async def render() -> FastJSONResponse:
+        data = await service.get_map_data(indicator_id, year)
+        return FastJSONResponse({
+            "indicator_id": indicator_id,
+            "year": year,
+            "data": columnar_map_data(data, precision) if format == "columnar" else data,
+            "total": len(data),
+        })
+
+    params = {"indicator_id": indicator_id, "year": year}
+    if format == "columnar":
+        params.update(format=format, precision=precision)
+    response = await response_cache.get_or_render("map_data", params, render)
+    response.headers.update(validators.headers)
+    return response
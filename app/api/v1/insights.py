@@ -1,52 +1,81 @@
 """AI Insights API endpoints."""
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from app.core.responses import FastJSONResponse
 from app.schemas.insight import (
     InsightGenerateRequest,
     Insight,
     InsightFeedback,
+    InsightJob,
 )
-from app.services.ai_service import AIService
+from app.services.ai_service import AsyncAIService
+from app.services.insight_jobs import insight_jobs
 from app.api.dependencies import get_ai_service
 
 router = APIRouter()
 
 
-@router.post("/insights/generate", response_model=Insight, status_code=status.HTTP_201_CREATED)
+@router.post(
+    "/insights/generate",
+    response_model=Insight,
+    status_code=status.HTTP_201_CREATED,
+    responses={status.HTTP_202_ACCEPTED: {"model": InsightJob}},
+)
 async def generate_insight(
     request: InsightGenerateRequest,
-    service: AIService = Depends(get_ai_service),
+    run_async: bool = Query(
+        False, alias="async", description="Queue the generation and return a job to poll"
+    ),
+    service: AsyncAIService = Depends(get_ai_service),
 ):
     """
     Generate an AI insight based on filters.
 
     This endpoint generates context-aware insights using AI models.
-    Results are cached for 24 hours to improve performance.
+    Results are cached for 24 hours per combination of filters.
+
+    With ``async=true`` the generation runs in the background: the response
+    is a job (202) to poll at ``/insights/jobs/{job_id}``.
     """
-    # Check for cached insight first
-    cached = service.get_cached_insight(
-        insight_type=request.insight_type,
-        country_code=request.country_code,
-        indicator_ids=request.indicator_ids,
+    if not run_async:
+        return await service.get_or_generate_insight(request)
+
+    try:
+        job = await insight_jobs.submit(request)
+    except asyncio.QueueFull:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail="Too many insight jobs pending, retry later",
+            headers={"Retry-After": "5"},
+        )
+    return FastJSONResponse(
+        job.model_dump(mode="json"),
+        status_code=status.HTTP_202_ACCEPTED,
+        headers={"Location": f"/api/v1/insights/jobs/{job.job_id}"},
     )
 
-    if cached:
-        return cached
 
-    # Generate new insight
-    insight = service.generate_insight(request)
-    return insight
+@router.get("/insights/jobs/{job_id}", response_model=InsightJob)
+async def get_insight_job(job_id: str):
+    """Get the status of a background insight job, with the insight once done."""
+    job = await insight_jobs.get(job_id)
+    if not job:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Insight job {job_id} not found",
+        )
+    return job
 
 
 @router.get("/insights/{insight_id}", response_model=Insight)
 async def get_insight(
     insight_id: int,
-    service: AIService = Depends(get_ai_service),
+    service: AsyncAIService = Depends(get_ai_service),
 ):
     """Get a specific insight by ID."""
-    from app.models import AIInsight
-
-    insight = service.db.query(AIInsight).filter(AIInsight.id == insight_id).first()
+    insight = await service.get_insight(insight_id)
     if not insight:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -59,10 +88,10 @@ async def get_insight(
 async def submit_insight_feedback(
     insight_id: int,
     feedback: InsightFeedback,
-    service: AIService = Depends(get_ai_service),
+    service: AsyncAIService = Depends(get_ai_service),
 ):
     """Submit user feedback for an insight (1-5 stars)."""
-    insight = service.submit_feedback(insight_id, feedback.rating)
+    insight = await service.submit_feedback(insight_id, feedback.rating)
     if not insight:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
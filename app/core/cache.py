@@ -0,0 +1,216 @@
+"""Two-tier response cache.
+
+Rendered response bodies are cached under a key built from the endpoint
+namespace, the normalized query parameters and the dataset version, so any
+write to the data invalidates every entry at once without explicit deletes.
+An in-process LRU answers repeat requests without a network hop; Redis shares
+entries between workers.
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable
+
+from fastapi import Response
+
+from app.config import settings
+from app.core import data_version
+from app.core.redis import REDIS_ERRORS, get_async_redis, mark_redis_failure, redis_available
+
+
+class LRUCache:
+    """Thread-safe, size-bounded least-recently-used mapping with optional TTL."""
+
+    def __init__(self, maxsize: int, ttl_seconds: float | None = None):
+        self.maxsize = maxsize
+        self.ttl_seconds = ttl_seconds
+        self._data: OrderedDict[str, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Any | None:
+        """Get a live value and mark it as recently used."""
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a value, evicting the least recently used entry if full."""
+        expires_at = time.monotonic() + self.ttl_seconds if self.ttl_seconds else float("inf")
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def pop(self, key: str) -> Any | None:
+        """Remove and return a value."""
+        with self._lock:
+            item = self._data.pop(key, None)
+            return item[1] if item is not None else None
+
+    def clear(self) -> None:
+        """Remove all entries."""
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+def normalize_params(params: dict) -> str:
+    """Canonical JSON for query parameters: sorted keys, no None values."""
+    return json.dumps(
+        {k: v for k, v in params.items() if v is not None},
+        sort_keys=True,
+        separators=(",", ":"),
+        default=str,
+    )
+
+
+def cache_key(namespace: str, params: dict, version: int) -> str:
+    """Build a cache key for a namespace, parameters and dataset version."""
+    digest = hashlib.sha1(normalize_params(params).encode()).hexdigest()
+    return f"bc:{namespace}:v{version}:{digest}"
+
+
+@dataclass
+class CacheStats:
+    """Hit/miss counters for a cache."""
+
+    local_hits: int = 0
+    redis_hits: int = 0
+    misses: int = 0
+
+    def as_dict(self) -> dict:
+        requests = self.local_hits + self.redis_hits + self.misses
+        hits = self.local_hits + self.redis_hits
+        return {
+            "local_hits": self.local_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "hit_ratio": round(hits / requests, 4) if requests else None,
+        }
+
+
+class ResponseCache:
+    """Cache of rendered response bodies with an LRU tier in front of Redis."""
+
+    def __init__(
+        self,
+        local_size: int,
+        local_ttl_seconds: float,
+        ttl_seconds: int,
+        use_redis: bool = True,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.use_redis = use_redis
+        # The local tier expires quickly so it can't serve stale entries for
+        # long if a write happens while Redis (and the shared version) is down
+        self.local = LRUCache(local_size, ttl_seconds=local_ttl_seconds)
+        self.stats: dict[str, CacheStats] = {}
+
+    def _stats(self, namespace: str) -> CacheStats:
+        return self.stats.setdefault(namespace, CacheStats())
+
+    async def get(
+        self, namespace: str, params: dict, version: int | None = None
+    ) -> tuple[str, bytes] | None:
+        """Get a cached (media_type, body) pair for the given (or current) data version."""
+        key = cache_key(namespace, params, data_version.current() if version is None else version)
+
+        entry = self.local.get(key)
+        if entry is not None:
+            self._stats(namespace).local_hits += 1
+            return entry
+
+        if self.use_redis and redis_available():
+            try:
+                raw = await get_async_redis().get(key)
+            except REDIS_ERRORS as e:
+                mark_redis_failure(e)
+                raw = None
+            if raw is not None:
+                media_type, _, body = raw.partition(b"\n")
+                entry = (media_type.decode(), body)
+                self.local.set(key, entry)
+                self._stats(namespace).redis_hits += 1
+                return entry
+
+        self._stats(namespace).misses += 1
+        return None
+
+    async def set(
+        self, namespace: str, params: dict, media_type: str, body: bytes, version: int | None = None
+    ) -> None:
+        """Store a response body in both tiers."""
+        key = cache_key(namespace, params, data_version.current() if version is None else version)
+        self.local.set(key, (media_type, body))
+
+        if self.use_redis and redis_available():
+            try:
+                await get_async_redis().set(
+                    key, media_type.encode() + b"\n" + body, ex=self.ttl_seconds
+                )
+            except REDIS_ERRORS as e:
+                mark_redis_failure(e)
+
+    async def get_or_render(
+        self,
+        namespace: str,
+        params: dict,
+        render: Callable[[], Awaitable[Response]],
+    ) -> Response:
+        """
+        Serve a cached response, or render, cache and return a fresh one.
+
+        Only successful responses are cached.
+        """
+        if not settings.RESPONSE_CACHE_ENABLED:
+            return await render()
+
+        # Pin the version so a write during rendering can't file old data under the new version
+        version = await data_version.refresh()
+        cached = await self.get(namespace, params, version)
+        if cached is not None:
+            media_type, body = cached
+            return Response(content=body, media_type=media_type, headers={"X-Cache": "HIT"})
+
+        response = await render()
+        if response.status_code == 200:
+            media_type = response.headers.get("content-type", response.media_type or "")
+            await self.set(namespace, params, media_type, bytes(response.body), version)
+        response.headers["X-Cache"] = "MISS"
+        return response
+
+    def stats_dict(self) -> dict:
+        """Counters per namespace plus local tier size."""
+        return {
+            "local_entries": len(self.local),
+            "namespaces": {name: stats.as_dict() for name, stats in self.stats.items()},
+        }
+
+
+response_cache = ResponseCache(
+    local_size=settings.RESPONSE_CACHE_LOCAL_SIZE,
+    local_ttl_seconds=settings.RESPONSE_CACHE_LOCAL_TTL_SECONDS,
+    ttl_seconds=settings.RESPONSE_CACHE_TTL_SECONDS,
+)
+
+# Rendered htmx fragments; small and cheap to rebuild, so Redis is optional
+fragment_cache = ResponseCache(
+    local_size=settings.FRAGMENT_CACHE_LOCAL_SIZE,
+    local_ttl_seconds=settings.RESPONSE_CACHE_LOCAL_TTL_SECONDS,
+    ttl_seconds=settings.RESPONSE_CACHE_TTL_SECONDS,
+    use_redis=settings.FRAGMENT_CACHE_REDIS,
+)
@@ -0,0 +1,175 @@
+"""Response compression.
+
+Negotiates brotli or gzip from Accept-Encoding and compresses text-like
+responses above a size threshold. Streaming responses are compressed chunk by
+chunk. Responses that already carry a Content-Encoding (precompressed static
+files), partial content (range responses) and binary formats are passed
+through untouched.
+"""
+
+import gzip
+import zlib
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - brotli is optional, gzip still works
+    brotli = None
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/json",
+    "application/javascript",
+    "application/xml",
+    "image/svg+xml",
+)
+
+
+def negotiate_encoding(accept_encoding: str, available: tuple[str, ...]) -> str | None:
+    """
+    Pick the best encoding from an Accept-Encoding header.
+
+    Encodings are preferred in the order of ``available`` among those the
+    client accepts with a non-zero q-value.
+    """
+    accepted = {}
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        q = 1.0
+        if params.strip().startswith("q="):
+            try:
+                q = float(params.strip()[2:])
+            except ValueError:
+                q = 0.0
+        accepted[coding.strip()] = q
+
+    for coding in available:
+        if accepted.get(coding, accepted.get("*", 0.0)) > 0:
+            return coding
+    return None
+
+
+def available_encodings() -> tuple[str, ...]:
+    """Encodings this server can produce, best first."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+class _Compressor:
+    """Incremental brotli or gzip compressor."""
+
+    def __init__(self, encoding: str, gzip_level: int, brotli_quality: int):
+        if encoding == "br":
+            self._compressor = brotli.Compressor(quality=brotli_quality)
+            self._flush = self._compressor.flush
+            self._finish = self._compressor.finish
+            self._compress = self._compressor.process
+        else:
+            self._compressor = zlib.compressobj(gzip_level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+            self._flush = lambda: self._compressor.flush(zlib.Z_SYNC_FLUSH)
+            self._finish = self._compressor.flush
+            self._compress = self._compressor.compress
+
+    def chunk(self, data: bytes, more: bool) -> bytes:
+        """Compress a chunk; flush so streamed chunks reach the client promptly."""
+        out = self._compress(data)
+        return out + (self._flush() if more else self._finish())
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing responses with brotli or gzip."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 5,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate_encoding(
+            Headers(scope=scope).get("accept-encoding", ""), available_encodings()
+        )
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        start: Message | None = None
+        compressor: _Compressor | None = None
+        passthrough = False
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start, compressor, passthrough
+
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                content_type = headers.get("content-type", "")
+                passthrough = (
+                    "content-encoding" in headers
+                    # Byte ranges refer to the identity representation
+                    or "content-range" in headers
+                    or message["status"] in (204, 206, 304)
+                    or not content_type.startswith(COMPRESSIBLE_TYPES)
+                )
+                if passthrough:
+                    await send(message)
+                else:
+                    # Hold the start message until the first body chunk shows the size
+                    start = message
+                return
+
+            if message["type"] != "http.response.body" or passthrough:
+                await send(message)
+                return
+
+            body = message.get("body", b"")
+            more = message.get("more_body", False)
+
+            if compressor is None:
+                if not more and len(body) < self.minimum_size:
+                    passthrough = True
+                    await send(start)
+                    await send(message)
+                    return
+
+                compressor = _Compressor(encoding, self.gzip_level, self.brotli_quality)
+                headers = MutableHeaders(raw=start["headers"])
+                headers["Content-Encoding"] = encoding
+                headers.add_vary_header("Accept-Encoding")
+                if "etag" in headers and not headers["etag"].startswith("W/"):
+                    # The compressed bytes differ from the identity representation
+                    headers["ETag"] = "W/" + headers["etag"]
+                if more:
+                    del headers["Content-Length"]
+                    await send(start)
+                else:
+                    body = compressor.chunk(body, more=False)
+                    headers["Content-Length"] = str(len(body))
+                    await send(start)
+                    await send({"type": "http.response.body", "body": body})
+                    return
+
+            await send({
+                "type": "http.response.body",
+                "body": compressor.chunk(body, more=more),
+                "more_body": more,
+            })
+
+        await self.app(scope, receive, send_compressed)
+
+
+def compress_file(data: bytes, encoding: str) -> bytes:
+    """Compress static file contents with the strongest settings (build time)."""
+    if encoding == "br":
+        return brotli.compress(data, quality=11)
+    return gzip.compress(data, compresslevel=9, mtime=0)
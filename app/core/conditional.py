@@ -0,0 +1,70 @@
+"""Conditional GET support.
+
+Read endpoints whose payload depends only on the request parameters and the
+dataset version get an ETag built from both, and a Last-Modified time from
+the last version bump. A matching If-None-Match (or an If-Modified-Since not
+older than the last bump) is answered with 304 before the endpoint runs.
+"""
+
+import hashlib
+from dataclasses import dataclass
+from email.utils import formatdate, parsedate_to_datetime
+
+from fastapi import Request
+
+from app.core import data_version
+from app.core.cache import normalize_params
+
+
+@dataclass(frozen=True)
+class Validators:
+    """Cache validators and freshness headers for one response."""
+
+    etag: str
+    last_modified: float
+    max_age: int
+
+    @property
+    def headers(self) -> dict[str, str]:
+        return {
+            "ETag": self.etag,
+            "Last-Modified": formatdate(self.last_modified, usegmt=True),
+            "Cache-Control": f"public, max-age={self.max_age}",
+        }
+
+
+def validators_for(request: Request, max_age: int) -> Validators:
+    """Build validators from the request path, query parameters and dataset version."""
+    params = normalize_params(dict(request.query_params))
+    digest = hashlib.sha1(f"{request.url.path}?{params}".encode()).hexdigest()[:16]
+    # Weak: the representation may be compressed differently per response
+    return Validators(
+        etag=f'W/"v{data_version.current()}-{digest}"',
+        last_modified=data_version.updated_at(),
+        max_age=max_age,
+    )
+
+
+def _opaque(tag: str) -> str:
+    """Strip the weak prefix for weak comparison."""
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def is_not_modified(request: Request, validators: Validators) -> bool:
+    """Check the request's conditional headers against current validators."""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        # If-None-Match takes precedence over If-Modified-Since (RFC 9110)
+        tags = {_opaque(tag.strip()) for tag in if_none_match.split(",")}
+        return "*" in tags or _opaque(validators.etag) in tags
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since).timestamp()
+        except (TypeError, ValueError):
+            return False
+        # HTTP dates have one-second resolution
+        return int(validators.last_modified) <= since
+
+    return False
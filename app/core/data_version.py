@@ -0,0 +1,209 @@
+"""Dataset version tracking.
+
+Every committed write to the reference or fact tables bumps a dataset version
+number. Read-side caches (the indicator cube, response caches) stamp what they
+hold with the version they were built from and rebuild when it moves.
+
+The version lives in Redis so that all workers and scripts share it; each
+process re-reads it at most every DATA_VERSION_CHECK_SECONDS. Without Redis
+the version is process-local.
+
+Inside the app Redis is only called through the async client: sync code
+running on the event loop (including ORM code under ``AsyncSession.run_sync``)
+must not block it. There ``current()`` returns the local copy and refreshes
+it in the background; async entry points await ``refresh()`` for an
+up-to-date read. Scripts without an event loop use the sync client.
+"""
+
+import asyncio
+import threading
+import time
+from collections.abc import Coroutine
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.redis import (
+    REDIS_ERRORS,
+    get_async_redis,
+    get_redis,
+    mark_redis_failure,
+    redis_available,
+)
+
+# Tables whose contents feed cached read paths
+TRACKED_TABLES = frozenset({
+    "countries",
+    "pillars",
+    "dimensions",
+    "indicators",
+    "indicator_values",
+})
+
+VERSION_KEY = "bc:data_version"
+UPDATED_AT_KEY = "bc:data_version:updated_at"
+
+_lock = threading.Lock()
+_version = 0
+_updated_at = time.time()
+_checked_at = 0.0
+_tasks: set[asyncio.Task] = set()  # background Redis calls, kept referenced until done
+
+
+def _running_loop() -> asyncio.AbstractEventLoop | None:
+    try:
+        return asyncio.get_running_loop()
+    except RuntimeError:
+        return None
+
+
+def _spawn(loop: asyncio.AbstractEventLoop, coro: Coroutine) -> None:
+    task = loop.create_task(coro)
+    _tasks.add(task)
+    task.add_done_callback(_tasks.discard)
+
+
+def _due() -> bool:
+    return (
+        time.monotonic() - _checked_at >= settings.DATA_VERSION_CHECK_SECONDS
+        and redis_available()
+    )
+
+
+def _apply(version: bytes | None, updated_at: bytes | None) -> None:
+    """Adopt the shared version read from Redis; never move backwards."""
+    global _version, _updated_at
+    if version is not None and int(version) > _version:
+        _version = int(version)
+        _updated_at = float(updated_at) if updated_at is not None else _updated_at
+
+
+async def _read_async() -> None:
+    try:
+        _apply(*await get_async_redis().mget(VERSION_KEY, UPDATED_AT_KEY))
+    except REDIS_ERRORS as e:
+        mark_redis_failure(e)
+
+
+def _sync_from_redis() -> None:
+    """Refresh the local copy of the version from Redis if it is due."""
+    global _checked_at
+    if not _due():
+        return
+    _checked_at = time.monotonic()
+    loop = _running_loop()
+    if loop is not None:
+        _spawn(loop, _read_async())
+        return
+    try:
+        _apply(*get_redis().mget(VERSION_KEY, UPDATED_AT_KEY))
+    except REDIS_ERRORS as e:
+        mark_redis_failure(e)
+
+
+async def refresh() -> int:
+    """Re-read the version from Redis if due, without blocking, and return it."""
+    global _checked_at
+    if _due():
+        _checked_at = time.monotonic()
+        await _read_async()
+    return _version
+
+
+def current() -> int:
+    """Get the current dataset version."""
+    _sync_from_redis()
+    return _version
+
+
+def updated_at() -> float:
+    """Get the UNIX timestamp of the last version bump."""
+    _sync_from_redis()
+    return _updated_at
+
+
+def _adopt(shared: int) -> None:
+    global _version
+    with _lock:
+        _version = max(_version, shared)
+
+
+def _publish_sync(version: int, now: float) -> None:
+    client = get_redis()
+    pipe = client.pipeline()
+    pipe.incr(VERSION_KEY)
+    pipe.set(UPDATED_AT_KEY, now)
+    shared = pipe.execute()[0]
+    # Never move backwards, e.g. after bumping locally while Redis was down
+    if shared < version:
+        client.set(VERSION_KEY, version)
+    _adopt(shared)
+
+
+async def _publish_async(version: int, now: float) -> None:
+    client = get_async_redis()
+    try:
+        async with client.pipeline() as pipe:
+            pipe.incr(VERSION_KEY)
+            pipe.set(UPDATED_AT_KEY, now)
+            shared = (await pipe.execute())[0]
+        if shared < version:
+            await client.set(VERSION_KEY, version)
+        _adopt(shared)
+    except REDIS_ERRORS as e:
+        mark_redis_failure(e)
+
+
+def bump() -> int:
+    """
+    Mark the dataset as changed.
+
+    Call this after writes that bypass the ORM (raw SQL, COPY); ORM writes
+    are picked up automatically by the session hooks below. The local version
+    moves at once; on the event loop the shared one is incremented in the
+    background.
+    """
+    global _version, _updated_at, _checked_at
+    with _lock:
+        now = time.time()
+        _version += 1
+        version = _version
+        _updated_at = now
+        _checked_at = time.monotonic()
+
+    if redis_available():
+        loop = _running_loop()
+        if loop is not None:
+            _spawn(loop, _publish_async(version, now))
+        else:
+            try:
+                _publish_sync(version, now)
+            except REDIS_ERRORS as e:
+                mark_redis_failure(e)
+    return _version
+
+
+def _touches_tracked_tables(session: Session) -> bool:
+    """Check whether pending session changes involve a tracked table."""
+    for obj in (*session.new, *session.dirty, *session.deleted):
+        if getattr(obj, "__tablename__", None) in TRACKED_TABLES:
+            return True
+    return False
+
+
+@event.listens_for(Session, "before_flush")
+def _record_tracked_writes(session: Session, flush_context, instances) -> None:
+    if _touches_tracked_tables(session):
+        session.info["data_changed"] = True
+
+
+@event.listens_for(Session, "after_commit")
+def _bump_on_commit(session: Session) -> None:
+    if session.info.pop("data_changed", False):
+        bump()
+
+
+@event.listens_for(Session, "after_rollback")
+def _clear_on_rollback(session: Session) -> None:
+    session.info.pop("data_changed", None)
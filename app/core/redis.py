@@ -0,0 +1,77 @@
+"""Redis client management.
+
+Redis is an optional accelerator: every caller must keep working when it is
+unreachable. After a failed call the clients are skipped for a short back-off
+period so a missing Redis costs one timeout, not one per request.
+"""
+
+import time
+
+import redis
+import redis.asyncio as aioredis
+
+from app.config import settings
+from app.core.logging import logger
+
+# Exceptions that mean "Redis is unavailable", as opposed to programming errors
+REDIS_ERRORS = (redis.RedisError, OSError)
+
+_client: redis.Redis | None = None
+_async_client: aioredis.Redis | None = None
+_down_until = 0.0
+
+
+def get_redis() -> redis.Redis:
+    """Get the shared synchronous Redis client."""
+    global _client
+    if _client is None:
+        _client = redis.Redis.from_url(
+            settings.REDIS_URL,
+            socket_connect_timeout=settings.REDIS_TIMEOUT_SECONDS,
+            socket_timeout=settings.REDIS_TIMEOUT_SECONDS,
+        )
+    return _client
+
+
+def get_async_redis() -> aioredis.Redis:
+    """Get the shared async Redis client."""
+    global _async_client
+    if _async_client is None:
+        _async_client = aioredis.Redis.from_url(
+            settings.REDIS_URL,
+            socket_connect_timeout=settings.REDIS_TIMEOUT_SECONDS,
+            socket_timeout=settings.REDIS_TIMEOUT_SECONDS,
+        )
+    return _async_client
+
+
+def set_redis_clients(client: redis.Redis | None, async_client: aioredis.Redis | None) -> None:
+    """Replace the shared clients (e.g. with fakeredis in tests)."""
+    global _client, _async_client, _down_until
+    _client = client
+    _async_client = async_client
+    _down_until = 0.0
+
+
+def redis_available() -> bool:
+    """Check whether Redis is enabled and not in a failure back-off."""
+    return settings.REDIS_ENABLED and time.monotonic() >= _down_until
+
+
+def mark_redis_failure(error: Exception) -> None:
+    """Record a failed Redis call and back off for a while."""
+    global _down_until
+    if time.monotonic() >= _down_until:
+        logger.warning(f"Redis unavailable, backing off: {error}")
+    _down_until = time.monotonic() + settings.REDIS_RETRY_SECONDS
+
+
+async def close_redis() -> None:
+    """Close the shared clients."""
+    global _client, _async_client
+    if _async_client is not None:
+        await _async_client.aclose()
+        _async_client = None
+    if _client is not None:
+        _client.close()
+        _client = None
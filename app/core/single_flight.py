@@ -0,0 +1,125 @@
+"""Single-flight execution of expensive work.
+
+Concurrent calls with the same key share one execution. Within a process the
+first caller starts a task and later callers await the same task. Across
+workers a Redis lock (SET NX with an expiry) lets one worker do the work
+while the others wait for the lock to be released, then run the work
+themselves - which must therefore be "get or compute", finding the result the
+lock holder stored. Without Redis only the in-process deduplication applies.
+"""
+
+import asyncio
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Awaitable, Callable, TypeVar
+
+from app.core.redis import REDIS_ERRORS, get_async_redis, mark_redis_failure, redis_available
+
+T = TypeVar("T")
+
+# Delete the lock only if it still holds our token (it may have expired and been retaken)
+_RELEASE_SCRIPT = """
+if redis.call('get', KEYS[1]) == ARGV[1] then
+    return redis.call('del', KEYS[1])
+end
+return 0
+"""
+
+
+@dataclass
+class SingleFlightStats:
+    """Counters for a single-flight group."""
+
+    executions: int = 0
+    coalesced: int = 0
+    lock_waits: int = 0
+
+    def as_dict(self) -> dict:
+        return {
+            "executions": self.executions,
+            "coalesced": self.coalesced,
+            "lock_waits": self.lock_waits,
+        }
+
+
+class SingleFlight:
+    """Deduplicates concurrent executions per key, in process and across workers."""
+
+    def __init__(self, namespace: str, lock_ttl_seconds: float, poll_seconds: float):
+        self.namespace = namespace
+        self.lock_ttl_seconds = lock_ttl_seconds
+        self.poll_seconds = poll_seconds
+        self.stats = SingleFlightStats()
+        self._inflight: dict[str, asyncio.Task] = {}
+
+    async def run(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Run ``fn`` once for all concurrent callers with the same key."""
+        task = self._inflight.get(key)
+        if task is None:
+            task = asyncio.create_task(self._run_locked(key, fn))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._finished(key, done))
+        else:
+            self.stats.coalesced += 1
+        # Shielded: a caller that disconnects must not cancel the work others await
+        return await asyncio.shield(task)
+
+    def _finished(self, key: str, task: asyncio.Task) -> None:
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        if not task.cancelled():
+            # Mark the exception retrieved in case every caller went away
+            task.exception()
+
+    async def _run_locked(self, key: str, fn: Callable[[], Awaitable[T]]) -> T:
+        lock_key = f"bc:lock:{self.namespace}:{key}"
+        token = uuid.uuid4().hex
+        if not await self._acquire(lock_key, token):
+            self.stats.lock_waits += 1
+            await self._wait_for_release(lock_key)
+            token = None
+
+        try:
+            self.stats.executions += 1
+            return await fn()
+        finally:
+            if token is not None:
+                await self._release(lock_key, token)
+
+    async def _acquire(self, lock_key: str, token: str) -> bool:
+        """Take the cross-worker lock; True when we hold it or Redis is unavailable."""
+        if not redis_available():
+            return True
+        try:
+            acquired = await get_async_redis().set(
+                lock_key, token, nx=True, px=int(self.lock_ttl_seconds * 1000)
+            )
+        except REDIS_ERRORS as e:
+            mark_redis_failure(e)
+            return True
+        return bool(acquired)
+
+    async def _wait_for_release(self, lock_key: str) -> None:
+        """Wait until the lock is released or expires (its holder may have died)."""
+        deadline = time.monotonic() + self.lock_ttl_seconds
+        while time.monotonic() < deadline and redis_available():
+            try:
+                if not await get_async_redis().exists(lock_key):
+                    return
+            except REDIS_ERRORS as e:
+                mark_redis_failure(e)
+                return
+            await asyncio.sleep(self.poll_seconds)
+
+    async def _release(self, lock_key: str, token: str) -> None:
+        if not redis_available():
+            return
+        try:
+            await get_async_redis().eval(_RELEASE_SCRIPT, 1, lock_key, token)
+        except REDIS_ERRORS as e:
+            mark_redis_failure(e)
+
+    def stats_dict(self) -> dict:
+        """Counters plus the number of executions in flight in this process."""
+        return {**self.stats.as_dict(), "in_flight": len(self._inflight)}
@@ -0,0 +1,133 @@
+"""Static files with content-hashed URLs and precompressed variants.
+
+``static_url("js/map.js")`` returns ``/static/js/map.<hash>.js``. Requests for
+a hashed name whose hash matches the file's current contents are served with
+a one-year immutable Cache-Control; plain names are served with
+``no-cache`` so they revalidate. When ``scripts/build_static.py`` has written
+``.br``/``.gz`` siblings, those are served to clients that accept them.
+
+Hashes come from the manifest written by the build step, or are computed from
+the files on each use when it is missing (development).
+"""
+
+import hashlib
+import json
+import re
+from pathlib import Path
+
+from starlette.datastructures import Headers
+from starlette.responses import Response
+from starlette.staticfiles import StaticFiles
+from starlette.types import Scope
+
+from app.core.compression import negotiate_encoding
+
+STATIC_DIR = Path(__file__).resolve().parent.parent / "static"
+MANIFEST_NAME = "manifest.json"
+PRECOMPRESSED_SUFFIXES = {"br": ".br", "gzip": ".gz"}
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+REVALIDATE = "no-cache"
+
+_HASHED_NAME = re.compile(r"^(?P<stem>.+)\.(?P<hash>[0-9a-f]{12})(?P<suffix>\.[^./]+)$")
+
+
+def file_hash(path: Path) -> str:
+    """Short content hash used in static URLs."""
+    return hashlib.sha256(path.read_bytes()).hexdigest()[:12]
+
+
+def hashed_name(path: str, digest: str) -> str:
+    """Insert a content hash before the extension: js/map.js -> js/map.<hash>.js."""
+    stem, dot, suffix = path.rpartition(".")
+    return f"{stem}.{digest}.{suffix}" if dot else f"{path}.{digest}"
+
+
+class StaticManifest:
+    """Maps static paths (relative to the static directory) to content hashes."""
+
+    def __init__(self, directory: Path):
+        self.directory = directory
+        self._hashes: dict[str, str] | None = None
+
+    @property
+    def hashes(self) -> dict[str, str]:
+        if self._hashes is None:
+            manifest = self.directory / MANIFEST_NAME
+            if manifest.exists():
+                self._hashes = json.loads(manifest.read_text())
+            else:
+                self._hashes = {}
+        return self._hashes
+
+    def hash_for(self, path: str) -> str | None:
+        """Content hash of a static file, from the manifest or computed from the file."""
+        path = path.lstrip("/")
+        digest = self.hashes.get(path)
+        if digest is None:
+            # Not built: hash on every call so edits show up immediately
+            full_path = self.directory / path
+            if not full_path.is_file():
+                return None
+            digest = file_hash(full_path)
+        return digest
+
+    def url(self, path: str) -> str:
+        """Content-hashed URL for a static file."""
+        digest = self.hash_for(path)
+        path = path.lstrip("/")
+        return f"/static/{hashed_name(path, digest) if digest else path}"
+
+    def resolve(self, path: str) -> tuple[str, bool]:
+        """
+        Map a requested path to the file path.
+
+        Returns (path, immutable): immutable is True for a hashed name whose
+        hash matches the file's current contents.
+        """
+        directory, _, name = path.rpartition("/")
+        match = _HASHED_NAME.match(name)
+        if match:
+            original = f"{directory}/{match['stem']}{match['suffix']}".lstrip("/")
+            if self.hash_for(original) == match["hash"]:
+                return original, True
+        return path, False
+
+
+class PrecompressedStaticFiles(StaticFiles):
+    """StaticFiles serving hashed names and precompressed .br/.gz variants."""
+
+    def __init__(self, *args, manifest: StaticManifest, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.manifest = manifest
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        path, immutable = self.manifest.resolve(path)
+
+        encoding = negotiate_encoding(
+            Headers(scope=scope).get("accept-encoding", ""), tuple(PRECOMPRESSED_SUFFIXES)
+        )
+        response = None
+        if encoding is not None:
+            variant = path + PRECOMPRESSED_SUFFIXES[encoding]
+            _, stat_result = self.lookup_path(variant)
+            if stat_result is not None:
+                response = await super().get_response(variant, scope)
+                # The content type is still guessed from the original name (x.js.br)
+                if response.status_code in (200, 304):
+                    response.headers["Content-Encoding"] = encoding
+        if response is None:
+            response = await super().get_response(path, scope)
+
+        response.headers.append("Vary", "Accept-Encoding")
+        if response.status_code in (200, 304):
+            response.headers["Cache-Control"] = IMMUTABLE if immutable else REVALIDATE
+        return response
+
+
+static_manifest = StaticManifest(STATIC_DIR)
+
+
+def static_url(path: str) -> str:
+    """Jinja global: content-hashed URL for a file in app/static."""
+    return static_manifest.url(path)
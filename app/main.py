@@ -2,12 +2,24 @@
 
 from contextlib import asynccontextmanager
 from fastapi import FastAPI
-from fastapi.staticfiles import StaticFiles
-from fastapi.templating import Jinja2Templates
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import settings
+from app.core import data_version
+from app.core.cache import response_cache, fragment_cache
+from app.core.compression import CompressionMiddleware
+from app.core.database import AsyncSessionLocal, async_engine
 from app.core.logging import configure_logging, logger
+from app.core.redis import close_redis
+from app.core.responses import FastJSONResponse
+from app.core.static_files import PrecompressedStaticFiles, STATIC_DIR, static_manifest
+from app.services.ai_service import insight_flight
+from app.services.indicator_cube import get_cube
+from app.services.insight_jobs import insight_jobs
+from app.services.insight_similarity import similarity_index
+from app.services.insight_sweeper import insight_sweeper
+from app.services.llm import close_llm_provider
+from app.services.taxonomy_cache import taxonomy_cache
 
 
 @asynccontextmanager
@@ -19,10 +31,27 @@ async def lifespan(app: FastAPI):
     logger.info(f"Environment: {settings.ENVIRONMENT}")
     logger.info(f"Debug mode: {settings.DEBUG}")
 
+    # Warm the in-memory indicator cube and taxonomy so the first requests are fast
+    try:
+        async with AsyncSessionLocal() as db:
+            await db.run_sync(get_cube)
+            if settings.TAXONOMY_CACHE_ENABLED:
+                await db.run_sync(taxonomy_cache.get)
+    except Exception as e:
+        logger.warning(f"Cache warm-up failed: {e}")
+
+    if settings.INSIGHT_SWEEP_ENABLED:
+        insight_sweeper.start()
+
     yield
 
     # Shutdown
     logger.info("Shutting down Brain Capital Intelligence Platform...")
+    await insight_jobs.stop()
+    await insight_sweeper.stop()
+    await close_llm_provider()
+    await async_engine.dispose()
+    await close_redis()
 
 
 # Create FastAPI application
@@ -32,6 +61,7 @@ app = FastAPI(
     version="0.1.0",
     lifespan=lifespan,
     debug=settings.DEBUG,
+    default_response_class=FastJSONResponse,
 )
 
 # Add CORS middleware
@@ -43,11 +73,16 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Mount static files
-app.mount("/static", StaticFiles(directory="app/static"), name="static")
+# Compress dynamic responses (added last, so it wraps everything)
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(CompressionMiddleware, minimum_size=settings.COMPRESSION_MINIMUM_SIZE)
 
-# Set up Jinja2 templates
-templates = Jinja2Templates(directory="app/templates")
+# Mount static files (content-hashed URLs, precompressed variants)
+app.mount(
+    "/static",
+    PrecompressedStaticFiles(directory=STATIC_DIR, manifest=static_manifest),
+    name="static",
+)
 
 # Include API routers
 from app.api.v1 import countries, indicators, insights
@@ -69,3 +104,16 @@ async def health_check():
         "version": "0.1.0",
         "environment": settings.ENVIRONMENT,
     }
+
+
+@app.get("/api/cache/stats")
+async def cache_stats():
+    """Cache hit/miss and insight generation counters for this worker."""
+    return {
+        "data_version": await data_version.refresh(),
+        "response_cache": response_cache.stats_dict(),
+        "fragment_cache": fragment_cache.stats_dict(),
+        "insight_generation": insight_flight.stats_dict(),
+        "insight_jobs": insight_jobs.stats_dict(),
+        "insight_similarity": similarity_index.stats_dict(),
+    }
@@ -5,6 +5,7 @@ from app.models.pillar import Pillar
 from app.models.dimension import Dimension
 from app.models.indicator import Indicator
 from app.models.indicator_value import IndicatorValue
+from app.models.indicator_fact import IndicatorFact
 from app.models.ai_insight import AIInsight
 
 __all__ = [
@@ -13,5 +14,6 @@ __all__ = [
     "Dimension",
     "Indicator",
     "IndicatorValue",
+    "IndicatorFact",
     "AIInsight",
 ]
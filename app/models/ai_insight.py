@@ -9,11 +9,21 @@ from app.core.database import Base
 
 
 class AIInsight(Base):
-    """AI Insight model - AI-generated insights."""
+    """
+    AI Insight model - AI-generated insights.
+
+    The table is range-partitioned by month on ``generated_at`` (migration
+    005), so its primary key is (id, generated_at) and cache_key is only
+    unique together with generated_at. Readers take the newest row per key,
+    and the insight sweeper removes older ones. ids come from one sequence
+    and still identify rows.
+    """
 
     __tablename__ = "ai_insights"
     __table_args__ = (
         Index('idx_ai_insights_filter_params', 'filter_params', postgresql_using='gin'),
+        Index('idx_ai_insights_cache_key_generated_at', 'cache_key', 'generated_at', unique=True),
+        Index('idx_ai_insights_expires_at', 'expires_at'),
     )
 
     id = Column(Integer, primary_key=True, index=True)
@@ -25,10 +35,12 @@ class AIInsight(Base):
     year_start = Column(Integer)
     year_end = Column(Integer)
     filter_params = Column(JSONB)
+    cache_key = Column(String(64))  # SHA-256 of the normalized filter_params
     insight_text = Column(Text, nullable=False)
-    confidence_score = Column(DECIMAL(3, 2))
+    confidence_score = Column(DECIMAL(3, 2, asdecimal=False))
     model_version = Column(String(100))
-    generated_at = Column(TIMESTAMP, server_default=func.now(), index=True)
+    usage = Column(JSONB)  # provider, model, token counts and latency of the generation
+    generated_at = Column(TIMESTAMP, nullable=False, server_default=func.now(), index=True)
     expires_at = Column(TIMESTAMP)
     user_feedback = Column(Integer)
     created_at = Column(TIMESTAMP, server_default=func.now())
@@ -16,10 +16,10 @@ class Country(Base):
     code = Column(String(3), unique=True, nullable=False, index=True)
     name = Column(String(255), nullable=False)
     region = Column(String(100), index=True)
-    latitude = Column(DECIMAL(9, 6))
-    longitude = Column(DECIMAL(9, 6))
+    latitude = Column(DECIMAL(9, 6, asdecimal=False))
+    longitude = Column(DECIMAL(9, 6, asdecimal=False))
     population = Column(BigInteger)
-    gdp_usd = Column(DECIMAL(15, 2))
+    gdp_usd = Column(DECIMAL(15, 2, asdecimal=False))
     created_at = Column(TIMESTAMP, server_default=func.now())
     updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
 
@@ -0,0 +1,47 @@
+"""Indicator fact model."""
+
+from sqlalchemy import Column, Integer, String, Boolean, DECIMAL, TIMESTAMP, Index
+from sqlalchemy.sql import func
+
+from app.core.database import Base
+
+
+class IndicatorFact(Base):
+    """
+    Indicator fact model - Denormalized copy of indicator values.
+
+    One row per IndicatorValue carrying the country, indicator, dimension and
+    pillar attributes the filter queries need, so they run without joins.
+    Maintained by ``app.services.fact_service.refresh_indicator_facts``.
+    """
+
+    __tablename__ = "indicator_facts"
+    __table_args__ = (
+        Index('idx_indicator_facts_indicator_year', 'indicator_id', 'year'),
+        Index('idx_indicator_facts_pillar_dimension', 'pillar_id', 'dimension_id'),
+        Index('idx_indicator_facts_country_code', 'country_code'),
+        Index('idx_indicator_facts_source_updated_at', 'source_updated_at'),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=False)  # IndicatorValue.id
+    country_id = Column(Integer, nullable=False)
+    indicator_id = Column(Integer, nullable=False)
+    dimension_id = Column(Integer, nullable=False)
+    pillar_id = Column(Integer, nullable=False)
+    year = Column(Integer, nullable=False)
+    value = Column(DECIMAL(15, 4, asdecimal=False))
+    confidence_score = Column(DECIMAL(3, 2, asdecimal=False))
+    country_code = Column(String(3), nullable=False)
+    country_name = Column(String(255), nullable=False)
+    latitude = Column(DECIMAL(9, 6, asdecimal=False))
+    longitude = Column(DECIMAL(9, 6, asdecimal=False))
+    indicator_name = Column(String(255), nullable=False)
+    unit = Column(String(100))
+    dimension_name = Column(String(255), nullable=False)
+    pillar_name = Column(String(255), nullable=False)
+    is_active = Column(Boolean, nullable=False)
+    source_updated_at = Column(TIMESTAMP)
+    refreshed_at = Column(TIMESTAMP, server_default=func.now())
+
+    def __repr__(self) -> str:
+        return f"<IndicatorFact(country_code={self.country_code}, indicator_id={self.indicator_id}, year={self.year})>"
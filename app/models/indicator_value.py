@@ -20,8 +20,8 @@ class IndicatorValue(Base):
     country_id = Column(Integer, ForeignKey("countries.id", ondelete="CASCADE"), nullable=False, index=True)
     indicator_id = Column(Integer, ForeignKey("indicators.id", ondelete="CASCADE"), nullable=False, index=True)
     year = Column(Integer, nullable=False, index=True)
-    value = Column(DECIMAL(15, 4))
-    confidence_score = Column(DECIMAL(3, 2))
+    value = Column(DECIMAL(15, 4, asdecimal=False))
+    confidence_score = Column(DECIMAL(3, 2, asdecimal=False))
     notes = Column(Text)
     created_at = Column(TIMESTAMP, server_default=func.now())
     updated_at = Column(TIMESTAMP, server_default=func.now(), onupdate=func.now())
@@ -15,11 +15,12 @@ from app.schemas.indicator import (
     IndicatorValue,
     IndicatorValueWithDetails,
 )
-from app.schemas.filter import FilterParams, MapDataParams
+from app.schemas.filter import FilterParams, MapDataParams, CountMode, MapFormat
 from app.schemas.insight import (
     InsightGenerateRequest,
     Insight,
     InsightFeedback,
+    InsightJob,
 )
 
 __all__ = [
@@ -39,8 +40,11 @@ __all__ = [
     # Filter
     "FilterParams",
     "MapDataParams",
+    "CountMode",
+    "MapFormat",
     # Insight
     "InsightGenerateRequest",
     "Insight",
     "InsightFeedback",
+    "InsightJob",
 ]
@@ -1,6 +1,5 @@
 """Country schemas."""
 
-from decimal import Decimal
 from datetime import datetime
 from pydantic import BaseModel, Field
 
@@ -10,10 +9,10 @@ class CountryBase(BaseModel):
     code: str = Field(..., min_length=2, max_length=3)
     name: str = Field(..., min_length=1, max_length=255)
     region: str | None = None
-    latitude: Decimal | None = None
-    longitude: Decimal | None = None
+    latitude: float | None = None
+    longitude: float | None = None
     population: int | None = None
-    gdp_usd: Decimal | None = None
+    gdp_usd: float | None = None
 
 
 class CountryCreate(CountryBase):
@@ -25,10 +24,10 @@ class CountryUpdate(BaseModel):
     """Schema for updating a country."""
     name: str | None = None
     region: str | None = None
-    latitude: Decimal | None = None
-    longitude: Decimal | None = None
+    latitude: float | None = None
+    longitude: float | None = None
     population: int | None = None
-    gdp_usd: Decimal | None = None
+    gdp_usd: float | None = None
 
 
 class Country(CountryBase):
@@ -1,7 +1,40 @@
 """Filter schemas."""
 
+import base64
+import json
+from typing import Literal
+
 from pydantic import BaseModel, Field
 
+# How list endpoints compute their total: exact count, planner estimate, or skip
+CountMode = Literal["exact", "estimate", "none"]
+
+# Map payload layout: a list of per-country objects, or parallel arrays
+MapFormat = Literal["rows", "columnar"]
+
+
+def encode_cursor(last_id: int) -> str:
+    """Encode the last returned row ID as an opaque pagination cursor."""
+    payload = json.dumps({"id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> int:
+    """
+    Decode an opaque pagination cursor into the last seen row ID.
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        last_id = json.loads(base64.urlsafe_b64decode(padded))["id"]
+    except (ValueError, TypeError, KeyError) as e:
+        raise ValueError("Invalid cursor") from e
+    if not isinstance(last_id, int) or last_id < 0:
+        raise ValueError("Invalid cursor")
+    return last_id
+
 
 class FilterParams(BaseModel):
     """Query parameters for filtering indicator data."""
@@ -13,6 +46,7 @@ class FilterParams(BaseModel):
     year_end: int | None = Field(None, ge=1900, le=2100)
     limit: int = Field(100, ge=1, le=1000)
     offset: int = Field(0, ge=0)
+    after_id: int | None = Field(None, ge=0, description="Keyset pagination: return rows with a greater ID")
 
     @property
     def country_code_list(self) -> list[str] | None:
@@ -1,6 +1,5 @@
 """Indicator schemas."""
 
-from decimal import Decimal
 from datetime import datetime
 from pydantic import BaseModel, Field
 
@@ -77,8 +76,8 @@ class IndicatorValueBase(BaseModel):
     country_id: int
     indicator_id: int
     year: int = Field(..., ge=1900, le=2100)
-    value: Decimal | None = None
-    confidence_score: Decimal | None = Field(None, ge=0, le=1)
+    value: float | None = None
+    confidence_score: float | None = Field(None, ge=0, le=1)
     notes: str | None = None
 
 
@@ -101,9 +100,9 @@ class IndicatorValueWithDetails(BaseModel):
     dimension_name: str
     pillar_name: str
     year: int
-    value: Decimal | None
+    value: float | None
     unit: str | None
-    confidence_score: Decimal | None
+    confidence_score: float | None
 
     class Config:
         from_attributes = True
@@ -1,9 +1,11 @@
 """AI Insight schemas."""
 
-from decimal import Decimal
 from datetime import datetime
+from typing import Literal
 from pydantic import BaseModel, Field
 
+InsightJobStatus = Literal["pending", "running", "done", "failed"]
+
 
 class InsightGenerateRequest(BaseModel):
     """Request schema for generating AI insights."""
@@ -20,7 +22,7 @@ class InsightBase(BaseModel):
     """Base insight schema."""
     insight_type: str
     insight_text: str
-    confidence_score: Decimal | None = None
+    confidence_score: float | None = None
     model_version: str | None = None
 
 
@@ -44,3 +46,11 @@ class Insight(InsightBase):
 class InsightFeedback(BaseModel):
     """Schema for submitting insight feedback."""
     rating: int = Field(..., ge=1, le=5, description="Rating from 1 to 5 stars")
+
+
+class InsightJob(BaseModel):
+    """Status of a background insight generation job."""
+    job_id: str
+    status: InsightJobStatus
+    insight: Insight | None = None
+    error: str | None = None
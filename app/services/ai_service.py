@@ -1,10 +1,132 @@
-"""AI service for generating insights."""
+"""AI service for generating insights.
 
+Insights are cached under a SHA-256 of their normalized filter parameters,
+stored in the indexed ``ai_insights.cache_key`` column. An in-process LRU of
+insight snapshots answers repeat requests without a database round trip.
+Concurrent requests for the same key share a single generation, across
+workers too (see ``app.core.single_flight``). That, not a unique index (the
+table is partitioned by ``generated_at``), keeps one row per key; lookups
+take the newest row if a duplicate slips through, and the insight sweeper
+deletes the older ones.
+
+Text comes from the provider configured by ``AI_PROVIDER`` (see
+``app.services.llm``); model calls are made outside any database session.
+Before generating, a stored insight for near-identical filters is reused
+when one is close enough (see ``app.services.insight_similarity``).
+"""
+
+import hashlib
 from datetime import datetime, timedelta
 from sqlalchemy.orm import Session
 from app.models import AIInsight
-from app.schemas.insight import InsightGenerateRequest
+from app.schemas.insight import Insight, InsightGenerateRequest
 from app.config import settings
+from app.core.cache import LRUCache, normalize_params
+from app.core.database import AsyncSessionLocal
+from app.core.single_flight import SingleFlight
+from app.services.base import AsyncServiceAdapter
+from app.services.insight_context import build_insight_context
+from app.services.insight_rules import rule_based_insight
+from app.services.insight_similarity import similarity_index
+from app.services.llm import (
+    Completion,
+    CompletionStream,
+    LLMProvider,
+    RuleBasedProvider,
+    get_llm_provider,
+)
+
+insight_cache = LRUCache(
+    settings.INSIGHT_CACHE_LOCAL_SIZE, ttl_seconds=settings.INSIGHT_CACHE_LOCAL_TTL_SECONDS
+)
+insight_flight = SingleFlight(
+    "insight",
+    lock_ttl_seconds=settings.INSIGHT_LOCK_TTL_SECONDS,
+    poll_seconds=settings.INSIGHT_LOCK_POLL_SECONDS,
+)
+
+
+def insight_filter_params(request: InsightGenerateRequest) -> dict:
+    """Normalized filters of an insight request: equivalent requests compare equal."""
+    return {
+        "insight_type": request.insight_type,
+        "country_code": request.country_code.upper() if request.country_code else None,
+        "indicator_ids": sorted(set(request.indicator_ids)) if request.indicator_ids else None,
+        "pillar_id": request.pillar_id,
+        "dimension_id": request.dimension_id,
+        "year_start": request.year_start,
+        "year_end": request.year_end,
+    }
+
+
+def insight_cache_key(request: InsightGenerateRequest) -> str:
+    """Cache key of an insight request: SHA-256 of its normalized filters."""
+    return hashlib.sha256(normalize_params(insight_filter_params(request)).encode()).hexdigest()
+
+
+def _is_live(insight: Insight | AIInsight) -> bool:
+    return insight.expires_at is None or insight.expires_at > datetime.utcnow()
+
+
+def get_local_insight(cache_key: str) -> Insight | None:
+    """Unexpired insight snapshot from the in-process cache."""
+    cached = insight_cache.get(cache_key)
+    return cached if cached is not None and _is_live(cached) else None
+
+
+def build_insight_messages(
+    request: InsightGenerateRequest, context: str | None = None
+) -> list[dict]:
+    """Chat messages asking the model for an insight on the request's filters and data."""
+    filters = ", ".join(
+        f"{name}={value}" for name, value in insight_filter_params(request).items()
+        if value is not None and name != "insight_type"
+    )
+    prompt = f"Write a {request.insight_type} insight for: {filters or 'all data'}."
+    if context:
+        prompt += f"\n\nData:\n{context}"
+    return [
+        {
+            "role": "system",
+            "content": (
+                "You are an analyst of brain capital indicators: brain health, brain "
+                "skills and brain capital drivers. Write a concise, factual insight "
+                "of two or three sentences, using only the figures in the data given."
+            ),
+        },
+        {"role": "user", "content": prompt},
+    ]
+
+
+def insight_values(
+    request: InsightGenerateRequest, completion: Completion, country_id: int | None
+) -> dict:
+    """Column values of a freshly generated insight (a new or regenerated row)."""
+    now = datetime.utcnow()
+    return {
+        "cache_key": insight_cache_key(request),
+        "insight_type": request.insight_type,
+        "country_id": country_id,
+        "pillar_id": request.pillar_id,
+        "dimension_id": request.dimension_id,
+        "year_start": request.year_start,
+        "year_end": request.year_end,
+        "filter_params": insight_filter_params(request),
+        "insight_text": completion.text,
+        "confidence_score": 0.75,  # Placeholder confidence
+        "model_version": completion.model_version,
+        "usage": completion.usage(),
+        "generated_at": now,
+        "expires_at": now + timedelta(hours=settings.INSIGHT_TTL_HOURS),
+        "user_feedback": None,
+    }
+
+
+def _remember(ai_insight: AIInsight) -> Insight:
+    """Snapshot a stored insight into the in-process cache."""
+    insight = Insight.model_validate(ai_insight)
+    insight_cache.set(ai_insight.cache_key, insight)
+    return insight
 
 
 class AIService:
@@ -15,103 +137,192 @@ class AIService:
 
     def generate_insight(self, request: InsightGenerateRequest) -> AIInsight:
         """
-        Generate an AI insight based on the request.
-
-        This is a placeholder implementation. In production, this would:
-        1. Fetch relevant data from the database
-        2. Build a context prompt
-        3. Call OpenAI/HuggingFace API
-        4. Parse and validate the response
-        5. Cache the result
+        Generate and store an insight with the rule-based model.
+
+        Synchronous callers can't wait on a model API; the async paths
+        (``get_or_generate_shared``, ``stream_insight``) use the configured
+        provider.
         """
-        # Placeholder rule-based insight
-        insight_text = self._generate_placeholder_insight(request)
-
-        # Create AI insight record
-        ai_insight = AIInsight(
-            insight_type=request.insight_type,
-            country_id=self._get_country_id(request.country_code) if request.country_code else None,
-            pillar_id=request.pillar_id,
-            dimension_id=request.dimension_id,
-            year_start=request.year_start,
-            year_end=request.year_end,
-            filter_params={
-                "insight_type": request.insight_type,
-                "country_code": request.country_code,
-                "indicator_ids": request.indicator_ids,
-            },
-            insight_text=insight_text,
-            confidence_score=0.75,  # Placeholder confidence
-            model_version="rule-based-v1",
-            expires_at=datetime.utcnow() + timedelta(hours=24),
-        )
+        provider = RuleBasedProvider(rule_based_insight(self.db, request))
+        messages = build_insight_messages(request, build_insight_context(self.db, request))
+        return self.store_insight(request, provider.complete_sync(messages))
+
+    def store_insight(self, request: InsightGenerateRequest, completion: Completion) -> AIInsight:
+        """Store a completion as the insight for the request's filters."""
+        cache_key = insight_cache_key(request)
+
+        # An expired insight for the same filters is regenerated in place (it moves to
+        # the current generated_at partition); the sweeper deletes ones nobody asks for again
+        ai_insight = self.db.query(AIInsight).filter(
+            AIInsight.cache_key == cache_key
+        ).order_by(AIInsight.generated_at.desc()).first()
+        if ai_insight is None:
+            ai_insight = AIInsight(cache_key=cache_key)
+            self.db.add(ai_insight)
+
+        country_id = self._get_country_id(request.country_code) if request.country_code else None
+        for column, value in insight_values(request, completion, country_id).items():
+            setattr(ai_insight, column, value)
 
-        self.db.add(ai_insight)
         self.db.commit()
         self.db.refresh(ai_insight)
 
         return ai_insight
 
-    def get_cached_insight(
-        self,
-        insight_type: str,
-        country_code: str | None = None,
-        indicator_ids: list[int] | None = None,
-    ) -> AIInsight | None:
-        """Check if a similar insight exists in cache."""
-        query = self.db.query(AIInsight).filter(
-            AIInsight.insight_type == insight_type,
+    def get_cached_insight(self, cache_key: str) -> AIInsight | None:
+        """Get the unexpired insight stored under a cache key."""
+        return self.db.query(AIInsight).filter(
+            AIInsight.cache_key == cache_key,
             AIInsight.expires_at > datetime.utcnow(),
-        )
-
-        if country_code:
-            country_id = self._get_country_id(country_code)
-            if country_id:
-                query = query.filter(AIInsight.country_id == country_id)
+        ).order_by(AIInsight.generated_at.desc()).first()
 
-        return query.first()
+    def get_insight(self, insight_id: int) -> AIInsight | None:
+        """Get an insight by ID."""
+        return self.db.query(AIInsight).filter(AIInsight.id == insight_id).first()
 
     def submit_feedback(self, insight_id: int, rating: int) -> AIInsight | None:
         """Submit user feedback for an insight."""
-        insight = self.db.query(AIInsight).filter(AIInsight.id == insight_id).first()
+        insight = self.get_insight(insight_id)
         if not insight:
             return None
 
         insight.user_feedback = rating
         self.db.commit()
         self.db.refresh(insight)
+        if insight.cache_key:
+            insight_cache.pop(insight.cache_key)
 
         return insight
 
-    def _generate_placeholder_insight(self, request: InsightGenerateRequest) -> str:
-        """Generate a placeholder insight (to be replaced with real AI)."""
-        if request.insight_type == "country":
-            return (
-                f"Based on the available data for {request.country_code}, "
-                f"brain capital indicators show a moderate level of development. "
-                f"Key areas for improvement include education access and digital infrastructure."
-            )
-        elif request.insight_type == "trend":
-            return (
-                f"Trend analysis from {request.year_start} to {request.year_end} "
-                f"indicates steady progress across most brain capital dimensions. "
-                f"Notable improvements are observed in digitalization and brain health."
-            )
-        elif request.insight_type == "comparative":
-            return (
-                f"Comparative analysis reveals significant variation across regions. "
-                f"High-income countries generally outperform in brain skills metrics, "
-                f"while emerging economies show rapid improvement in brain capital drivers."
-            )
-        else:
-            return (
-                f"Analysis of brain capital indicators provides insights into "
-                f"the overall capacity and potential of the population."
-            )
-
     def _get_country_id(self, country_code: str) -> int | None:
         """Get country ID from country code."""
         from app.models import Country
 
         country = self.db.query(Country).filter(Country.code == country_code.upper()).first()
         return country.id if country else None
+
+
+class AsyncAIService(AsyncServiceAdapter):
+    """Async AI insight service."""
+
+    service_class = AIService
+
+    async def generate_insight(self, request: InsightGenerateRequest) -> AIInsight:
+        """Generate an AI insight based on the request."""
+        return await self._run(AIService.generate_insight, request)
+
+    async def get_cached_insight(self, cache_key: str) -> AIInsight | None:
+        """Get the unexpired insight stored under a cache key."""
+        return await self._run(AIService.get_cached_insight, cache_key)
+
+    async def get_or_generate_insight(self, request: InsightGenerateRequest) -> Insight:
+        """
+        Get the cached insight for the request's filters, generating it on a miss.
+
+        Concurrent misses for the same filters wait for one generation.
+        """
+        return await get_or_generate_shared(request)
+
+    async def get_insight(self, insight_id: int) -> AIInsight | None:
+        """Get an insight by ID."""
+        return await self._run(AIService.get_insight, insight_id)
+
+    async def submit_feedback(self, insight_id: int, rating: int) -> AIInsight | None:
+        """Submit user feedback for an insight."""
+        return await self._run(AIService.submit_feedback, insight_id, rating)
+
+
+async def get_or_generate_shared(request: InsightGenerateRequest) -> Insight:
+    """
+    Get or generate the insight for a request's filters outside any request session.
+
+    Concurrent calls for the same filters share one generation, which runs in
+    its own session so it can outlive the request (or job) that started it.
+    """
+    cache_key = insight_cache_key(request)
+    cached = get_local_insight(cache_key)
+    if cached is not None:
+        return cached
+    return await insight_flight.run(cache_key, lambda: _get_or_generate_in_own_session(request))
+
+
+async def _get_or_generate_in_own_session(request: InsightGenerateRequest) -> Insight:
+    cached = await find_stored_insight(insight_cache_key(request))
+    if cached is None:
+        cached = await find_similar_insight(request)
+    if cached is not None:
+        return cached
+    return await save_insight(request, await generate_insight_completion(request))
+
+
+async def find_stored_insight(cache_key: str) -> Insight | None:
+    """Unexpired insight for a cache key from the in-process cache or the database."""
+    cached = get_local_insight(cache_key)
+    if cached is not None:
+        return cached
+    async with AsyncSessionLocal() as db:
+        ai_insight = await db.run_sync(
+            lambda session: AIService(session).get_cached_insight(cache_key)
+        )
+        return _remember(ai_insight) if ai_insight is not None else None
+
+
+async def find_similar_insight(request: InsightGenerateRequest) -> Insight | None:
+    """Unexpired insight stored for filters close enough to the request's."""
+    if not settings.INSIGHT_SIMILARITY_ENABLED:
+        return None
+    params = insight_filter_params(request)
+    async with AsyncSessionLocal() as db:
+        await similarity_index.refresh(db)
+        match = await db.run_sync(lambda session: similarity_index.find(session, params))
+    if match is None:
+        return None
+
+    cache_key, _ = match
+    insight = await find_stored_insight(cache_key)
+    if insight is None:
+        similarity_index.discard(cache_key)
+        return None
+    # Later requests for the same filters then hit the exact-key cache
+    insight_cache.set(insight_cache_key(request), insight)
+    return insight
+
+
+async def _prepare(request: InsightGenerateRequest) -> tuple[LLMProvider, list[dict]]:
+    """The model to ask and the messages to send, with the request's data context."""
+    provider = get_llm_provider()
+
+    def prepare(session: Session) -> tuple[LLMProvider, list[dict]]:
+        messages = build_insight_messages(request, build_insight_context(session, request))
+        return provider or RuleBasedProvider(rule_based_insight(session, request)), messages
+
+    async with AsyncSessionLocal() as db:
+        return await db.run_sync(prepare)
+
+
+async def generate_insight_completion(request: InsightGenerateRequest) -> Completion:
+    """Generate a new insight with the configured model, without storing it."""
+    provider, messages = await _prepare(request)
+    return await provider.complete(messages)
+
+
+async def stream_insight(request: InsightGenerateRequest) -> CompletionStream:
+    """
+    Stream a new insight's text as the model produces it, without storing it.
+
+    The stream's ``completion`` is set once it has been read to the end.
+    """
+    provider, messages = await _prepare(request)
+    return provider.stream(messages)
+
+
+async def save_insight(request: InsightGenerateRequest, completion: Completion) -> Insight:
+    """Persist a completion as the insight for the request's filters."""
+
+    def save(session: Session) -> Insight:
+        ai_insight = AIService(session).store_insight(request, completion)
+        similarity_index.add(session, ai_insight.cache_key, ai_insight.filter_params)
+        return _remember(ai_insight)
+
+    async with AsyncSessionLocal() as db:
+        return await db.run_sync(save)
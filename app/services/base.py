@@ -0,0 +1,27 @@
+"""Shared service helpers."""
+
+from typing import Any, Callable
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class AsyncServiceAdapter:
+    """
+    Base class for async services.
+
+    Subclasses wrap a synchronous service and run its methods through
+    ``AsyncSession.run_sync``. The query code stays in one place while all
+    database I/O goes through the async driver instead of blocking the event
+    loop.
+    """
+
+    service_class: type
+
+    def __init__(self, db: AsyncSession):
+        self.db = db
+
+    async def _run(self, method: Callable[..., Any], *args, **kwargs) -> Any:
+        """Run an unbound sync service method on this session."""
+        return await self.db.run_sync(
+            lambda session: method(self.service_class(session), *args, **kwargs)
+        )
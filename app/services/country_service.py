@@ -3,6 +3,7 @@
 from sqlalchemy.orm import Session
 from app.models import Country
 from app.schemas.country import CountryCreate, CountryUpdate
+from app.services.base import AsyncServiceAdapter
 
 
 class CountryService:
@@ -62,3 +63,41 @@ class CountryService:
     def count(self) -> int:
         """Count total countries."""
         return self.db.query(Country).count()
+
+
+class AsyncCountryService(AsyncServiceAdapter):
+    """Async country service."""
+
+    service_class = CountryService
+
+    async def get_all(self, skip: int = 0, limit: int = 100) -> list[Country]:
+        """Get all countries."""
+        return await self._run(CountryService.get_all, skip=skip, limit=limit)
+
+    async def get_by_id(self, country_id: int) -> Country | None:
+        """Get country by ID."""
+        return await self._run(CountryService.get_by_id, country_id)
+
+    async def get_by_code(self, country_code: str) -> Country | None:
+        """Get country by code."""
+        return await self._run(CountryService.get_by_code, country_code)
+
+    async def get_by_region(self, region: str) -> list[Country]:
+        """Get countries by region."""
+        return await self._run(CountryService.get_by_region, region)
+
+    async def create(self, country: CountryCreate) -> Country:
+        """Create a new country."""
+        return await self._run(CountryService.create, country)
+
+    async def update(self, country_id: int, country: CountryUpdate) -> Country | None:
+        """Update a country."""
+        return await self._run(CountryService.update, country_id, country)
+
+    async def delete(self, country_id: int) -> bool:
+        """Delete a country."""
+        return await self._run(CountryService.delete, country_id)
+
+    async def count(self) -> int:
+        """Count total countries."""
+        return await self._run(CountryService.count)
@@ -0,0 +1,186 @@
+"""Columnar (Arrow / Parquet) export of indicator values."""
+
+import asyncio
+from functools import partial
+from typing import Callable, Literal
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy.orm import Session
+
+from app.core.cache import LRUCache
+from app.schemas.filter import FilterParams
+from app.services.base import AsyncServiceAdapter
+from app.services.filter_service import FilterService
+from app.services.indicator_cube import IndicatorCube, dataset_version, get_cube
+
+ExportFormat = Literal["arrow", "parquet"]
+
+MEDIA_TYPES: dict[str, str] = {
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+# Same columns as the JSON and CSV paths; names repeat on every row, so the
+# string columns are dictionary-encoded
+SCHEMA = pa.schema([
+    ("id", pa.int64()),
+    ("country_code", pa.dictionary(pa.int32(), pa.string())),
+    ("country_name", pa.dictionary(pa.int32(), pa.string())),
+    ("latitude", pa.float64()),
+    ("longitude", pa.float64()),
+    ("indicator_name", pa.dictionary(pa.int32(), pa.string())),
+    ("unit", pa.dictionary(pa.int32(), pa.string())),
+    ("dimension_name", pa.dictionary(pa.int32(), pa.string())),
+    ("pillar_name", pa.dictionary(pa.int32(), pa.string())),
+    ("year", pa.int32()),
+    ("value", pa.float64()),
+    ("confidence_score", pa.float64()),
+])
+
+# Serialized full snapshots, keyed by format and data version
+_snapshots = LRUCache(maxsize=len(MEDIA_TYPES))
+
+
+def _dictionary(indices: np.ndarray, labels: np.ndarray) -> pa.DictionaryArray:
+    """Dictionary-encode labels looked up by axis position; None labels become nulls."""
+    codes, uniques = pd.factorize(labels)
+    codes = codes[indices]
+    missing = codes < 0
+    return pa.DictionaryArray.from_arrays(
+        pa.array(codes, pa.int32()),
+        pa.array(uniques, pa.string()),
+        mask=missing if missing.any() else None,
+    )
+
+
+def _float_column(values) -> pa.Array:
+    """Float column with NaN/None as null."""
+    return pa.array(np.asarray(values, dtype=np.float64), pa.float64(), from_pandas=True)
+
+
+def serialize_table(table: pa.Table, export_format: ExportFormat) -> bytes:
+    """Serialize a table as a zstd-compressed Arrow IPC stream or Parquet file."""
+    sink = pa.BufferOutputStream()
+    if export_format == "parquet":
+        pq.write_table(table, sink, compression="zstd")
+    else:
+        options = pa.ipc.IpcWriteOptions(compression="zstd")
+        with pa.ipc.new_stream(sink, table.schema, options=options) as writer:
+            writer.write_table(table)
+    return sink.getvalue().to_pybytes()
+
+
+def _cube_table(cube: IndicatorCube, cells: tuple[np.ndarray, ...]) -> pa.Table:
+    """Build a table from cube cells, see IndicatorCube.get_filtered_cells."""
+    ids, c, i, y = cells
+    columns = [
+        pa.array(ids, pa.int64()),
+        _dictionary(c, cube.country_codes),
+        _dictionary(c, cube.country_names),
+        _float_column(cube.latitudes[c]),
+        _float_column(cube.longitudes[c]),
+        _dictionary(i, cube.indicator_names),
+        _dictionary(i, cube.units),
+        _dictionary(i, cube.dimension_names),
+        _dictionary(i, cube.pillar_names),
+        pa.array(cube.years[y], pa.int32()),
+        _float_column(cube.values[c, i, y]),
+        _float_column(cube.confidence[c, i, y]),
+    ]
+    return pa.Table.from_arrays(columns, schema=SCHEMA)
+
+
+def _rows_table(rows: list) -> pa.Table:
+    """Build a table from fact rows selected by FilterService.export_statement."""
+    values = list(zip(*rows)) or [()] * len(SCHEMA)
+    columns = []
+    for field, column in zip(SCHEMA, values):
+        if pa.types.is_dictionary(field.type):
+            columns.append(pa.array(column, pa.string()).dictionary_encode().cast(field.type))
+        elif pa.types.is_floating(field.type):
+            columns.append(_float_column(column))
+        else:
+            columns.append(pa.array(column, field.type))
+    return pa.Table.from_arrays(columns, schema=SCHEMA)
+
+
+def _build_export(build_table: Callable[[], pa.Table], export_format: ExportFormat) -> bytes:
+    return serialize_table(build_table(), export_format)
+
+
+class ExportService:
+    """Service building column-oriented exports of indicator values."""
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def get_table_builder(self, filters: FilterParams) -> Callable[[], pa.Table]:
+        """
+        Fetch all indicator values matching filters, returning a table builder.
+
+        Pagination fields of filters are ignored. Only the fetch touches the
+        session; the returned callable builds the Arrow table from the
+        indicator cube's arrays when it is enabled, otherwise from the fact
+        table query results, and is safe to run in a worker thread.
+        """
+        cube = get_cube(self.db)
+        if cube is not None:
+            return partial(_cube_table, cube, cube.get_filtered_cells(filters))
+
+        rows = self.db.execute(FilterService.export_statement(filters)).all()
+        return partial(_rows_table, rows)
+
+    def get_filtered_table(self, filters: FilterParams) -> pa.Table:
+        """Get all indicator values matching filters as an Arrow table."""
+        return self.get_table_builder(filters)()
+
+    def get_filtered_export(self, filters: FilterParams, export_format: ExportFormat) -> bytes:
+        """Get indicator values matching filters serialized in export_format."""
+        return serialize_table(self.get_filtered_table(filters), export_format)
+
+    def get_snapshot_key(self, export_format: ExportFormat) -> str:
+        """Key of the full snapshot in export_format for the current data."""
+        return f"{export_format}:{dataset_version(get_cube(self.db))}"
+
+    def get_snapshot(self, export_format: ExportFormat) -> bytes:
+        """
+        Get every active indicator value serialized in export_format.
+
+        The serialized snapshot is kept in memory until the data changes, so
+        repeated bulk pulls cost one build per data load.
+        """
+        key = self.get_snapshot_key(export_format)
+        body = _snapshots.get(key)
+        if body is None:
+            body = self.get_filtered_export(FilterParams(), export_format)
+            _snapshots.set(key, body)
+        return body
+
+
+class AsyncExportService(AsyncServiceAdapter):
+    """
+    Async export service.
+
+    Rows are fetched through the session as usual, but building and
+    serializing the table is CPU-bound and runs in a worker thread so it
+    doesn't stall the event loop.
+    """
+
+    service_class = ExportService
+
+    async def get_filtered_export(self, filters: FilterParams, export_format: ExportFormat) -> bytes:
+        """Get indicator values matching filters serialized in export_format."""
+        build_table = await self._run(ExportService.get_table_builder, filters)
+        return await asyncio.to_thread(_build_export, build_table, export_format)
+
+    async def get_snapshot(self, export_format: ExportFormat) -> bytes:
+        """Get every active indicator value serialized in export_format."""
+        key = await self._run(ExportService.get_snapshot_key, export_format)
+        body = _snapshots.get(key)
+        if body is None:
+            body = await self.get_filtered_export(FilterParams(), export_format)
+            _snapshots.set(key, body)
+        return body
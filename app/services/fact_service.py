@@ -0,0 +1,139 @@
+"""
+Maintenance of the denormalized indicator fact table.
+
+Bulk loads refresh the facts explicitly. ORM writes to the tables feeding
+them are applied in the writing transaction itself, by a ``before_commit``
+hook, so fact-backed reads never lag a committed ORM write.
+"""
+
+from datetime import timedelta
+
+from sqlalchemy import delete, event, exists, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models import Country, Pillar, Dimension, Indicator, IndicatorValue, IndicatorFact
+
+# Fact columns in the order produced by _source_select()
+FACT_COLUMNS = [
+    "id",
+    "country_id",
+    "indicator_id",
+    "dimension_id",
+    "pillar_id",
+    "year",
+    "value",
+    "confidence_score",
+    "country_code",
+    "country_name",
+    "latitude",
+    "longitude",
+    "indicator_name",
+    "unit",
+    "dimension_name",
+    "pillar_name",
+    "is_active",
+    "source_updated_at",
+    "refreshed_at",
+]
+
+
+def _source_updated_at():
+    """Latest change to a fact row's inputs across all joined tables."""
+    return func.greatest(
+        IndicatorValue.updated_at,
+        Country.updated_at,
+        Indicator.updated_at,
+        Dimension.updated_at,
+        Pillar.updated_at,
+    )
+
+
+def _source_select():
+    """Select fact rows from the normalized tables."""
+    return (
+        select(
+            IndicatorValue.id,
+            IndicatorValue.country_id,
+            IndicatorValue.indicator_id,
+            Dimension.id,
+            Pillar.id,
+            IndicatorValue.year,
+            IndicatorValue.value,
+            IndicatorValue.confidence_score,
+            Country.code,
+            Country.name,
+            Country.latitude,
+            Country.longitude,
+            Indicator.name,
+            Indicator.unit,
+            Dimension.name,
+            Pillar.name,
+            func.coalesce(Indicator.is_active, True),
+            _source_updated_at(),
+            func.now(),
+        )
+        .join(Country, IndicatorValue.country_id == Country.id)
+        .join(Indicator, IndicatorValue.indicator_id == Indicator.id)
+        .join(Dimension, Indicator.dimension_id == Dimension.id)
+        .join(Pillar, Dimension.pillar_id == Pillar.id)
+    )
+
+
+def _apply_changes(db: Session, full: bool) -> dict:
+    """Upsert changed facts and delete orphaned ones, without committing."""
+    watermark = None if full else db.execute(select(func.max(IndicatorFact.source_updated_at))).scalar()
+
+    source = _source_select()
+    if watermark is not None:
+        # updated_at is its transaction's start time, so a transaction that
+        # started before the newest fact but committed after the last refresh
+        # has older timestamps: rescan a window behind the watermark for those
+        lag = timedelta(seconds=settings.FACTS_REFRESH_LAG_SECONDS)
+        source = source.where(_source_updated_at() >= watermark - lag)
+
+    stmt = insert(IndicatorFact).from_select(FACT_COLUMNS, source)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[IndicatorFact.id],
+        set_={column: stmt.excluded[column] for column in FACT_COLUMNS if column != "id"},
+    )
+    upserted = db.execute(stmt).rowcount
+
+    deleted = db.execute(
+        delete(IndicatorFact).where(
+            ~exists().where(IndicatorValue.id == IndicatorFact.id)
+        )
+    ).rowcount
+
+    return {"upserted": upserted, "deleted": deleted, "full": watermark is None}
+
+
+def refresh_indicator_facts(db: Session, full: bool = False) -> dict:
+    """
+    Bring indicator_facts up to date with the normalized tables.
+
+    Incremental by default: only rows whose inputs changed since shortly
+    before the newest ``source_updated_at`` already in the fact table are
+    upserted, and facts whose indicator value was deleted are removed.
+    ``full=True`` re-upserts every row. Writes that bypass the ORM must set
+    ``updated_at`` for the incremental mode to see them.
+
+    Returns counts of upserted and deleted rows.
+    """
+    result = _apply_changes(db, full)
+    db.commit()
+    return result
+
+
+@event.listens_for(Session, "before_commit")
+def _refresh_on_commit(session: Session) -> None:
+    if not settings.FACTS_REFRESH_ON_COMMIT:
+        return
+    # The final flush sets the data_changed flag (see app.core.data_version)
+    session.flush()
+    if not session.info.get("data_changed"):
+        return
+    # The upsert is Postgres' INSERT ... ON CONFLICT
+    if session.get_bind().dialect.name == "postgresql":
+        _apply_changes(session, full=False)
@@ -1,86 +1,234 @@
 """Filter service with cascading logic."""
 
-from sqlalchemy.orm import Session, joinedload
-from sqlalchemy import and_
-from app.models import Country, Pillar, Dimension, Indicator, IndicatorValue
-from app.schemas.filter import FilterParams
+import json
+from typing import AsyncIterator
+
+from sqlalchemy.orm import Session, Query
+from sqlalchemy import Select, and_, func, select
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.expression import ClauseElement, Executable
+from app.models import IndicatorFact
+from app.schemas.filter import FilterParams, CountMode
+from app.services.base import AsyncServiceAdapter
+from app.services.indicator_cube import get_cube
+# Registers the hook that keeps indicator_facts current on ORM commits
+import app.services.fact_service  # noqa: F401
+
+
+# Columns of a filtered values row, see FilterService._row_to_dict
+VALUE_COLUMNS = (
+    IndicatorFact.id,
+    IndicatorFact.country_code,
+    IndicatorFact.country_name,
+    IndicatorFact.latitude,
+    IndicatorFact.longitude,
+    IndicatorFact.indicator_name,
+    IndicatorFact.unit,
+    IndicatorFact.dimension_name,
+    IndicatorFact.pillar_name,
+    IndicatorFact.year,
+    IndicatorFact.value,
+    IndicatorFact.confidence_score,
+)
+
+
+def _quantize(values: list[float | None], scale: int | None) -> list[float | int | None]:
+    if scale is None:
+        return values
+    return [None if v is None else round(v * scale) for v in values]
+
+
+def columnar_map_data(rows: list[dict], precision: int | None = None) -> dict:
+    """
+    Convert map data rows into a compact columnar payload.
+
+    Countries become parallel arrays and the unit, shared by every row of one
+    indicator, is sent once. With ``precision``, values and coordinates are
+    sent as integers scaled by ``10 ** precision`` (given as ``scale``);
+    clients divide by it to decode.
+    """
+    scale = 10 ** precision if precision is not None else None
+    return {
+        "format": "columnar",
+        "count": len(rows),
+        "unit": rows[0]["unit"] if rows else None,
+        "scale": scale,
+        "country_code": [row["country_code"] for row in rows],
+        "country_name": [row["country_name"] for row in rows],
+        "latitude": _quantize([row["latitude"] for row in rows], scale),
+        "longitude": _quantize([row["longitude"] for row in rows], scale),
+        "value": _quantize([row["value"] for row in rows], scale),
+    }
+
+
+class Explain(Executable, ClauseElement):
+    """``EXPLAIN (FORMAT JSON)`` of a statement, with its parameters still bound."""
+
+    inherit_cache = False
+
+    def __init__(self, statement: Select):
+        self.statement = statement
+
+
+@compiles(Explain, "postgresql")
+def _compile_explain(element: Explain, compiler, **kw) -> str:
+    return f"EXPLAIN (FORMAT JSON) {compiler.process(element.statement, **kw)}"
 
 
 class FilterService:
-    """Service for cascading filter operations."""
+    """
+    Service for cascading filter operations.
+
+    Served from the in-memory indicator cube when enabled; otherwise queries
+    the denormalized indicator_facts table, which needs no joins.
+    """
 
     def __init__(self, db: Session):
         self.db = db
 
+    def _values_query(self, *extra_columns) -> Query:
+        """Base query over the denormalized fact table."""
+        return self.db.query(*VALUE_COLUMNS, *extra_columns)
+
+    @staticmethod
+    def _apply_filters(query: Query | Select, filters: FilterParams) -> Query | Select:
+        """Apply FilterParams conditions (not pagination) to a fact query or select."""
+        query = query.filter(IndicatorFact.is_active == True)
+
+        if filters.pillar_id:
+            query = query.filter(IndicatorFact.pillar_id == filters.pillar_id)
+        if filters.dimension_id:
+            query = query.filter(IndicatorFact.dimension_id == filters.dimension_id)
+        if filters.indicator_id:
+            query = query.filter(IndicatorFact.indicator_id == filters.indicator_id)
+        if filters.country_code_list:
+            query = query.filter(IndicatorFact.country_code.in_(filters.country_code_list))
+        if filters.year_start:
+            query = query.filter(IndicatorFact.year >= filters.year_start)
+        if filters.year_end:
+            query = query.filter(IndicatorFact.year <= filters.year_end)
+
+        return query
+
+    def _apply_pagination(self, query: Query, filters: FilterParams) -> Query:
+        """Order by ID and page: keyset when a cursor was given, offset otherwise."""
+        query = query.order_by(IndicatorFact.id)
+        if filters.after_id is not None:
+            query = query.filter(IndicatorFact.id > filters.after_id)
+        else:
+            query = query.offset(filters.offset)
+        return query.limit(filters.limit)
+
+    def _count_query(self, filters: FilterParams) -> Query:
+        """Unpaginated query over the IDs matching filters."""
+        return self._apply_filters(self.db.query(IndicatorFact.id), filters)
+
+    @staticmethod
+    def _row_to_dict(row) -> dict:
+        """Convert a values query row into a result dictionary."""
+        return {
+            "id": row.id,
+            "country_code": row.country_code,
+            "country_name": row.country_name,
+            "latitude": row.latitude,
+            "longitude": row.longitude,
+            "indicator_name": row.indicator_name,
+            "unit": row.unit,
+            "dimension_name": row.dimension_name,
+            "pillar_name": row.pillar_name,
+            "year": row.year,
+            "value": row.value,
+            "confidence_score": row.confidence_score,
+        }
+
+    @classmethod
+    def export_statement(cls, filters: FilterParams) -> Select:
+        """
+        Select all values matching filters, ordered by ID.
+
+        Pagination fields of filters are ignored; used for streaming exports.
+        """
+        return cls._apply_filters(select(*VALUE_COLUMNS), filters).order_by(IndicatorFact.id)
+
     def get_filtered_indicator_values(self, filters: FilterParams) -> list[dict]:
         """
         Get indicator values with comprehensive filtering and full details.
 
         Returns a list of dictionaries with all relevant information.
         """
-        query = (
-            self.db.query(
-                IndicatorValue.id,
-                Country.code.label("country_code"),
-                Country.name.label("country_name"),
-                Country.latitude,
-                Country.longitude,
-                Indicator.name.label("indicator_name"),
-                Indicator.unit,
-                Dimension.name.label("dimension_name"),
-                Pillar.name.label("pillar_name"),
-                IndicatorValue.year,
-                IndicatorValue.value,
-                IndicatorValue.confidence_score,
-            )
-            .join(Country, IndicatorValue.country_id == Country.id)
-            .join(Indicator, IndicatorValue.indicator_id == Indicator.id)
-            .join(Dimension, Indicator.dimension_id == Dimension.id)
-            .join(Pillar, Dimension.pillar_id == Pillar.id)
-            .filter(Indicator.is_active == True)
-        )
+        cube = get_cube(self.db)
+        if cube is not None:
+            return cube.get_filtered_indicator_values(filters)
 
-        # Apply filters
-        if filters.pillar_id:
-            query = query.filter(Pillar.id == filters.pillar_id)
+        query = self._apply_filters(self._values_query(), filters)
+        query = self._apply_pagination(query, filters)
+        return [self._row_to_dict(row) for row in query.all()]
 
-        if filters.dimension_id:
-            query = query.filter(Dimension.id == filters.dimension_id)
+    def get_filtered_page(
+        self,
+        filters: FilterParams,
+        count: CountMode = "exact",
+    ) -> tuple[list[dict], int | None, bool]:
+        """
+        Get a page of filtered indicator values together with the total.
 
-        if filters.indicator_id:
-            query = query.filter(Indicator.id == filters.indicator_id)
+        With ``count="exact"`` the total is computed in the same query as the
+        page (a window count, or a scalar subquery in cursor mode).
+        ``"estimate"`` uses the query planner's row estimate and ``"none"``
+        skips counting.
 
-        if filters.country_code_list:
-            query = query.filter(Country.code.in_(filters.country_code_list))
+        Returns (rows, total, total_is_estimate).
+        """
+        cube = get_cube(self.db)
+        if cube is not None:
+            # Counting the cube is a mask reduction, so it's always exact
+            data = cube.get_filtered_indicator_values(filters)
+            total = cube.count_filtered_values(filters) if count != "none" else None
+            return data, total, False
 
-        if filters.year_start:
-            query = query.filter(IndicatorValue.year >= filters.year_start)
+        if count == "exact":
+            if filters.after_id is None:
+                total_column = func.count().over().label("total")
+            else:
+                total_column = (
+                    self._count_query(filters)
+                    .with_entities(func.count())
+                    .scalar_subquery()
+                    .label("total")
+                )
+            query = self._apply_filters(self._values_query(total_column), filters)
+            rows = self._apply_pagination(query, filters).all()
+        else:
+            query = self._apply_filters(self._values_query(), filters)
+            rows = self._apply_pagination(query, filters).all()
 
-        if filters.year_end:
-            query = query.filter(IndicatorValue.year <= filters.year_end)
+        data = [self._row_to_dict(row) for row in rows]
 
-        # Apply pagination
-        query = query.offset(filters.offset).limit(filters.limit)
+        # A short first page already tells us the exact total
+        if filters.after_id is None and len(rows) < filters.limit and (rows or filters.offset == 0):
+            return data, filters.offset + len(rows), False
 
-        # Execute and convert to dictionaries
-        results = query.all()
-        return [
-            {
-                "id": row.id,
-                "country_code": row.country_code,
-                "country_name": row.country_name,
-                "latitude": float(row.latitude) if row.latitude else None,
-                "longitude": float(row.longitude) if row.longitude else None,
-                "indicator_name": row.indicator_name,
-                "unit": row.unit,
-                "dimension_name": row.dimension_name,
-                "pillar_name": row.pillar_name,
-                "year": row.year,
-                "value": float(row.value) if row.value else None,
-                "confidence_score": float(row.confidence_score) if row.confidence_score else None,
-            }
-            for row in results
-        ]
+        if count == "exact":
+            total = rows[0].total if rows else self.count_filtered_values(filters)
+            return data, total, False
+        if count == "estimate":
+            return data, self.estimate_filtered_values(filters), True
+        return data, None, False
+
+    def estimate_filtered_values(self, filters: FilterParams) -> int:
+        """
+        Estimate the number of indicator values matching filters.
+
+        Uses the Postgres planner's row estimate, which costs a plan but no
+        scan. Falls back to an exact count on other databases.
+        """
+        if self.db.get_bind().dialect.name != "postgresql":
+            return self.count_filtered_values(filters)
+
+        plan = self.db.execute(Explain(self._count_query(filters).statement)).scalar()
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
 
     def get_map_data(self, indicator_id: int, year: int) -> list[dict]:
         """
@@ -88,23 +236,25 @@ class FilterService:
 
         Returns country data with coordinates and values.
         """
+        cube = get_cube(self.db)
+        if cube is not None:
+            return cube.get_map_data(indicator_id, year)
+
         results = (
             self.db.query(
-                Country.code,
-                Country.name,
-                Country.latitude,
-                Country.longitude,
-                IndicatorValue.value,
-                Indicator.unit,
+                IndicatorFact.country_code,
+                IndicatorFact.country_name,
+                IndicatorFact.latitude,
+                IndicatorFact.longitude,
+                IndicatorFact.value,
+                IndicatorFact.unit,
             )
-            .join(IndicatorValue, Country.id == IndicatorValue.country_id)
-            .join(Indicator, IndicatorValue.indicator_id == Indicator.id)
             .filter(
                 and_(
-                    IndicatorValue.indicator_id == indicator_id,
-                    IndicatorValue.year == year,
-                    Country.latitude.isnot(None),
-                    Country.longitude.isnot(None),
+                    IndicatorFact.indicator_id == indicator_id,
+                    IndicatorFact.year == year,
+                    IndicatorFact.latitude.isnot(None),
+                    IndicatorFact.longitude.isnot(None),
                 )
             )
             .all()
@@ -112,11 +262,11 @@ class FilterService:
 
         return [
             {
-                "country_code": row.code,
-                "country_name": row.name,
-                "latitude": float(row.latitude),
-                "longitude": float(row.longitude),
-                "value": float(row.value) if row.value else None,
+                "country_code": row.country_code,
+                "country_name": row.country_name,
+                "latitude": row.latitude,
+                "longitude": row.longitude,
+                "value": row.value,
                 "unit": row.unit,
             }
             for row in results
@@ -124,26 +274,59 @@ class FilterService:
 
     def count_filtered_values(self, filters: FilterParams) -> int:
         """Count total indicator values matching filters."""
-        query = (
-            self.db.query(IndicatorValue)
-            .join(Country, IndicatorValue.country_id == Country.id)
-            .join(Indicator, IndicatorValue.indicator_id == Indicator.id)
-            .join(Dimension, Indicator.dimension_id == Dimension.id)
-            .join(Pillar, Dimension.pillar_id == Pillar.id)
-            .filter(Indicator.is_active == True)
+        cube = get_cube(self.db)
+        if cube is not None:
+            return cube.count_filtered_values(filters)
+
+        return self._count_query(filters).count()
+
+
+class AsyncFilterService(AsyncServiceAdapter):
+    """Async filter service."""
+
+    service_class = FilterService
+
+    async def get_filtered_indicator_values(self, filters: FilterParams) -> list[dict]:
+        """Get indicator values with comprehensive filtering and full details."""
+        return await self._run(FilterService.get_filtered_indicator_values, filters)
+
+    async def get_filtered_page(
+        self,
+        filters: FilterParams,
+        count: CountMode = "exact",
+    ) -> tuple[list[dict], int | None, bool]:
+        """Get a page of filtered indicator values together with the total."""
+        return await self._run(FilterService.get_filtered_page, filters, count)
+
+    async def stream_filtered_values(
+        self,
+        filters: FilterParams,
+        batch_size: int = 5000,
+    ) -> AsyncIterator[list[dict]]:
+        """
+        Stream all values matching filters in batches of row dictionaries.
+
+        Rows come from the indicator cube when it is enabled, so exports match
+        ``/indicators/values``; otherwise from a server-side cursor, so memory
+        use is bounded by batch_size rather than the size of the result.
+        """
+        cube = await self.db.run_sync(get_cube)
+        if cube is not None:
+            for rows in cube.iter_filtered_rows(filters, batch_size):
+                yield rows
+            return
+
+        statement = FilterService.export_statement(filters).execution_options(
+            yield_per=batch_size,
         )
+        result = await self.db.stream(statement)
+        async for rows in result.partitions():
+            yield [FilterService._row_to_dict(row) for row in rows]
 
-        if filters.pillar_id:
-            query = query.filter(Pillar.id == filters.pillar_id)
-        if filters.dimension_id:
-            query = query.filter(Dimension.id == filters.dimension_id)
-        if filters.indicator_id:
-            query = query.filter(Indicator.id == filters.indicator_id)
-        if filters.country_code_list:
-            query = query.filter(Country.code.in_(filters.country_code_list))
-        if filters.year_start:
-            query = query.filter(IndicatorValue.year >= filters.year_start)
-        if filters.year_end:
-            query = query.filter(IndicatorValue.year <= filters.year_end)
+    async def get_map_data(self, indicator_id: int, year: int) -> list[dict]:
+        """Get map visualization data for a specific indicator and year."""
+        return await self._run(FilterService.get_map_data, indicator_id, year)
 
-        return query.count()
+    async def count_filtered_values(self, filters: FilterParams) -> int:
+        """Count total indicator values matching filters."""
+        return await self._run(FilterService.count_filtered_values, filters)
@@ -0,0 +1,409 @@
+"""In-memory indicator cube.
+
+The whole ``indicator_values`` fact table is held as dense NumPy arrays indexed
+by (country, indicator, year), together with the country and indicator
+attributes the read endpoints need. Map and filter queries are then answered by
+slicing and masking instead of a multi-table join on Postgres.
+"""
+
+import threading
+import time
+from collections.abc import Iterator
+from dataclasses import dataclass
+
+import numpy as np
+from sqlalchemy import String, func, literal, select, union_all
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core import data_version
+from app.core.logging import logger
+from app.models import Country, Pillar, Dimension, Indicator, IndicatorValue
+from app.schemas.filter import FilterParams
+
+
+@dataclass(eq=False)
+class IndicatorCube:
+    """Dense country x indicator x year snapshot of indicator values."""
+
+    version: int
+    fingerprint: tuple
+
+    # Country axis (sorted by id)
+    country_ids: np.ndarray
+    country_codes: np.ndarray
+    country_names: np.ndarray
+    latitudes: np.ndarray
+    longitudes: np.ndarray
+    regions: np.ndarray
+
+    # Indicator axis (sorted by id)
+    indicator_ids: np.ndarray
+    indicator_names: np.ndarray
+    units: np.ndarray
+    dimension_ids: np.ndarray
+    dimension_names: np.ndarray
+    pillar_ids: np.ndarray
+    pillar_names: np.ndarray
+    is_active: np.ndarray
+
+    # Year axis (sorted)
+    years: np.ndarray
+
+    # Facts, shape (countries, indicators, years)
+    values: np.ndarray
+    confidence: np.ndarray
+    row_ids: np.ndarray  # IndicatorValue.id, -1 where no row exists
+
+    @property
+    def size(self) -> int:
+        """Number of stored indicator value rows."""
+        return int(np.count_nonzero(self.row_ids >= 0))
+
+    def _position(self, axis: np.ndarray, key) -> int | None:
+        """Find the index of ``key`` on a sorted axis."""
+        pos = int(np.searchsorted(axis, key))
+        if pos < len(axis) and axis[pos] == key:
+            return pos
+        return None
+
+    def _country_mask(self, filters: FilterParams) -> np.ndarray:
+        if filters.country_code_list:
+            return np.isin(self.country_codes, filters.country_code_list)
+        return np.ones(len(self.country_ids), dtype=bool)
+
+    def _indicator_mask(self, filters: FilterParams) -> np.ndarray:
+        mask = self.is_active.copy()
+        if filters.pillar_id:
+            mask &= self.pillar_ids == filters.pillar_id
+        if filters.dimension_id:
+            mask &= self.dimension_ids == filters.dimension_id
+        if filters.indicator_id:
+            mask &= self.indicator_ids == filters.indicator_id
+        return mask
+
+    def _year_mask(self, filters: FilterParams) -> np.ndarray:
+        mask = np.ones(len(self.years), dtype=bool)
+        if filters.year_start:
+            mask &= self.years >= filters.year_start
+        if filters.year_end:
+            mask &= self.years <= filters.year_end
+        return mask
+
+    def _select(self, filters: FilterParams) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Select cells matching the filters.
+
+        Returns (row_ids, country_idx, indicator_idx, year_idx) ordered by row id.
+        """
+        ci = np.flatnonzero(self._country_mask(filters))
+        ii = np.flatnonzero(self._indicator_mask(filters))
+        yi = np.flatnonzero(self._year_mask(filters))
+
+        block = self.row_ids[np.ix_(ci, ii, yi)]
+        c, i, y = np.nonzero(block >= 0)
+        ids = block[c, i, y]
+
+        order = np.argsort(ids, kind="stable")
+        return ids[order], ci[c[order]], ii[i[order]], yi[y[order]]
+
+    def count_filtered_values(self, filters: FilterParams) -> int:
+        """Count indicator values matching filters."""
+        ci = np.flatnonzero(self._country_mask(filters))
+        ii = np.flatnonzero(self._indicator_mask(filters))
+        yi = np.flatnonzero(self._year_mask(filters))
+        return int(np.count_nonzero(self.row_ids[np.ix_(ci, ii, yi)] >= 0))
+
+    def get_filtered_indicator_values(self, filters: FilterParams) -> list[dict]:
+        """Get a page of indicator values matching filters, ordered by row id."""
+        ids, c, i, y = self._select(filters)
+        if filters.after_id is not None:
+            start = int(np.searchsorted(ids, filters.after_id, side="right"))
+        else:
+            start = filters.offset
+        page = slice(start, start + filters.limit)
+        return self._rows(ids[page], c[page], i[page], y[page])
+
+    def get_filtered_cells(
+        self,
+        filters: FilterParams,
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Get all cells matching filters, ignoring pagination.
+
+        Returns (row_ids, country_idx, indicator_idx, year_idx) ordered by row
+        id, for column-wise consumers such as the Arrow export.
+        """
+        return self._select(filters)
+
+    def iter_filtered_rows(self, filters: FilterParams, batch_size: int) -> Iterator[list[dict]]:
+        """Yield all rows matching filters in batches, ordered by row id, ignoring pagination."""
+        ids, c, i, y = self._select(filters)
+        for start in range(0, len(ids), batch_size):
+            batch = slice(start, start + batch_size)
+            yield self._rows(ids[batch], c[batch], i[batch], y[batch])
+
+    def get_map_data(self, indicator_id: int, year: int) -> list[dict]:
+        """Get map data for one indicator and year."""
+        i = self._position(self.indicator_ids, indicator_id)
+        y = self._position(self.years, year)
+        if i is None or y is None:
+            return []
+
+        mask = (
+            (self.row_ids[:, i, y] >= 0)
+            & ~np.isnan(self.latitudes)
+            & ~np.isnan(self.longitudes)
+        )
+        unit = self.units[i]
+        return [
+            {
+                "country_code": self.country_codes[c],
+                "country_name": self.country_names[c],
+                "latitude": float(self.latitudes[c]),
+                "longitude": float(self.longitudes[c]),
+                "value": _to_float(self.values[c, i, y]),
+                "unit": unit,
+            }
+            for c in np.flatnonzero(mask)
+        ]
+
+    def _rows(self, ids: np.ndarray, c: np.ndarray, i: np.ndarray, y: np.ndarray) -> list[dict]:
+        """Convert selected cells into filter result dictionaries."""
+        values = self.values[c, i, y]
+        confidence = self.confidence[c, i, y]
+        return [
+            {
+                "id": int(ids[n]),
+                "country_code": self.country_codes[c[n]],
+                "country_name": self.country_names[c[n]],
+                "latitude": _to_float(self.latitudes[c[n]]),
+                "longitude": _to_float(self.longitudes[c[n]]),
+                "indicator_name": self.indicator_names[i[n]],
+                "unit": self.units[i[n]],
+                "dimension_name": self.dimension_names[i[n]],
+                "pillar_name": self.pillar_names[i[n]],
+                "year": int(self.years[y[n]]),
+                "value": _to_float(values[n]),
+                "confidence_score": _to_float(confidence[n]),
+            }
+            for n in range(len(ids))
+        ]
+
+
+def _to_float(value) -> float | None:
+    """Convert a NumPy scalar to float, mapping NaN to None."""
+    value = float(value)
+    return None if np.isnan(value) else value
+
+
+def _float_array(values) -> np.ndarray:
+    """Convert nullable float column values into an array with NaN for NULL."""
+    return np.array(values, dtype=np.float64)
+
+
+def _fingerprint(db: Session) -> tuple:
+    """
+    Cheap summary of every table the cube reads, used to detect outside writes.
+
+    Row counts catch inserts and deletes, max(updated_at) catches updates;
+    one scan per table, all in one round trip.
+    """
+    summaries = union_all(*(
+        select(
+            literal(model.__tablename__, String).label("table_name"),
+            func.count(model.id),
+            func.max(model.id),
+            func.max(model.updated_at),
+        )
+        for model in (IndicatorValue, Indicator, Country, Dimension, Pillar)
+    ))
+    return tuple(sorted(tuple(row) for row in db.execute(summaries)))
+
+
+def load_cube(db: Session) -> IndicatorCube:
+    """Load all indicator values and their attributes into a new cube."""
+    version = data_version.current()
+    fingerprint = _fingerprint(db)
+
+    countries = db.execute(
+        select(
+            Country.id,
+            Country.code,
+            Country.name,
+            Country.latitude,
+            Country.longitude,
+            Country.region,
+        )
+        .order_by(Country.id)
+    ).all()
+    indicators = db.execute(
+        select(
+            Indicator.id,
+            Indicator.name,
+            Indicator.unit,
+            Indicator.is_active,
+            Dimension.id,
+            Dimension.name,
+            Pillar.id,
+            Pillar.name,
+        )
+        .join(Dimension, Indicator.dimension_id == Dimension.id)
+        .join(Pillar, Dimension.pillar_id == Pillar.id)
+        .order_by(Indicator.id)
+    ).all()
+    facts = db.execute(
+        select(
+            IndicatorValue.id,
+            IndicatorValue.country_id,
+            IndicatorValue.indicator_id,
+            IndicatorValue.year,
+            IndicatorValue.value,
+            IndicatorValue.confidence_score,
+        )
+    ).all()
+
+    country_cols = list(zip(*countries)) or [()] * 6
+    indicator_cols = list(zip(*indicators)) or [()] * 8
+    fact_cols = list(zip(*facts)) or [()] * 6
+
+    country_ids = np.array(country_cols[0], dtype=np.int64)
+    indicator_ids = np.array(indicator_cols[0], dtype=np.int64)
+    years = np.unique(np.array(fact_cols[3], dtype=np.int64))
+
+    shape = (len(country_ids), len(indicator_ids), len(years))
+    values = np.full(shape, np.nan, dtype=np.float64)
+    confidence = np.full(shape, np.nan, dtype=np.float64)
+    row_ids = np.full(shape, -1, dtype=np.int64)
+
+    if facts:
+        c = np.searchsorted(country_ids, np.array(fact_cols[1], dtype=np.int64))
+        i = np.searchsorted(indicator_ids, np.array(fact_cols[2], dtype=np.int64))
+        y = np.searchsorted(years, np.array(fact_cols[3], dtype=np.int64))
+        row_ids[c, i, y] = np.array(fact_cols[0], dtype=np.int64)
+        values[c, i, y] = _float_array(fact_cols[4])
+        confidence[c, i, y] = _float_array(fact_cols[5])
+
+    return IndicatorCube(
+        version=version,
+        fingerprint=fingerprint,
+        country_ids=country_ids,
+        country_codes=np.array(country_cols[1], dtype=object),
+        country_names=np.array(country_cols[2], dtype=object),
+        latitudes=_float_array(country_cols[3]),
+        longitudes=_float_array(country_cols[4]),
+        regions=np.array(country_cols[5], dtype=object),
+        indicator_ids=indicator_ids,
+        indicator_names=np.array(indicator_cols[1], dtype=object),
+        units=np.array(indicator_cols[2], dtype=object),
+        is_active=np.array([bool(a) for a in indicator_cols[3]], dtype=bool),
+        dimension_ids=np.array(indicator_cols[4], dtype=np.int64),
+        dimension_names=np.array(indicator_cols[5], dtype=object),
+        pillar_ids=np.array(indicator_cols[6], dtype=np.int64),
+        pillar_names=np.array(indicator_cols[7], dtype=object),
+        years=years,
+        values=values,
+        confidence=confidence,
+        row_ids=row_ids,
+    )
+
+
+class CubeManager:
+    """
+    Holds the current cube and rebuilds it when the dataset changes.
+
+    The lock only guards swapping state, never database I/O: under
+    ``AsyncSession.run_sync`` every query yields to the event loop, and a
+    second request blocking on a thread lock there would deadlock the worker.
+    While one request reloads, others keep serving the previous cube.
+    """
+
+    def __init__(self, refresh_seconds: int):
+        self.refresh_seconds = refresh_seconds
+        self._cube: IndicatorCube | None = None
+        self._fingerprint: tuple | None = None
+        self._checked_at = 0.0
+        self._loading = False
+        self._lock = threading.Lock()
+
+    def get(self, db: Session) -> IndicatorCube:
+        """Get the current cube, reloading it if the data has changed."""
+        cube = self._cube
+        if cube is not None and not self._is_stale(cube, db):
+            return cube
+
+        with self._lock:
+            owner = not self._loading
+            self._loading = True
+        if not owner and cube is not None:
+            return cube
+
+        try:
+            started = time.perf_counter()
+            cube = load_cube(db)
+            with self._lock:
+                self._cube = cube
+                self._fingerprint = cube.fingerprint
+                self._checked_at = time.monotonic()
+        finally:
+            if owner:
+                with self._lock:
+                    self._loading = False
+        logger.info(
+            "Indicator cube loaded",
+            rows=cube.size,
+            shape=cube.values.shape,
+            version=cube.version,
+            seconds=round(time.perf_counter() - started, 3),
+        )
+        return cube
+
+    def invalidate(self) -> None:
+        """Drop the current cube so the next request reloads it."""
+        self._cube = None
+
+    def check_outside_writes(self, db: Session) -> bool:
+        """
+        Bump the dataset version if the tables changed behind our back.
+
+        Writes from other processes (seed scripts, other workers without
+        Redis) do not bump our version, so at most every ``refresh_seconds``
+        compare a fingerprint of the tables with the last one seen. Bumping
+        also moves ETags and response cache keys, not only the cube.
+        Returns whether an outside write was found.
+        """
+        now = time.monotonic()
+        if now - self._checked_at < self.refresh_seconds:
+            return False
+        self._checked_at = now
+
+        fingerprint = _fingerprint(db)
+        with self._lock:
+            seen, self._fingerprint = self._fingerprint, fingerprint
+        if seen is None or seen == fingerprint:
+            return False
+        logger.info("Outside write detected", version=data_version.bump())
+        return True
+
+    def _is_stale(self, cube: IndicatorCube, db: Session) -> bool:
+        return cube.version != data_version.current() or self.check_outside_writes(db)
+
+
+cube_manager = CubeManager(refresh_seconds=settings.CUBE_REFRESH_SECONDS)
+
+
+def get_cube(db: Session) -> IndicatorCube | None:
+    """Get the indicator cube, or None when the cube is disabled."""
+    if not settings.CUBE_ENABLED:
+        return None
+    return cube_manager.get(db)
+
+
+def dataset_version(cube: IndicatorCube | None) -> str:
+    """
+    Version of the data behind cube, for keying derived caches.
+
+    The cube also reloads on outside writes that don't move the dataset
+    version, so its fingerprint is part of the key.
+    """
+    return f"{cube.version}:{hash(cube.fingerprint)}" if cube else str(data_version.current())
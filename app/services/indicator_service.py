@@ -1,27 +1,57 @@
 """Indicator service."""
 
 from sqlalchemy.orm import Session, joinedload
+from app.config import settings
 from app.models import Pillar, Dimension, Indicator, IndicatorValue
+from app.services.base import AsyncServiceAdapter
+from app.services.taxonomy_cache import (
+    Taxonomy,
+    PillarNode,
+    DimensionNode,
+    IndicatorNode,
+    taxonomy_cache,
+)
 
 
 class IndicatorService:
-    """Service for indicator operations."""
+    """
+    Service for indicator operations.
+
+    Pillar, dimension and indicator lookups are answered from the process-local
+    taxonomy cache (cached nodes instead of ORM objects) unless
+    TAXONOMY_CACHE_ENABLED is off.
+    """
 
     def __init__(self, db: Session):
         self.db = db
 
+    def _taxonomy(self) -> Taxonomy | None:
+        """Get the cached taxonomy, or None when the cache is disabled."""
+        if not settings.TAXONOMY_CACHE_ENABLED:
+            return None
+        return taxonomy_cache.get(self.db)
+
     # Pillar operations
-    def get_all_pillars(self) -> list[Pillar]:
+    def get_all_pillars(self) -> list[Pillar | PillarNode]:
         """Get all pillars."""
+        taxonomy = self._taxonomy()
+        if taxonomy is not None:
+            return list(taxonomy.pillars)
         return self.db.query(Pillar).order_by(Pillar.display_order, Pillar.name).all()
 
-    def get_pillar_by_id(self, pillar_id: int) -> Pillar | None:
+    def get_pillar_by_id(self, pillar_id: int) -> Pillar | PillarNode | None:
         """Get pillar by ID."""
+        taxonomy = self._taxonomy()
+        if taxonomy is not None:
+            return taxonomy.pillars_by_id.get(pillar_id)
         return self.db.query(Pillar).filter(Pillar.id == pillar_id).first()
 
     # Dimension operations
-    def get_dimensions_by_pillar(self, pillar_id: int) -> list[Dimension]:
+    def get_dimensions_by_pillar(self, pillar_id: int) -> list[Dimension | DimensionNode]:
         """Get dimensions for a specific pillar."""
+        taxonomy = self._taxonomy()
+        if taxonomy is not None:
+            return taxonomy.dimensions_for_pillar(pillar_id)
         return (
             self.db.query(Dimension)
             .filter(Dimension.pillar_id == pillar_id)
@@ -29,8 +59,11 @@ class IndicatorService:
             .all()
         )
 
-    def get_dimension_by_id(self, dimension_id: int) -> Dimension | None:
+    def get_dimension_by_id(self, dimension_id: int) -> Dimension | DimensionNode | None:
         """Get dimension by ID."""
+        taxonomy = self._taxonomy()
+        if taxonomy is not None:
+            return taxonomy.dimensions_by_id.get(dimension_id)
         return (
             self.db.query(Dimension)
             .options(joinedload(Dimension.pillar))
@@ -39,8 +72,11 @@ class IndicatorService:
         )
 
     # Indicator operations
-    def get_indicators_by_dimension(self, dimension_id: int) -> list[Indicator]:
+    def get_indicators_by_dimension(self, dimension_id: int) -> list[Indicator | IndicatorNode]:
         """Get indicators for a specific dimension."""
+        taxonomy = self._taxonomy()
+        if taxonomy is not None:
+            return taxonomy.active_indicators_for_dimension(dimension_id)
         return (
             self.db.query(Indicator)
             .filter(Indicator.dimension_id == dimension_id)
@@ -49,8 +85,11 @@ class IndicatorService:
             .all()
         )
 
-    def get_indicator_by_id(self, indicator_id: int) -> Indicator | None:
+    def get_indicator_by_id(self, indicator_id: int) -> Indicator | IndicatorNode | None:
         """Get indicator by ID with full relationships."""
+        taxonomy = self._taxonomy()
+        if taxonomy is not None:
+            return taxonomy.indicators_by_id.get(indicator_id)
         return (
             self.db.query(Indicator)
             .options(
@@ -60,8 +99,11 @@ class IndicatorService:
             .first()
         )
 
-    def get_all_active_indicators(self) -> list[Indicator]:
+    def get_all_active_indicators(self) -> list[Indicator | IndicatorNode]:
         """Get all active indicators."""
+        taxonomy = self._taxonomy()
+        if taxonomy is not None:
+            return list(taxonomy.active_indicators)
         return (
             self.db.query(Indicator)
             .filter(Indicator.is_active == True)
@@ -95,3 +137,43 @@ class IndicatorService:
             query = query.filter(IndicatorValue.year <= year_end)
 
         return query.offset(offset).limit(limit).all()
+
+
+class AsyncIndicatorService(AsyncServiceAdapter):
+    """Async indicator service."""
+
+    service_class = IndicatorService
+
+    async def get_all_pillars(self) -> list[Pillar | PillarNode]:
+        """Get all pillars."""
+        return await self._run(IndicatorService.get_all_pillars)
+
+    async def get_pillar_by_id(self, pillar_id: int) -> Pillar | PillarNode | None:
+        """Get pillar by ID."""
+        return await self._run(IndicatorService.get_pillar_by_id, pillar_id)
+
+    async def get_dimensions_by_pillar(self, pillar_id: int) -> list[Dimension | DimensionNode]:
+        """Get dimensions for a specific pillar."""
+        return await self._run(IndicatorService.get_dimensions_by_pillar, pillar_id)
+
+    async def get_dimension_by_id(self, dimension_id: int) -> Dimension | DimensionNode | None:
+        """Get dimension by ID."""
+        return await self._run(IndicatorService.get_dimension_by_id, dimension_id)
+
+    async def get_indicators_by_dimension(
+        self, dimension_id: int
+    ) -> list[Indicator | IndicatorNode]:
+        """Get indicators for a specific dimension."""
+        return await self._run(IndicatorService.get_indicators_by_dimension, dimension_id)
+
+    async def get_indicator_by_id(self, indicator_id: int) -> Indicator | IndicatorNode | None:
+        """Get indicator by ID with full relationships."""
+        return await self._run(IndicatorService.get_indicator_by_id, indicator_id)
+
+    async def get_all_active_indicators(self) -> list[Indicator | IndicatorNode]:
+        """Get all active indicators."""
+        return await self._run(IndicatorService.get_all_active_indicators)
+
+    async def get_indicator_values(self, **filters) -> list[IndicatorValue]:
+        """Get indicator values with filters."""
+        return await self._run(IndicatorService.get_indicator_values, **filters)
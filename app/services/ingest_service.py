@@ -0,0 +1,185 @@
+"""Bulk ingestion of indicator values.
+
+Input files (CSV or Parquet) are validated as whole columns in pandas, then
+loaded with Postgres COPY into a temporary staging table and merged into
+indicator_values with a single INSERT ... ON CONFLICT statement.
+"""
+
+import io
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
+
+from app.core import data_version
+from app.models import Country, Indicator
+from app.services.fact_service import refresh_indicator_facts
+
+# Columns of the staging table, in COPY order
+STAGING_COLUMNS = ["country_id", "indicator_id", "year", "value", "confidence_score", "notes"]
+
+MIN_YEAR = 1900
+MAX_YEAR = 2100
+# DECIMAL(15, 4) leaves 11 integer digits
+MAX_ABS_VALUE = 1e11
+
+
+def read_indicator_file(path: str | Path) -> pd.DataFrame:
+    """Read a CSV or Parquet file of indicator values."""
+    path = Path(path)
+    suffix = path.suffix.lower()
+    if suffix == ".parquet":
+        frame = pd.read_parquet(path)
+    elif suffix in (".csv", ".gz"):
+        frame = pd.read_csv(path)
+    else:
+        raise ValueError(f"Unsupported file type: {path.suffix}")
+
+    frame.columns = [str(column).strip().lower() for column in frame.columns]
+    return frame
+
+
+def validate_indicator_values(db: Session, frame: pd.DataFrame) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Validate and resolve a frame of indicator values.
+
+    Expects ``country_code``, ``year``, ``value`` and either ``indicator_id``
+    or ``indicator_name`` columns; ``confidence_score`` and ``notes`` are
+    optional. Country codes and indicators are resolved to IDs with one
+    lookup each. Duplicate (country, indicator, year) rows keep the last one.
+
+    Returns (valid, rejected): valid has the STAGING_COLUMNS, rejected is the
+    offending input rows with a ``reason`` column.
+    """
+    missing = {"country_code", "year", "value"} - set(frame.columns)
+    if "indicator_id" not in frame.columns and "indicator_name" not in frame.columns:
+        missing.add("indicator_id or indicator_name")
+    if missing:
+        raise ValueError(f"Missing required columns: {', '.join(sorted(missing))}")
+
+    countries = dict(db.execute(select(Country.code, Country.id)).all())
+    country_id = (
+        frame["country_code"].astype("string").str.strip().str.upper().map(countries)
+    )
+
+    if "indicator_id" in frame.columns:
+        indicator_ids = set(db.execute(select(Indicator.id)).scalars())
+        indicator_id = pd.to_numeric(frame["indicator_id"], errors="coerce")
+        indicator_id = indicator_id.where(indicator_id.isin(indicator_ids))
+    else:
+        # Names are only unique within a dimension; ambiguous names are rejected
+        rows = db.execute(select(Indicator.name, Indicator.id)).all()
+        names = pd.Series([row.id for row in rows], index=[row.name.lower() for row in rows])
+        names = names[~names.index.duplicated(keep=False)]
+        indicator_id = (
+            frame["indicator_name"].astype("string").str.strip().str.lower().map(names)
+        )
+
+    year = pd.to_numeric(frame["year"], errors="coerce")
+    value = pd.to_numeric(frame["value"], errors="coerce")
+    if "confidence_score" in frame.columns:
+        confidence = pd.to_numeric(frame["confidence_score"], errors="coerce")
+        bad_confidence = frame["confidence_score"].notna() & ~confidence.between(0, 1)
+    else:
+        confidence = pd.Series(np.nan, index=frame.index)
+        bad_confidence = pd.Series(False, index=frame.index)
+
+    conditions = [
+        country_id.isna(),
+        indicator_id.isna(),
+        year.isna() | (year % 1 != 0) | ~year.between(MIN_YEAR, MAX_YEAR),
+        value.isna() | (value.abs() >= MAX_ABS_VALUE),
+        bad_confidence,
+    ]
+    reasons = ["unknown country", "unknown indicator", "invalid year", "invalid value",
+               "invalid confidence_score"]
+    reason = pd.Series(np.select(conditions, reasons, default=""), index=frame.index)
+    ok = reason == ""
+
+    rejected = frame[~ok].assign(reason=reason[~ok])
+
+    valid = pd.DataFrame({
+        "country_id": country_id[ok].astype("int64"),
+        "indicator_id": indicator_id[ok].astype("int64"),
+        "year": year[ok].astype("int64"),
+        "value": value[ok].round(4),
+        "confidence_score": confidence[ok].round(2),
+        "notes": frame["notes"][ok].astype("string") if "notes" in frame.columns else pd.NA,
+    })
+    valid = valid.drop_duplicates(["country_id", "indicator_id", "year"], keep="last")
+
+    return valid[STAGING_COLUMNS], rejected
+
+
+def _merge_statement(update_columns: list[str] | None) -> str:
+    """INSERT ... ON CONFLICT from the staging table into indicator_values."""
+    columns = ", ".join(STAGING_COLUMNS)
+    statement = (
+        f"INSERT INTO indicator_values ({columns}) "
+        f"SELECT {columns} FROM indicator_values_staging "
+        "ON CONFLICT (country_id, indicator_id, year) DO "
+    )
+    if not update_columns:
+        return statement + "NOTHING"
+
+    assignments = ", ".join(f"{column} = EXCLUDED.{column}" for column in update_columns)
+    current = ", ".join(f"indicator_values.{column}" for column in update_columns)
+    incoming = ", ".join(f"EXCLUDED.{column}" for column in update_columns)
+    # Skip unchanged rows so updated_at (and the fact refresh watermark) stays put
+    return statement + (
+        f"UPDATE SET {assignments}, updated_at = now() "
+        f"WHERE ROW({current}) IS DISTINCT FROM ROW({incoming})"
+    )
+
+
+def load_indicator_values(
+    db: Session,
+    frame: pd.DataFrame,
+    update_columns: list[str] | None = None,
+) -> dict:
+    """
+    Load validated indicator values with COPY and merge them.
+
+    ``frame`` must have the STAGING_COLUMNS (see validate_indicator_values).
+    Existing rows get ``update_columns`` overwritten (default: value only);
+    pass an empty list to leave existing rows untouched. The fact table is
+    refreshed and the dataset version bumped afterwards.
+
+    Returns counts of staged and written rows.
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        raise RuntimeError("Bulk ingestion requires PostgreSQL (COPY)")
+
+    if update_columns is None:
+        update_columns = ["value"]
+
+    buffer = io.StringIO()
+    frame[STAGING_COLUMNS].to_csv(buffer, index=False, header=False, na_rep="")
+    buffer.seek(0)
+
+    db.execute(text(
+        "CREATE TEMP TABLE indicator_values_staging ("
+        "country_id integer NOT NULL, indicator_id integer NOT NULL, year integer NOT NULL, "
+        "value numeric(15, 4), confidence_score numeric(3, 2), notes text"
+        ") ON COMMIT DROP"
+    ))
+    # Same transaction as the session, so the staging table is visible below
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY indicator_values_staging ({', '.join(STAGING_COLUMNS)}) "
+            "FROM STDIN WITH (FORMAT csv)",
+            buffer,
+        )
+    finally:
+        cursor.close()
+
+    written = db.execute(text(_merge_statement(update_columns))).rowcount
+    db.commit()
+
+    refresh_indicator_facts(db)
+    data_version.bump()
+
+    return {"staged": len(frame), "written": written}
@@ -0,0 +1,321 @@
+"""Data context for insight prompts.
+
+Everything an insight needs comes from one slice of the in-memory indicator
+cube: the selected indicators for every country over the requested years.
+When the cube is disabled, it comes from one query on ``indicator_facts``.
+Summary statistics (latest value, trend, rank, regional and global means)
+are computed over the whole country x indicator x year block at once. The
+rendered context is trimmed to a token budget and memoized per request and
+data version; slices and their statistics are shared by every request with
+the same indicator and year filters.
+"""
+
+import warnings
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.cache import LRUCache
+from app.models import Country, IndicatorFact
+from app.schemas.insight import InsightGenerateRequest
+from app.services.indicator_cube import IndicatorCube, dataset_version, get_cube
+from app.services.llm import estimate_tokens
+
+_contexts = LRUCache(settings.INSIGHT_CONTEXT_CACHE_SIZE)
+_slices = LRUCache(settings.INSIGHT_SCOPE_CACHE_SIZE)
+_stats = LRUCache(settings.INSIGHT_SCOPE_CACHE_SIZE)
+
+
+@dataclass
+class ContextSlice:
+    """Values of the selected indicators for all countries, shape (countries, indicators, years)."""
+
+    country_codes: np.ndarray
+    country_names: np.ndarray
+    regions: np.ndarray
+    indicator_names: np.ndarray
+    units: np.ndarray
+    dimension_names: np.ndarray
+    pillar_names: np.ndarray
+    years: np.ndarray
+    values: np.ndarray
+
+
+@dataclass
+class ContextStats:
+    """Per (country, indicator) summaries of a slice; NaN or 0 where a country has no data."""
+
+    latest: np.ndarray
+    latest_year: np.ndarray
+    trend: np.ndarray  # least-squares slope per year
+    rank: np.ndarray  # 1 = highest latest value among reporting countries
+    reporting: np.ndarray  # per indicator: countries with data
+    regional_mean: np.ndarray
+    global_mean: np.ndarray  # per indicator
+
+
+def _slice_from_cube(cube: IndicatorCube, request: InsightGenerateRequest) -> ContextSlice:
+    indicators = cube.is_active.copy()
+    if request.pillar_id:
+        indicators &= cube.pillar_ids == request.pillar_id
+    if request.dimension_id:
+        indicators &= cube.dimension_ids == request.dimension_id
+    if request.indicator_ids:
+        indicators &= np.isin(cube.indicator_ids, request.indicator_ids)
+    years = np.ones(len(cube.years), dtype=bool)
+    if request.year_start:
+        years &= cube.years >= request.year_start
+    if request.year_end:
+        years &= cube.years <= request.year_end
+
+    ii = np.flatnonzero(indicators)
+    yi = np.flatnonzero(years)
+    return ContextSlice(
+        country_codes=cube.country_codes,
+        country_names=cube.country_names,
+        regions=cube.regions,
+        indicator_names=cube.indicator_names[ii],
+        units=cube.units[ii],
+        dimension_names=cube.dimension_names[ii],
+        pillar_names=cube.pillar_names[ii],
+        years=cube.years[yi],
+        values=cube.values[:, ii][:, :, yi],
+    )
+
+
+def _slice_from_facts(db: Session, request: InsightGenerateRequest) -> ContextSlice:
+    query = (
+        select(
+            IndicatorFact.country_code,
+            IndicatorFact.country_name,
+            Country.region,
+            IndicatorFact.indicator_id,
+            IndicatorFact.indicator_name,
+            IndicatorFact.unit,
+            IndicatorFact.dimension_name,
+            IndicatorFact.pillar_name,
+            IndicatorFact.year,
+            IndicatorFact.value,
+        )
+        .join(Country, Country.id == IndicatorFact.country_id)
+        .where(IndicatorFact.is_active.is_(True))
+    )
+    if request.pillar_id:
+        query = query.where(IndicatorFact.pillar_id == request.pillar_id)
+    if request.dimension_id:
+        query = query.where(IndicatorFact.dimension_id == request.dimension_id)
+    if request.indicator_ids:
+        query = query.where(IndicatorFact.indicator_id.in_(request.indicator_ids))
+    if request.year_start:
+        query = query.where(IndicatorFact.year >= request.year_start)
+    if request.year_end:
+        query = query.where(IndicatorFact.year <= request.year_end)
+
+    rows = pd.DataFrame(
+        db.execute(query).all(),
+        columns=[
+            "code", "name", "region", "indicator_id", "indicator", "unit",
+            "dimension", "pillar", "year", "value",
+        ],
+    )
+    c, countries = pd.factorize(rows["code"], sort=True)
+    i, indicator_ids = pd.factorize(rows["indicator_id"], sort=True)
+    y, years = pd.factorize(rows["year"], sort=True)
+    values = np.full((len(countries), len(indicator_ids), len(years)), np.nan)
+    values[c, i, y] = rows["value"].to_numpy(dtype=np.float64, na_value=np.nan)
+
+    first_country = rows.drop_duplicates("code").set_index("code").loc[countries]
+    regions = first_country["region"].astype(object)
+    first_indicator = (
+        rows.drop_duplicates("indicator_id").set_index("indicator_id").loc[indicator_ids]
+    )
+    return ContextSlice(
+        country_codes=np.asarray(countries, dtype=object),
+        country_names=first_country["name"].to_numpy(dtype=object),
+        regions=regions.where(regions.notna(), None).to_numpy(),
+        indicator_names=first_indicator["indicator"].to_numpy(dtype=object),
+        units=first_indicator["unit"].to_numpy(dtype=object),
+        dimension_names=first_indicator["dimension"].to_numpy(dtype=object),
+        pillar_names=first_indicator["pillar"].to_numpy(dtype=object),
+        years=np.asarray(years, dtype=np.int64),
+        values=values,
+    )
+
+
+def summarize(data: ContextSlice) -> ContextStats:
+    """Latest value, trend, rank and regional/global means for every country and indicator."""
+    values = data.values
+    has = ~np.isnan(values)
+    n = has.sum(axis=2)
+    reported = n > 0
+
+    # Latest non-missing year per (country, indicator)
+    last = values.shape[2] - 1 - np.argmax(has[:, :, ::-1], axis=2)
+    latest = np.where(reported, np.take_along_axis(values, last[..., None], axis=2)[..., 0], np.nan)
+    latest_year = np.where(reported, data.years[last], 0)
+
+    # Least-squares slope over the observed years only
+    x = np.broadcast_to(data.years.astype(np.float64), values.shape)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        x_mean = np.where(has, x, 0).sum(axis=2) / n
+        v_mean = np.where(has, values, 0).sum(axis=2) / n
+        dx = np.where(has, x - x_mean[..., None], 0)
+        dv = np.where(has, values - v_mean[..., None], 0)
+        trend = (dx * dv).sum(axis=2) / (dx * dx).sum(axis=2)
+    trend[n < 2] = np.nan
+
+    # Ordinal rank among reporting countries, highest first
+    rank = np.argsort(np.argsort(np.where(reported, -latest, np.inf), axis=0), axis=0) + 1
+    rank[~reported] = 0
+
+    # Regional means via a one-hot country -> region matrix
+    region_idx, region_names = pd.factorize(pd.Series(data.regions, dtype=object))
+    one_hot = (region_idx[:, None] == np.arange(len(region_names))).astype(np.float64)
+    sums = one_hot.T @ np.where(reported, latest, 0)
+    counts = one_hot.T @ reported.astype(np.float64)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        region_means = sums / counts
+    regional_mean = np.full(latest.shape, np.nan)
+    in_region = region_idx >= 0
+    regional_mean[in_region] = region_means[region_idx[in_region]]
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # indicators nobody reports
+        global_mean = np.nanmean(latest, axis=0)
+
+    return ContextStats(
+        latest=latest,
+        latest_year=latest_year,
+        trend=trend,
+        rank=rank,
+        reporting=reported.sum(axis=0),
+        regional_mean=regional_mean,
+        global_mean=global_mean,
+    )
+
+
+def _fmt(value: float) -> str:
+    return "n/a" if np.isnan(value) else f"{value:.3g}"
+
+
+def _fmt_trend(value: float) -> str:
+    return "n/a" if np.isnan(value) else f"{value:+.2g}/yr"
+
+
+def _indicator_label(data: ContextSlice, i: int) -> str:
+    unit = data.units[i]
+    return f"{data.indicator_names[i]} ({unit})" if unit else str(data.indicator_names[i])
+
+
+def _country_lines(data: ContextSlice, stats: ContextStats, c: int) -> tuple[str, list[str]]:
+    region = data.regions[c] or "unknown region"
+    header = (
+        f"{data.country_names[c]} ({data.country_codes[c]}), {region}, "
+        f"{data.years[0]}-{data.years[-1]}. Rank 1 = highest."
+    )
+    # Most distinctive indicators first: furthest from the global mean in spread units
+    with np.errstate(invalid="ignore", divide="ignore"), warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # indicators nobody reports
+        spread = np.nanstd(np.where(stats.rank > 0, stats.latest, np.nan), axis=0)
+        distance = np.abs(stats.latest[c] - stats.global_mean) / spread
+    order = np.argsort(np.where(np.isnan(distance), -np.inf, distance))[::-1]
+
+    lines = [
+        f"- {_indicator_label(data, i)}: {_fmt(stats.latest[c, i])} in {stats.latest_year[c, i]}, "
+        f"trend {_fmt_trend(stats.trend[c, i])}, rank {stats.rank[c, i]}/{stats.reporting[i]}, "
+        f"region mean {_fmt(stats.regional_mean[c, i])}, global mean {_fmt(stats.global_mean[i])}"
+        for i in order
+        if stats.rank[c, i] > 0
+    ]
+    return header, lines
+
+
+def _overview_lines(data: ContextSlice, stats: ContextStats) -> tuple[str, list[str]]:
+    header = f"All countries, {data.years[0]}-{data.years[-1]}."
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)
+        mean_trend = np.nanmean(stats.trend, axis=0)
+    top = np.argmax(stats.rank == 1, axis=0)
+    bottom = np.argmax(stats.rank == stats.reporting[None, :], axis=0)
+
+    lines = [
+        f"- {_indicator_label(data, i)}: mean {_fmt(stats.global_mean[i])} over "
+        f"{stats.reporting[i]} countries, trend {_fmt_trend(mean_trend[i])}, "
+        f"highest {data.country_codes[top[i]]} {_fmt(stats.latest[top[i], i])}, "
+        f"lowest {data.country_codes[bottom[i]]} {_fmt(stats.latest[bottom[i], i])}"
+        for i in np.argsort(-stats.reporting, kind="stable")
+        if stats.reporting[i] > 0
+    ]
+    return header, lines
+
+
+def render_context(
+    data: ContextSlice, stats: ContextStats | None, country_code: str | None, max_tokens: int
+) -> str:
+    """Compact text context, cut to about ``max_tokens`` tokens."""
+    if stats is None:
+        return "No data for the selected filters."
+
+    focus = None
+    if country_code:
+        matches = np.flatnonzero(data.country_codes == country_code.upper())
+        focus = int(matches[0]) if len(matches) else None
+
+    if focus is not None:
+        header, lines = _country_lines(data, stats, focus)
+    else:
+        header, lines = _overview_lines(data, stats)
+    if not lines:
+        return f"{header}\nNo data for the selected filters."
+
+    kept, budget = [header], max_tokens - estimate_tokens(header)
+    for n, line in enumerate(lines):
+        cost = estimate_tokens(line)
+        if cost > budget:
+            kept.append(f"({len(lines) - n} more indicators omitted)")
+            break
+        kept.append(line)
+        budget -= cost
+    return "\n".join(kept)
+
+
+def load_slice(db: Session, request: InsightGenerateRequest) -> tuple[str, ContextSlice]:
+    """
+    The slice for a request's indicator and year filters, with a key naming it.
+
+    The key changes with the data version, so callers can memoize whatever
+    they derive from the slice under it.
+    """
+    cube = get_cube(db)
+    scope = request.model_dump_json(include={
+        "pillar_id", "dimension_id", "indicator_ids", "year_start", "year_end"
+    })
+    key = f"{dataset_version(cube)}:{scope}"
+
+    data = _slices.get(key)
+    if data is None:
+        data = _slice_from_cube(cube, request) if cube else _slice_from_facts(db, request)
+        _slices.set(key, data)
+    return key, data
+
+
+def build_insight_context(db: Session, request: InsightGenerateRequest) -> str:
+    """Data context for an insight prompt, memoized per request and data version."""
+    key = f"{dataset_version(get_cube(db))}:{request.model_dump_json()}"
+
+    context = _contexts.get(key)
+    if context is None:
+        slice_key, data = load_slice(db, request)
+        stats = _stats.get(slice_key)
+        if stats is None and data.values.size:
+            stats = summarize(data)
+            _stats.set(slice_key, stats)
+        context = render_context(
+            data, stats, request.country_code, settings.INSIGHT_CONTEXT_MAX_TOKENS
+        )
+        _contexts.set(key, context)
+    return context
@@ -0,0 +1,136 @@
+"""Background insight generation jobs.
+
+``POST /insights/generate?async=true`` enqueues a job and returns at once. A
+pool of asyncio workers, started with the first job, runs generations through
+the same single-flight path as inline requests.
+
+A job's id is the insight cache key, so resubmitting the same filters joins
+the pending job. Any worker can answer a status poll: job state is mirrored
+to Redis, and a finished job is also recognised from the stored insight.
+"""
+
+import asyncio
+
+from app.config import settings
+from app.core.cache import LRUCache
+from app.core.logging import logger
+from app.core.redis import REDIS_ERRORS, get_async_redis, mark_redis_failure, redis_available
+from app.schemas.insight import Insight, InsightGenerateRequest, InsightJob
+from app.services.ai_service import (
+    find_stored_insight,
+    get_local_insight,
+    get_or_generate_shared,
+    insight_cache_key,
+)
+
+
+def _redis_key(job_id: str) -> str:
+    return f"bc:insight_job:{job_id}"
+
+
+class InsightJobQueue:
+    """In-process queue of insight generation jobs with a fixed worker pool."""
+
+    def __init__(self, workers: int, max_pending: int, ttl_seconds: int):
+        self.workers = workers
+        self.max_pending = max_pending
+        self.ttl_seconds = ttl_seconds
+        self._jobs = LRUCache(max_pending * 2, ttl_seconds=ttl_seconds)
+        self._queue: asyncio.Queue | None = None
+        self._tasks: list[asyncio.Task] = []
+
+    def _ensure_started(self) -> asyncio.Queue:
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_pending)
+            self._tasks = [
+                asyncio.create_task(self._work(), name=f"insight-job-worker-{n}")
+                for n in range(self.workers)
+            ]
+        return self._queue
+
+    async def submit(self, request: InsightGenerateRequest) -> InsightJob:
+        """
+        Enqueue generation of the insight for a request's filters.
+
+        Returns a finished job straight away when the insight is cached locally.
+        Raises ``asyncio.QueueFull`` when too many jobs are pending.
+        """
+        job_id = insight_cache_key(request)
+        cached = get_local_insight(job_id)
+        if cached is not None:
+            return InsightJob(job_id=job_id, status="done", insight=cached)
+
+        job = self._jobs.get(job_id)
+        if job is not None and job.status in ("pending", "running"):
+            return job
+
+        self._ensure_started().put_nowait((job_id, request))
+        job = InsightJob(job_id=job_id, status="pending")
+        await self._save(job)
+        return job
+
+    async def get(self, job_id: str) -> InsightJob | None:
+        """Current state of a job, from this worker, Redis or the stored insight."""
+        job = self._jobs.get(job_id)
+        if job is not None:
+            return job
+
+        if redis_available():
+            try:
+                raw = await get_async_redis().get(_redis_key(job_id))
+            except REDIS_ERRORS as e:
+                mark_redis_failure(e)
+                raw = None
+            if raw is not None:
+                return InsightJob.model_validate_json(raw)
+
+        insight = await find_stored_insight(job_id)
+        if insight is not None:
+            return InsightJob(job_id=job_id, status="done", insight=insight)
+        return None
+
+    async def _save(self, job: InsightJob) -> None:
+        self._jobs.set(job.job_id, job)
+        if redis_available():
+            try:
+                await get_async_redis().set(
+                    _redis_key(job.job_id), job.model_dump_json(), ex=self.ttl_seconds
+                )
+            except REDIS_ERRORS as e:
+                mark_redis_failure(e)
+
+    async def _work(self) -> None:
+        queue = self._queue
+        while True:
+            job_id, request = await queue.get()
+            try:
+                await self._save(InsightJob(job_id=job_id, status="running"))
+                insight: Insight = await get_or_generate_shared(request)
+                await self._save(InsightJob(job_id=job_id, status="done", insight=insight))
+            except Exception as e:
+                logger.exception(f"Insight job {job_id} failed")
+                await self._save(InsightJob(job_id=job_id, status="failed", error=str(e)))
+            finally:
+                queue.task_done()
+
+    async def stop(self) -> None:
+        """Cancel the workers; pending jobs are dropped."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+
+    def stats_dict(self) -> dict:
+        """Queue depth and worker count for this process."""
+        return {
+            "workers": len(self._tasks),
+            "pending": self._queue.qsize() if self._queue is not None else 0,
+        }
+
+
+insight_jobs = InsightJobQueue(
+    workers=settings.INSIGHT_JOB_WORKERS,
+    max_pending=settings.INSIGHT_JOB_MAX_PENDING,
+    ttl_seconds=settings.INSIGHT_JOB_TTL_SECONDS,
+)
@@ -0,0 +1,148 @@
+"""Bulk pre-generation of AI insights.
+
+Enumerates country x pillar (optionally x dimension) x insight type
+combinations, skips those that already have a live insight under their cache
+key, generates the rest concurrently with a bounded pool and upserts them
+into ``ai_insights`` in batches. With the rule-based model, generation runs
+in process off facts computed once per pillar or dimension.
+"""
+
+import asyncio
+from dataclasses import dataclass
+from datetime import datetime
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+
+from app.models import AIInsight, Country, Dimension, Pillar
+from app.schemas.insight import InsightGenerateRequest
+from app.services.ai_service import (
+    build_insight_messages,
+    generate_insight_completion,
+    insight_cache_key,
+    insight_values,
+)
+from app.services.insight_context import build_insight_context
+from app.services.insight_rules import rule_based_insight
+from app.services.llm import Completion, RuleBasedProvider
+
+DEFAULT_INSIGHT_TYPES = ("country", "trend", "comparative")
+
+# Cache keys per IN list when looking up live insights
+_KEY_CHUNK_SIZE = 1000
+
+
+@dataclass
+class PregenerationTarget:
+    """One insight to pre-generate."""
+
+    request: InsightGenerateRequest
+    cache_key: str
+    country_id: int
+
+
+@dataclass
+class GeneratedInsight:
+    """Outcome of generating one target: its completion, or the error."""
+
+    target: PregenerationTarget
+    completion: Completion | None = None
+    error: str | None = None
+
+
+def enumerate_targets(
+    db: Session,
+    insight_types: tuple[str, ...] = DEFAULT_INSIGHT_TYPES,
+    by_dimension: bool = False,
+) -> list[PregenerationTarget]:
+    """Every country x pillar (x dimension) x insight type combination."""
+    countries = db.execute(select(Country.id, Country.code).order_by(Country.code)).all()
+    if by_dimension:
+        scopes = db.execute(
+            select(Dimension.pillar_id, Dimension.id).order_by(Dimension.pillar_id, Dimension.id)
+        ).all()
+    else:
+        scopes = [(pillar_id, None) for pillar_id in db.scalars(select(Pillar.id).order_by(Pillar.id))]
+
+    targets = []
+    for country_id, country_code in countries:
+        for pillar_id, dimension_id in scopes:
+            for insight_type in insight_types:
+                request = InsightGenerateRequest(
+                    insight_type=insight_type,
+                    country_code=country_code,
+                    pillar_id=pillar_id,
+                    dimension_id=dimension_id,
+                )
+                targets.append(
+                    PregenerationTarget(request, insight_cache_key(request), country_id)
+                )
+    return targets
+
+
+def live_cache_keys(db: Session, cache_keys: list[str]) -> set[str]:
+    """The cache keys that already have an unexpired insight."""
+    now = datetime.utcnow()
+    live = set()
+    for start in range(0, len(cache_keys), _KEY_CHUNK_SIZE):
+        live.update(db.scalars(
+            select(AIInsight.cache_key).where(
+                AIInsight.cache_key.in_(cache_keys[start:start + _KEY_CHUNK_SIZE]),
+                AIInsight.expires_at > now,
+            )
+        ))
+    return live
+
+
+async def generate_all(
+    targets: list[PregenerationTarget], concurrency: int
+) -> list[GeneratedInsight]:
+    """Generate the text of every target with at most ``concurrency`` in flight."""
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def generate(target: PregenerationTarget) -> GeneratedInsight:
+        async with semaphore:
+            try:
+                completion = await generate_insight_completion(target.request)
+                return GeneratedInsight(target, completion=completion)
+            except Exception as e:
+                return GeneratedInsight(target, error=str(e))
+
+    return await asyncio.gather(*(generate(target) for target in targets))
+
+
+def generate_rule_based(db: Session, targets: list[PregenerationTarget]) -> list[GeneratedInsight]:
+    """Generate every target with the rule engine, without a model API."""
+    generated = []
+    for target in targets:
+        request = target.request
+        try:
+            messages = build_insight_messages(request, build_insight_context(db, request))
+            completion = RuleBasedProvider(rule_based_insight(db, request)).complete_sync(messages)
+            generated.append(GeneratedInsight(target, completion=completion))
+        except Exception as e:
+            generated.append(GeneratedInsight(target, error=str(e)))
+    return generated
+
+
+def upsert_insights(db: Session, generated: list[GeneratedInsight], batch_size: int = 500) -> int:
+    """
+    Insert generated insights in batches, replacing any rows with the same key.
+
+    Each batch deletes and inserts in one transaction: cache_key has no unique
+    index to upsert on, since ``ai_insights`` is partitioned by generated_at.
+    Returns the number of rows written.
+    """
+    rows = [
+        insight_values(item.target.request, item.completion, item.target.country_id)
+        for item in generated
+        if item.completion is not None
+    ]
+    for start in range(0, len(rows), batch_size):
+        batch = rows[start:start + batch_size]
+        cache_keys = [row["cache_key"] for row in batch]
+        db.execute(delete(AIInsight).where(AIInsight.cache_key.in_(cache_keys)))
+        db.execute(insert(AIInsight), batch)
+        db.commit()
+    return len(rows)
+
@@ -0,0 +1,254 @@
+"""Rule-based insight engine.
+
+Computes facts for every country at once from a request's data slice: rank
+and percentile on the average of its indicator percentiles, the change in
+that standing between its last two reported years, the share of indicators
+up on their previous reading, and its best and worst dimension. Insight text
+is filled into templates from those facts. Facts are memoized per slice, so
+after the first country every insight in a scope is a template fill and the
+whole corpus regenerates in seconds after a data load.
+"""
+
+import warnings
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core.cache import LRUCache
+from app.schemas.insight import InsightGenerateRequest
+from app.services.insight_context import ContextSlice, load_slice
+
+_facts = LRUCache(settings.INSIGHT_SCOPE_CACHE_SIZE)
+
+NO_DATA = "No indicator data is available for the selected filters yet."
+
+
+@dataclass
+class RuleFacts:
+    """Per-country facts for one slice; NaN, 0 or -1 where a country has no data."""
+
+    data: ContextSlice
+    score: np.ndarray  # mean latest percentile across indicators, 0-100
+    rank: np.ndarray  # 1 = highest score
+    ranked: int
+    indicators: np.ndarray  # indicators with data per country
+    score_change: np.ndarray  # percentile points between the last two reported years
+    change_from: np.ndarray
+    change_to: np.ndarray
+    improved: np.ndarray  # indicators above their previous reading
+    compared: np.ndarray  # indicators with a previous reading
+    dimension_names: np.ndarray
+    best_dimension: np.ndarray  # index into dimension_names
+    worst_dimension: np.ndarray
+    region_rank: np.ndarray
+    region_size: np.ndarray
+
+
+def _latest_index(has: np.ndarray) -> tuple[np.ndarray, np.ndarray]:
+    """Index of the last True along the last axis, and whether there is one."""
+    return has.shape[-1] - 1 - np.argmax(has[..., ::-1], axis=-1), has.any(axis=-1)
+
+
+def _take(values: np.ndarray, index: np.ndarray, present: np.ndarray) -> np.ndarray:
+    taken = np.take_along_axis(values, index[..., None], axis=-1)[..., 0]
+    return np.where(present, taken, np.nan)
+
+
+def _ordinal_rank(score: np.ndarray, axis: int = 0) -> np.ndarray:
+    """1 = highest along ``axis``; 0 where the score is NaN."""
+    order = np.argsort(np.where(np.isnan(score), np.inf, -score), axis=axis)
+    rank = np.argsort(order, axis=axis) + 1
+    return np.where(np.isnan(score), 0, rank)
+
+
+def compute_facts(data: ContextSlice) -> RuleFacts:
+    """Facts for every country in the slice in one pass over the array."""
+    values = data.values
+    has = ~np.isnan(values)
+
+    # Percentile of each value among the countries reporting it that year
+    n = has.sum(axis=0)
+    order = np.argsort(np.argsort(np.where(has, values, np.inf), axis=0), axis=0)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        pct = np.where(n > 1, 100.0 * order / (n - 1), 50.0)
+    pct[~has] = np.nan
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", RuntimeWarning)  # countries with no data
+
+        # Standing on each indicator's latest reading
+        last, reported = _latest_index(has)
+        latest_pct = _take(pct, last, reported)
+        score = np.nanmean(latest_pct, axis=1)
+
+        # Standing per year, compared between the last two years a country reports
+        year_score = np.nanmean(pct, axis=1)
+        scored = ~np.isnan(year_score)
+        to_year, any_year = _latest_index(scored)
+        earlier = scored & (np.arange(scored.shape[1]) < to_year[:, None])
+        from_year, two_years = _latest_index(earlier)
+        two_years &= any_year
+        score_change = (
+            _take(year_score, to_year, two_years) - _take(year_score, from_year, two_years)
+        )
+
+        # Each indicator's latest reading against its previous one
+        has_before = has & (np.arange(has.shape[2]) < last[..., None])
+        previous, has_previous = _latest_index(has_before)
+        has_previous &= reported
+        latest = _take(values, last, reported)
+        prior = _take(values, previous, has_previous)
+
+        # Mean latest percentile per dimension via an indicator -> dimension one-hot matrix
+        dim_idx, dimension_names = pd.factorize(pd.Series(data.dimension_names, dtype=object))
+        one_hot = (dim_idx[:, None] == np.arange(len(dimension_names))).astype(np.float64)
+        dim_counts = reported.astype(np.float64) @ one_hot
+        dim_score = (np.nan_to_num(latest_pct) @ one_hot) / dim_counts
+        dim_scored = ~np.isnan(dim_score)
+        best = np.argmax(np.where(dim_scored, dim_score, -np.inf), axis=1)
+        worst = np.argmin(np.where(dim_scored, dim_score, np.inf), axis=1)
+
+    rank = _ordinal_rank(score)
+    has_score = rank > 0
+    has_dims = dim_scored.any(axis=1)
+
+    # Rank among the country's region
+    region_idx, _ = pd.factorize(pd.Series(data.regions, dtype=object))
+    same_region = (region_idx[:, None] == region_idx[None, :]) & (region_idx[:, None] >= 0)
+    peers = same_region & has_score[None, :]
+    region_rank = np.where(
+        has_score & (region_idx >= 0),
+        1 + (peers & (np.nan_to_num(score, nan=-np.inf)[None, :] > score[:, None])).sum(axis=1),
+        0,
+    )
+
+    return RuleFacts(
+        data=data,
+        score=score,
+        rank=rank,
+        ranked=int(has_score.sum()),
+        indicators=reported.sum(axis=1),
+        score_change=score_change,
+        change_from=np.where(two_years, data.years[from_year], 0),
+        change_to=np.where(two_years, data.years[to_year], 0),
+        improved=(has_previous & (latest > prior)).sum(axis=1),
+        compared=has_previous.sum(axis=1),
+        dimension_names=np.asarray(dimension_names, dtype=object),
+        best_dimension=np.where(has_dims, best, -1),
+        worst_dimension=np.where(has_dims, worst, -1),
+        region_rank=region_rank,
+        region_size=np.where(region_idx >= 0, peers.sum(axis=1), 0),
+    )
+
+
+def _scope(data: ContextSlice, request: InsightGenerateRequest) -> str:
+    if request.dimension_id and len(data.dimension_names):
+        return f" in {data.dimension_names[0]}"
+    if request.pillar_id and len(data.pillar_names):
+        return f" in {data.pillar_names[0]}"
+    return " on brain capital indicators"
+
+
+def _names(facts: RuleFacts, countries: np.ndarray) -> str:
+    names = [str(facts.data.country_names[c]) for c in countries]
+    return names[0] if len(names) == 1 else f"{', '.join(names[:-1])} and {names[-1]}"
+
+
+def _change_sentence(facts: RuleFacts, c: int, subject: str) -> str | None:
+    change = facts.score_change[c]
+    if np.isnan(change):
+        return None
+    years = f"between {facts.change_from[c]} and {facts.change_to[c]}"
+    if abs(change) < 0.5:
+        sentence = f"{subject} average standing held steady {years}"
+    else:
+        direction = "rose" if change > 0 else "fell"
+        sentence = f"{subject} average standing {direction} {abs(change):.0f} points {years}"
+    if facts.compared[c]:
+        sentence += (
+            f", with {facts.improved[c]} of {facts.compared[c]} indicators "
+            f"up on their previous reading"
+        )
+    return sentence + "."
+
+
+def _country_insight(facts: RuleFacts, c: int, request: InsightGenerateRequest) -> str:
+    data = facts.data
+    name = data.country_names[c]
+    standing = (
+        f"{name} ranks {facts.rank[c]} of {facts.ranked} countries{_scope(data, request)}, "
+        f"with an average percentile of {facts.score[c]:.0f} across "
+        f"{facts.indicators[c]} indicators."
+    )
+    sentences = []
+
+    best, worst = facts.best_dimension[c], facts.worst_dimension[c]
+    if best >= 0 and best != worst:
+        sentences.append(
+            f"Its strongest dimension is {facts.dimension_names[best]} "
+            f"and its weakest is {facts.dimension_names[worst]}."
+        )
+    if request.insight_type == "comparative" and facts.region_size[c] > 1:
+        sentences.insert(0, (
+            f"Within {data.regions[c]} it ranks {facts.region_rank[c]} "
+            f"of {facts.region_size[c]} countries."
+        ))
+
+    if request.insight_type == "trend":
+        change = _change_sentence(facts, c, f"{name}'s")
+        return " ".join([change or f"{name} has only one year of data for a trend.", standing])
+    change = _change_sentence(facts, c, "Its")
+    return " ".join([standing, *sentences, *([change] if change else [])])
+
+
+def _overview_insight(facts: RuleFacts, request: InsightGenerateRequest) -> str:
+    ranked = np.argsort(np.where(facts.rank > 0, facts.rank, np.iinfo(np.int64).max))[:facts.ranked]
+    shown = min(3, facts.ranked // 2) or 1
+    scope = _scope(facts.data, request)
+
+    if request.insight_type == "trend":
+        changed = ~np.isnan(facts.score_change)
+        if changed.any():
+            change = np.where(changed, facts.score_change, np.nan)
+            up = int((change > 0).sum())
+            gainer, loser = int(np.nanargmax(change)), int(np.nanargmin(change))
+            return (
+                f"{up} of {int(changed.sum())} countries improved their average "
+                f"standing{scope} since their previous reported year. "
+                f"{facts.data.country_names[gainer]} gained the most "
+                f"({change[gainer]:+.0f} points) and {facts.data.country_names[loser]} "
+                f"lost the most ({change[loser]:+.0f} points)."
+            )
+
+    text = f"Across {facts.ranked} countries{scope}, {_names(facts, ranked[:shown])} rank highest"
+    if facts.ranked > shown:
+        text += f" and {_names(facts, ranked[-shown:][::-1])} lowest"
+    return text + "."
+
+
+def render_insight(facts: RuleFacts, request: InsightGenerateRequest) -> str:
+    """Fill the insight template for a request from its slice's facts."""
+    if not facts.ranked:
+        return NO_DATA
+    if request.country_code:
+        code = request.country_code.upper()
+        matches = np.flatnonzero(facts.data.country_codes == code)
+        if not len(matches) or not facts.rank[matches[0]]:
+            return f"No indicator data is available for {code} under the selected filters yet."
+        return _country_insight(facts, int(matches[0]), request)
+    return _overview_insight(facts, request)
+
+
+def rule_based_insight(db: Session, request: InsightGenerateRequest) -> str:
+    """Insight text from the rule engine for a request's filters."""
+    key, data = load_slice(db, request)
+    facts = _facts.get(key)
+    if facts is None:
+        if not data.values.size:
+            return NO_DATA
+        facts = compute_facts(data)
+        _facts.set(key, facts)
+    return render_insight(facts, request)
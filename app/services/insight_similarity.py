@@ -0,0 +1,248 @@
+"""Near-duplicate lookup for insight requests.
+
+Many requests differ from an already stored insight only trivially, e.g. by
+an overlapping year range or one indicator more. Those miss the exact cache
+key but can share its insight. Candidates must match on insight type,
+country, pillar and dimension; each is then scored as
+
+    year overlap x ((1 - w) x indicator overlap + w x indicator text similarity)
+
+Overlaps are Jaccard indices. Text similarity is the cosine between hashed
+character-trigram embeddings of the selected indicators' names, computed on
+the CPU with NumPy, so differently numbered but equivalent indicators still
+match. The best candidate at or above ``INSIGHT_SIMILARITY_THRESHOLD`` is
+reused.
+
+The index is per worker: loaded from the live rows of ``ai_insights``,
+extended as insights are stored, and reloaded periodically to pick up rows
+written by other workers or the pre-generation script.
+"""
+
+import asyncio
+import threading
+import time
+import zlib
+from dataclasses import dataclass, field
+from datetime import datetime
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models import AIInsight
+from app.services.taxonomy_cache import Taxonomy, taxonomy_cache
+
+EMBEDDING_DIM = 256
+
+# Open-ended year ranges span the bounds InsightGenerateRequest accepts
+YEAR_MIN, YEAR_MAX = 1900, 2100
+
+
+def embed_text(text: str) -> np.ndarray:
+    """Unit-length hashed bag of character trigrams."""
+    vector = np.zeros(EMBEDDING_DIM, dtype=np.float32)
+    for word in text.lower().split():
+        padded = f" {word} "
+        for i in range(len(padded) - 2):
+            vector[zlib.crc32(padded[i:i + 3].encode()) % EMBEDDING_DIM] += 1.0
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def _bucket_key(params: dict) -> tuple:
+    return (
+        params.get("insight_type"),
+        params.get("country_code"),
+        params.get("pillar_id"),
+        params.get("dimension_id"),
+    )
+
+
+@dataclass
+class _Bucket:
+    """Stored insights sharing type, country, pillar and dimension."""
+
+    cache_keys: list[str] = field(default_factory=list)
+    indicator_sets: list[frozenset | None] = field(default_factory=list)
+    years: np.ndarray = field(default_factory=lambda: np.empty((0, 2), dtype=np.int64))
+    vectors: np.ndarray = field(
+        default_factory=lambda: np.empty((0, EMBEDDING_DIM), dtype=np.float32)
+    )
+
+
+@dataclass
+class SimilarityStats:
+    """Counters for near-duplicate lookups."""
+
+    hits: int = 0
+    misses: int = 0
+
+    def as_dict(self) -> dict:
+        return {"hits": self.hits, "misses": self.misses}
+
+
+class InsightSimilarityIndex:
+    """
+    Nearest-neighbour index of stored insights by their filters.
+
+    Reloads read the rows through the session and embed them in a worker
+    thread, so a large index doesn't stall the event loop while it's rebuilt;
+    requests meanwhile keep using the previous buckets. The lock only guards
+    the buckets: under ``AsyncSession.run_sync`` a query yields to the event
+    loop, and a request blocking on a thread lock meanwhile would deadlock it.
+    """
+
+    def __init__(self, threshold: float, text_weight: float, reload_seconds: float):
+        self.threshold = threshold
+        self.text_weight = text_weight
+        self.reload_seconds = reload_seconds
+        self.stats = SimilarityStats()
+        self._buckets: dict[tuple, _Bucket] = {}
+        self._loaded_at: float | None = None
+        self._loading = False
+        self._lock = threading.Lock()
+
+    def _years(self, params: dict) -> tuple[int, int]:
+        return params.get("year_start") or YEAR_MIN, params.get("year_end") or YEAR_MAX
+
+    def _embed_indicators(self, taxonomy: Taxonomy, indicator_ids: frozenset | None) -> np.ndarray:
+        if indicator_ids is None:
+            return embed_text("all indicators")
+        indicators = taxonomy.indicators_by_id
+        return embed_text(" ".join(
+            indicators[i].name if i in indicators else f"indicator{i}"
+            for i in sorted(indicator_ids)
+        ))
+
+    def _entry(self, taxonomy: Taxonomy, params: dict) -> tuple[frozenset | None, np.ndarray]:
+        ids = params.get("indicator_ids")
+        indicator_set = frozenset(ids) if ids else None
+        return indicator_set, self._embed_indicators(taxonomy, indicator_set)
+
+    def _add(
+        self,
+        buckets: dict[tuple, _Bucket],
+        cache_key: str,
+        params: dict,
+        entry: tuple[frozenset | None, np.ndarray],
+    ) -> None:
+        bucket = buckets.setdefault(_bucket_key(params), _Bucket())
+        if cache_key in bucket.cache_keys:
+            return
+        indicator_set, vector = entry
+        bucket.cache_keys.append(cache_key)
+        bucket.indicator_sets.append(indicator_set)
+        bucket.years = np.vstack([bucket.years, self._years(params)])
+        bucket.vectors = np.vstack([bucket.vectors, vector])
+
+    def _fetch(self, db: Session) -> tuple[list, Taxonomy]:
+        """Live stored insights' filters, and the taxonomy to embed them with."""
+        rows = db.execute(
+            select(AIInsight.cache_key, AIInsight.filter_params).where(
+                AIInsight.cache_key.is_not(None),
+                AIInsight.filter_params.is_not(None),
+                AIInsight.expires_at > datetime.utcnow(),
+            )
+        ).all()
+        return rows, taxonomy_cache.get(db)
+
+    def _build(self, rows: list, taxonomy: Taxonomy) -> dict[tuple, _Bucket]:
+        buckets: dict[tuple, _Bucket] = {}
+        for cache_key, params in rows:
+            self._add(buckets, cache_key, params, self._entry(taxonomy, params))
+        return buckets
+
+    async def refresh(self, db: AsyncSession) -> None:
+        """Reload the index if it is missing or older than ``reload_seconds``."""
+        with self._lock:
+            fresh = (
+                self._loaded_at is not None
+                and time.monotonic() - self._loaded_at <= self.reload_seconds
+            )
+            if fresh or self._loading:
+                return
+            self._loading = True
+        try:
+            rows, taxonomy = await db.run_sync(self._fetch)
+            buckets = await asyncio.to_thread(self._build, rows, taxonomy)
+            with self._lock:
+                self._buckets = buckets
+                self._loaded_at = time.monotonic()
+        finally:
+            with self._lock:
+                self._loading = False
+
+    def add(self, db: Session, cache_key: str, params: dict) -> None:
+        """Index a newly stored insight."""
+        if self._loaded_at is None:
+            return
+        entry = self._entry(taxonomy_cache.get(db), params)
+        with self._lock:
+            self._add(self._buckets, cache_key, params, entry)
+
+    def discard(self, cache_key: str) -> None:
+        """Drop an insight that turned out to be expired or replaced."""
+        with self._lock:
+            for bucket in self._buckets.values():
+                if cache_key in bucket.cache_keys:
+                    n = bucket.cache_keys.index(cache_key)
+                    del bucket.cache_keys[n], bucket.indicator_sets[n]
+                    bucket.years = np.delete(bucket.years, n, axis=0)
+                    bucket.vectors = np.delete(bucket.vectors, n, axis=0)
+                    return
+
+    def find(self, db: Session, params: dict) -> tuple[str, float] | None:
+        """
+        Cache key and score of the most similar stored insight above the threshold.
+
+        Await ``refresh`` first; until the index has loaded, nothing is found.
+        """
+        wanted, query = self._entry(taxonomy_cache.get(db), params)
+
+        with self._lock:
+            bucket = self._buckets.get(_bucket_key(params))
+            if bucket is None or not bucket.cache_keys:
+                self.stats.misses += 1
+                return None
+
+            start, end = self._years(params)
+            overlap = np.clip(
+                np.minimum(bucket.years[:, 1], end) - np.maximum(bucket.years[:, 0], start) + 1,
+                0,
+                None,
+            )
+            union = (bucket.years[:, 1] - bucket.years[:, 0] + 1) + (end - start + 1) - overlap
+            year_score = overlap / union
+
+            jaccard = np.array([
+                float(have == wanted) if have is None or wanted is None
+                else len(have & wanted) / len(have | wanted)
+                for have in bucket.indicator_sets
+            ])
+            cosine = bucket.vectors @ query
+            scores = year_score * (
+                (1 - self.text_weight) * jaccard + self.text_weight * cosine
+            )
+
+            best = int(np.argmax(scores))
+            if scores[best] < self.threshold:
+                self.stats.misses += 1
+                return None
+            self.stats.hits += 1
+            return bucket.cache_keys[best], float(scores[best])
+
+    def stats_dict(self) -> dict:
+        """Hit/miss counters and index size for this process."""
+        return {
+            **self.stats.as_dict(),
+            "entries": sum(len(bucket.cache_keys) for bucket in self._buckets.values()),
+        }
+
+
+similarity_index = InsightSimilarityIndex(
+    threshold=settings.INSIGHT_SIMILARITY_THRESHOLD,
+    text_weight=settings.INSIGHT_SIMILARITY_TEXT_WEIGHT,
+    reload_seconds=settings.INSIGHT_SIMILARITY_RELOAD_SECONDS,
+)
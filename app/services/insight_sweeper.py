@@ -0,0 +1,275 @@
+"""Removal of expired AI insights.
+
+Insights stay in ``ai_insights`` after they expire, so an expired key can be
+regenerated in place and late feedback still lands. The sweeper deletes rows
+that expired more than ``INSIGHT_RETENTION_HOURS`` ago, in batches.
+
+On Postgres the table is range-partitioned by month on ``generated_at``
+(migration 005). There the sweeper also creates the partitions for the
+coming months, and drops whole partitions once every row in them is past
+retention, which is far cheaper than deleting their rows one by one. Only
+one worker sweeps at a time, under an advisory lock.
+
+cache_key is only unique together with generated_at (migration 006), so
+the database does not stop two workers that both generate a key (e.g.
+while Redis, and with it single-flight, is down) from storing two rows.
+Single-flight is the guard against that; readers take the newest row and
+the sweeper deletes the others.
+
+Runs every ``INSIGHT_SWEEP_INTERVAL_SECONDS`` from the app lifespan, or once
+with ``scripts/sweep_insights.py``.
+"""
+
+import asyncio
+import re
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+
+from sqlalchemy import and_, delete, exists, or_, select, text
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, aliased
+
+from app.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.logging import logger
+from app.models import AIInsight
+
+PARTITION_PREFIX = "ai_insights_p"
+DEFAULT_PARTITION = "ai_insights_default"
+_PARTITION_NAME = re.compile(rf"^{PARTITION_PREFIX}(\d{{4}})(\d{{2}})$")
+
+# pg_try_advisory_lock key, so only one worker sweeps at a time
+_SWEEP_LOCK_ID = 0x62635F6169  # "bc_ai"
+
+
+@dataclass
+class SweepResult:
+    """What one sweep removed and created."""
+
+    deleted_rows: int = 0
+    deleted_duplicates: int = 0
+    dropped_partitions: list[str] = field(default_factory=list)
+    created_partitions: list[str] = field(default_factory=list)
+    skipped: bool = False  # another worker held the sweep lock
+
+
+def _add_months(month: date, months: int) -> date:
+    index = month.year * 12 + month.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def partition_name(month: date) -> str:
+    """Name of the partition holding insights generated in a month."""
+    return f"{PARTITION_PREFIX}{month:%Y%m}"
+
+
+def is_partitioned(db: Session) -> bool:
+    """Whether ``ai_insights`` is a partitioned table (Postgres after migration 005)."""
+    if db.get_bind().dialect.name != "postgresql":
+        return False
+    return bool(db.execute(text(
+        "SELECT EXISTS (SELECT 1 FROM pg_partitioned_table "
+        "WHERE partrelid = to_regclass('ai_insights'))"
+    )).scalar())
+
+
+def _partitions(db: Session) -> dict[str, date]:
+    """Monthly partitions of ``ai_insights`` by name, with the month they hold."""
+    names = db.scalars(text(
+        "SELECT c.relname FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid "
+        "WHERE i.inhparent = to_regclass('ai_insights')"
+    ))
+    partitions = {}
+    for name in names:
+        match = _PARTITION_NAME.match(name)
+        if match:
+            partitions[name] = date(int(match[1]), int(match[2]), 1)
+    return partitions
+
+
+def _create_partition(db: Session, month: date) -> None:
+    """
+    Create the partition for a month, moving its rows out of the default one.
+
+    Rows land in the default partition when a month starts before its
+    partition exists (e.g. the app was down). Postgres then refuses to
+    create a partition for that range, so the default partition is detached
+    while its rows for the month are moved over, in one transaction.
+    """
+    name = partition_name(month)
+    bounds = {"start": month, "end": _add_months(month, 1)}
+    create = text(
+        f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF ai_insights '
+        f"FOR VALUES FROM ('{bounds['start']}') TO ('{bounds['end']}')"
+    )
+    in_month = "generated_at >= :start AND generated_at < :end"
+    stranded = db.execute(text(
+        f'SELECT EXISTS (SELECT 1 FROM "{DEFAULT_PARTITION}" WHERE {in_month})'
+    ), bounds).scalar()
+    if not stranded:
+        db.execute(create)
+        return
+
+    db.execute(text(f'ALTER TABLE ai_insights DETACH PARTITION "{DEFAULT_PARTITION}"'))
+    db.execute(create)
+    db.execute(text(
+        f'INSERT INTO "{name}" SELECT * FROM "{DEFAULT_PARTITION}" WHERE {in_month}'
+    ), bounds)
+    db.execute(text(f'DELETE FROM "{DEFAULT_PARTITION}" WHERE {in_month}'), bounds)
+    db.execute(text(f'ALTER TABLE ai_insights ATTACH PARTITION "{DEFAULT_PARTITION}" DEFAULT'))
+
+
+def create_partitions(db: Session, months_ahead: int) -> list[str]:
+    """
+    Create the monthly partitions from this month to ``months_ahead`` months on.
+
+    A month that fails is logged and skipped, so it can't hold up the others
+    or the rest of the sweep.
+    """
+    existing = _partitions(db)
+    this_month = datetime.utcnow().date().replace(day=1)
+    created = []
+    for n in range(months_ahead + 1):
+        month = _add_months(this_month, n)
+        name = partition_name(month)
+        if name in existing:
+            continue
+        try:
+            _create_partition(db, month)
+            db.commit()
+        except SQLAlchemyError:
+            db.rollback()
+            logger.exception("Could not create insight partition", partition=name)
+            continue
+        created.append(name)
+    return created
+
+
+def drop_expired_partitions(db: Session, cutoff: datetime) -> list[str]:
+    """Drop past months' partitions whose rows all expired before ``cutoff``."""
+    this_month = datetime.utcnow().date().replace(day=1)
+    dropped = []
+    for name, month in sorted(_partitions(db).items(), key=lambda item: item[1]):
+        if month >= this_month:
+            continue
+        # NULL expires_at never expires; an empty partition is dropped too
+        live = db.execute(text(
+            f'SELECT EXISTS (SELECT 1 FROM "{name}" '
+            f"WHERE expires_at IS NULL OR expires_at >= :cutoff)"
+        ), {"cutoff": cutoff}).scalar()
+        if live:
+            continue
+        db.execute(text(f'DROP TABLE "{name}"'))
+        db.commit()
+        dropped.append(name)
+    return dropped
+
+
+def delete_expired(db: Session, cutoff: datetime, batch_size: int) -> int:
+    """Delete rows that expired before ``cutoff``, ``batch_size`` rows per transaction."""
+    deleted = 0
+    while True:
+        ids = select(AIInsight.id).where(AIInsight.expires_at < cutoff).limit(batch_size)
+        count = db.execute(delete(AIInsight).where(AIInsight.id.in_(ids))).rowcount
+        db.commit()
+        deleted += count
+        if count < batch_size:
+            return deleted
+
+
+def delete_duplicates(db: Session) -> int:
+    """Delete rows superseded by a newer row with the same cache key."""
+    newer = aliased(AIInsight)
+    count = db.execute(
+        delete(AIInsight).where(
+            exists().where(
+                newer.cache_key == AIInsight.cache_key,
+                or_(
+                    newer.generated_at > AIInsight.generated_at,
+                    and_(newer.generated_at == AIInsight.generated_at, newer.id > AIInsight.id),
+                ),
+            )
+        )
+    ).rowcount
+    db.commit()
+    return count
+
+
+def sweep_insights(
+    db: Session,
+    retention_hours: float = settings.INSIGHT_RETENTION_HOURS,
+    batch_size: int = settings.INSIGHT_SWEEP_BATCH_SIZE,
+    months_ahead: int = settings.INSIGHT_PARTITION_MONTHS_AHEAD,
+) -> SweepResult:
+    """Drop or delete insights expired more than ``retention_hours`` ago."""
+    cutoff = datetime.utcnow() - timedelta(hours=retention_hours)
+    if not is_partitioned(db):
+        return SweepResult(
+            deleted_rows=delete_expired(db, cutoff, batch_size),
+            deleted_duplicates=delete_duplicates(db),
+        )
+
+    # The steps commit as they go, which hands the session's connection back
+    # to the pool, so hold the (session-level) lock on a connection of its own
+    with db.get_bind().connect() as lock_conn:
+        acquired = lock_conn.execute(
+            text("SELECT pg_try_advisory_lock(:id)"), {"id": _SWEEP_LOCK_ID}
+        ).scalar()
+        lock_conn.commit()
+        if not acquired:
+            return SweepResult(skipped=True)
+        try:
+            result = SweepResult(created_partitions=create_partitions(db, months_ahead))
+            result.dropped_partitions = drop_expired_partitions(db, cutoff)
+            result.deleted_rows = delete_expired(db, cutoff, batch_size)
+            result.deleted_duplicates = delete_duplicates(db)
+            return result
+        finally:
+            db.rollback()
+            lock_conn.execute(text("SELECT pg_advisory_unlock(:id)"), {"id": _SWEEP_LOCK_ID})
+            lock_conn.commit()
+
+
+class InsightSweeper:
+    """Background task sweeping expired insights on an interval."""
+
+    def __init__(self, interval_seconds: float):
+        self.interval_seconds = interval_seconds
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        """Start sweeping (first run right away)."""
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="insight-sweeper")
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                async with AsyncSessionLocal() as db:
+                    result = await db.run_sync(sweep_insights)
+                if (
+                    result.deleted_rows
+                    or result.deleted_duplicates
+                    or result.dropped_partitions
+                    or result.created_partitions
+                ):
+                    logger.info(
+                        "Swept expired insights",
+                        deleted_rows=result.deleted_rows,
+                        deleted_duplicates=result.deleted_duplicates,
+                        dropped_partitions=result.dropped_partitions,
+                        created_partitions=result.created_partitions,
+                    )
+            except Exception:
+                logger.exception("Insight sweep failed")
+            await asyncio.sleep(self.interval_seconds)
+
+    async def stop(self) -> None:
+        """Cancel the sweeper."""
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+
+insight_sweeper = InsightSweeper(interval_seconds=settings.INSIGHT_SWEEP_INTERVAL_SECONDS)
@@ -0,0 +1,329 @@
+"""LLM providers for insight generation.
+
+``get_llm_provider()`` returns the provider selected by ``AI_PROVIDER``:
+
+- ``rule-based``: the built-in placeholder model, no network calls.
+- ``openai``: any OpenAI-compatible chat completions API at ``AI_BASE_URL``
+  (OpenAI itself, a gateway, or ``scripts/fake_llm_server.py`` for offline
+  load tests).
+
+HTTP providers share one keep-alive connection pool, cap in-flight requests
+with a semaphore, and retry connection errors, timeouts, 429 and 5xx
+responses with exponential backoff and full jitter. Every completion reports
+its token usage and latency, which are stored with the insight.
+"""
+
+import asyncio
+import json
+import random
+import re
+import time
+from abc import ABC, abstractmethod
+from dataclasses import asdict, dataclass
+from typing import AsyncGenerator, AsyncIterator, Awaitable, Callable, TypeVar
+
+import httpx
+
+from app.config import settings
+from app.core.logging import logger
+
+T = TypeVar("T")
+
+RETRY_STATUSES = {408, 409, 429, 500, 502, 503, 504}
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token) when a model reports none."""
+    return max(1, len(text) // 4)
+
+
+@dataclass
+class Completion:
+    """A finished completion with its accounting."""
+
+    text: str
+    provider: str
+    model: str
+    prompt_tokens: int
+    completion_tokens: int
+    latency_ms: float
+
+    @property
+    def model_version(self) -> str:
+        return f"{self.provider}:{self.model}"
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    def usage(self) -> dict:
+        """Accounting stored with the insight."""
+        usage = asdict(self)
+        del usage["text"]
+        return usage
+
+
+class CompletionStream:
+    """
+    Async iterator over the text chunks of a completion.
+
+    ``completion`` is set once the stream is exhausted. A reader that stops
+    early must ``aclose()`` the stream so the model request is released.
+    """
+
+    def __init__(self, chunks: Callable[["CompletionStream"], AsyncGenerator[str, None]]):
+        self._chunks = chunks(self)
+        self.completion: Completion | None = None
+
+    def __aiter__(self) -> AsyncIterator[str]:
+        return self._chunks
+
+    async def aclose(self) -> None:
+        """Stop the model's generator, e.g. when the client disconnected."""
+        await self._chunks.aclose()
+
+
+class LLMProvider(ABC):
+    """A chat model that completes a list of messages."""
+
+    name: str
+    model: str
+
+    @abstractmethod
+    async def complete(self, messages: list[dict]) -> Completion:
+        """Return the full completion."""
+
+    @abstractmethod
+    def stream(self, messages: list[dict]) -> CompletionStream:
+        """Stream the completion as text chunks."""
+
+    async def aclose(self) -> None:
+        """Release pooled connections."""
+
+
+class RuleBasedProvider(LLMProvider):
+    """The placeholder model: answers with text chosen up front, no network."""
+
+    name = "rule-based"
+    model = "v1"
+
+    def __init__(self, text: str):
+        self.text = text
+
+    def complete_sync(self, messages: list[dict]) -> Completion:
+        return Completion(
+            text=self.text,
+            provider=self.name,
+            model=self.model,
+            prompt_tokens=sum(estimate_tokens(m["content"]) for m in messages),
+            completion_tokens=estimate_tokens(self.text),
+            latency_ms=0.0,
+        )
+
+    async def complete(self, messages: list[dict]) -> Completion:
+        return self.complete_sync(messages)
+
+    def stream(self, messages: list[dict]) -> CompletionStream:
+        async def chunks(stream: CompletionStream) -> AsyncIterator[str]:
+            completion = self.complete_sync(messages)
+            # Word by word, so callers stream the same way they do from a real model
+            for chunk in re.findall(r"\S+\s*", completion.text):
+                yield chunk
+            stream.completion = completion
+
+        return CompletionStream(chunks)
+
+
+class OpenAICompatibleProvider(LLMProvider):
+    """Chat completions over HTTP with pooling, a concurrency cap and retries."""
+
+    name = "openai"
+
+    def __init__(
+        self,
+        base_url: str,
+        api_key: str | None,
+        model: str,
+        max_concurrency: int,
+        timeout_seconds: float,
+        max_retries: int,
+        retry_base_seconds: float,
+        max_tokens: int,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.api_key = api_key
+        self.model = model
+        self.max_concurrency = max_concurrency
+        self.timeout = httpx.Timeout(timeout_seconds, connect=min(timeout_seconds, 5.0))
+        self.max_retries = max_retries
+        self.retry_base_seconds = retry_base_seconds
+        self.max_tokens = max_tokens
+        self._client: httpx.AsyncClient | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        self._loop: asyncio.AbstractEventLoop | None = None
+
+    def _pool(self) -> tuple[httpx.AsyncClient, asyncio.Semaphore]:
+        """Client and semaphore for the running event loop (scripts and tests run their own)."""
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            headers = {"Authorization": f"Bearer {self.api_key}"} if self.api_key else {}
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers=headers,
+                timeout=self.timeout,
+                limits=httpx.Limits(
+                    max_connections=self.max_concurrency,
+                    max_keepalive_connections=self.max_concurrency,
+                ),
+            )
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+            self._loop = loop
+        return self._client, self._semaphore
+
+    def _payload(self, messages: list[dict], stream: bool) -> dict:
+        payload = {"model": self.model, "messages": messages, "max_tokens": self.max_tokens}
+        if stream:
+            payload["stream"] = True
+            payload["stream_options"] = {"include_usage": True}
+        return payload
+
+    def _backoff(self, attempt: int, response: httpx.Response | None) -> float:
+        """Delay before a retry: Retry-After when given, else exponential with full jitter."""
+        if response is not None:
+            retry_after = response.headers.get("retry-after")
+            if retry_after and retry_after.replace(".", "", 1).isdigit():
+                return float(retry_after)
+        return random.uniform(0, self.retry_base_seconds * 2 ** attempt)
+
+    async def _with_retries(self, send: Callable[[], Awaitable[T]]) -> T:
+        attempt = 0
+        while True:
+            response = None
+            try:
+                return await send()
+            except httpx.HTTPStatusError as e:
+                if e.response.status_code not in RETRY_STATUSES or attempt >= self.max_retries:
+                    raise
+                response = e.response
+                error = f"HTTP {e.response.status_code}"
+            except (httpx.TransportError, httpx.TimeoutException) as e:
+                if attempt >= self.max_retries:
+                    raise
+                error = type(e).__name__
+            delay = self._backoff(attempt, response)
+            attempt += 1
+            logger.warning(
+                f"LLM request failed ({error}), retry {attempt}/{self.max_retries} in {delay:.2f}s"
+            )
+            await asyncio.sleep(delay)
+
+    async def complete(self, messages: list[dict]) -> Completion:
+        client, semaphore = self._pool()
+
+        async def send() -> httpx.Response:
+            response = await client.post("/chat/completions", json=self._payload(messages, False))
+            response.raise_for_status()
+            return response
+
+        async with semaphore:
+            started = time.perf_counter()
+            body = (await self._with_retries(send)).json()
+            latency_ms = (time.perf_counter() - started) * 1000
+
+        text = body["choices"][0]["message"]["content"] or ""
+        usage = body.get("usage") or {}
+        return Completion(
+            text=text,
+            provider=self.name,
+            model=body.get("model", self.model),
+            prompt_tokens=usage.get("prompt_tokens", 0),
+            completion_tokens=usage.get("completion_tokens", estimate_tokens(text)),
+            latency_ms=latency_ms,
+        )
+
+    def stream(self, messages: list[dict]) -> CompletionStream:
+        async def chunks(stream: CompletionStream) -> AsyncIterator[str]:
+            client, semaphore = self._pool()
+            async with semaphore:
+                started = time.perf_counter()
+
+                async def send() -> httpx.Response:
+                    request = client.build_request(
+                        "POST", "/chat/completions", json=self._payload(messages, True)
+                    )
+                    response = await client.send(request, stream=True)
+                    if response.is_error:
+                        await response.aread()
+                        await response.aclose()
+                        response.raise_for_status()
+                    return response
+
+                # Retries only cover opening the stream; once text has been sent it can't be redone
+                response = await self._with_retries(send)
+                parts, usage, model = [], {}, self.model
+                try:
+                    async for line in response.aiter_lines():
+                        if not line.startswith("data:"):
+                            continue
+                        data = line[5:].strip()
+                        if data == "[DONE]":
+                            break
+                        event = json.loads(data)
+                        model = event.get("model", model)
+                        usage = event.get("usage") or usage
+                        for choice in event.get("choices", []):
+                            text = (choice.get("delta") or {}).get("content")
+                            if text:
+                                parts.append(text)
+                                yield text
+                finally:
+                    await response.aclose()
+
+                full_text = "".join(parts)
+                stream.completion = Completion(
+                    text=full_text,
+                    provider=self.name,
+                    model=model,
+                    prompt_tokens=usage.get("prompt_tokens", 0),
+                    completion_tokens=usage.get("completion_tokens", estimate_tokens(full_text)),
+                    latency_ms=(time.perf_counter() - started) * 1000,
+                )
+
+        return CompletionStream(chunks)
+
+    async def aclose(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+
+_provider: OpenAICompatibleProvider | None = None
+
+
+def get_llm_provider() -> OpenAICompatibleProvider | None:
+    """The shared HTTP provider, or None when ``AI_PROVIDER`` is the rule-based model."""
+    global _provider
+    if settings.AI_PROVIDER == "rule-based":
+        return None
+    if settings.AI_PROVIDER != "openai":
+        raise ValueError(f"Unknown AI_PROVIDER {settings.AI_PROVIDER!r}")
+    if _provider is None:
+        _provider = OpenAICompatibleProvider(
+            base_url=settings.AI_BASE_URL,
+            api_key=settings.OPENAI_API_KEY,
+            model=settings.AI_MODEL,
+            max_concurrency=settings.AI_MAX_CONCURRENCY,
+            timeout_seconds=settings.AI_TIMEOUT_SECONDS,
+            max_retries=settings.AI_MAX_RETRIES,
+            retry_base_seconds=settings.AI_RETRY_BASE_SECONDS,
+            max_tokens=settings.AI_MAX_TOKENS,
+        )
+    return _provider
+
+
+async def close_llm_provider() -> None:
+    """Close the shared provider's connection pool."""
+    global _provider
+    if _provider is not None:
+        await _provider.aclose()
+        _provider = None
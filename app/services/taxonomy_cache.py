@@ -0,0 +1,209 @@
+"""Process-local cache of the pillar -> dimension -> indicator taxonomy.
+
+The reference tables change only when data is loaded, but the cascading
+filter dropdowns and the index page read them on every interaction. The whole
+tree is loaded once into immutable nodes with ID lookup maps and rebuilt when
+the dataset version moves or the TTL expires.
+"""
+
+import threading
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.core import data_version
+from app.models import Pillar, Dimension, Indicator
+
+
+@dataclass(frozen=True)
+class IndicatorNode:
+    """Cached indicator."""
+
+    id: int
+    dimension_id: int
+    name: str
+    description: str | None
+    unit: str | None
+    data_source: str | None
+    methodology_url: str | None
+    display_order: int | None
+    is_active: bool
+    created_at: datetime
+    updated_at: datetime
+
+
+@dataclass(frozen=True)
+class DimensionNode:
+    """Cached dimension with its indicators."""
+
+    id: int
+    pillar_id: int
+    name: str
+    description: str | None
+    display_order: int | None
+    created_at: datetime
+    updated_at: datetime
+    indicators: tuple[IndicatorNode, ...] = ()
+
+
+@dataclass(frozen=True)
+class PillarNode:
+    """Cached pillar with its dimensions."""
+
+    id: int
+    name: str
+    description: str | None
+    display_order: int | None
+    created_at: datetime
+    updated_at: datetime
+    dimensions: tuple[DimensionNode, ...] = ()
+
+
+def _display_key(node) -> tuple:
+    """Sort like ORDER BY display_order, name (NULLs last)."""
+    return (node.display_order is None, node.display_order or 0, node.name)
+
+
+@dataclass
+class Taxonomy:
+    """Snapshot of the taxonomy tree with lookup maps."""
+
+    version: int
+    loaded_at: float
+    pillars: tuple[PillarNode, ...]
+    pillars_by_id: dict[int, PillarNode] = field(default_factory=dict)
+    dimensions_by_id: dict[int, DimensionNode] = field(default_factory=dict)
+    indicators_by_id: dict[int, IndicatorNode] = field(default_factory=dict)
+    active_indicators: tuple[IndicatorNode, ...] = ()
+
+    def dimensions_for_pillar(self, pillar_id: int) -> list[DimensionNode]:
+        """Dimensions of a pillar in display order."""
+        pillar = self.pillars_by_id.get(pillar_id)
+        return list(pillar.dimensions) if pillar else []
+
+    def active_indicators_for_dimension(self, dimension_id: int) -> list[IndicatorNode]:
+        """Active indicators of a dimension in display order."""
+        dimension = self.dimensions_by_id.get(dimension_id)
+        if not dimension:
+            return []
+        return [indicator for indicator in dimension.indicators if indicator.is_active]
+
+
+def _columns(row, names: tuple[str, ...]) -> dict:
+    return {name: getattr(row, name) for name in names}
+
+
+_PILLAR_COLUMNS = ("id", "name", "description", "display_order", "created_at", "updated_at")
+_DIMENSION_COLUMNS = (
+    "id", "pillar_id", "name", "description", "display_order", "created_at", "updated_at",
+)
+_INDICATOR_COLUMNS = (
+    "id", "dimension_id", "name", "description", "unit", "data_source", "methodology_url",
+    "display_order", "is_active", "created_at", "updated_at",
+)
+
+
+def load_taxonomy(db: Session) -> Taxonomy:
+    """Load the full taxonomy tree in three queries."""
+    version = data_version.current()
+
+    pillar_rows = db.execute(select(*(getattr(Pillar, c) for c in _PILLAR_COLUMNS))).all()
+    dimension_rows = db.execute(select(*(getattr(Dimension, c) for c in _DIMENSION_COLUMNS))).all()
+    indicator_rows = db.execute(select(*(getattr(Indicator, c) for c in _INDICATOR_COLUMNS))).all()
+
+    indicators_by_dimension: dict[int, list[IndicatorNode]] = {}
+    indicators_by_id = {}
+    for row in indicator_rows:
+        values = _columns(row, _INDICATOR_COLUMNS)
+        values["is_active"] = bool(values["is_active"])
+        node = IndicatorNode(**values)
+        indicators_by_id[node.id] = node
+        indicators_by_dimension.setdefault(node.dimension_id, []).append(node)
+
+    dimensions_by_pillar: dict[int, list[DimensionNode]] = {}
+    dimensions_by_id = {}
+    for row in dimension_rows:
+        node = DimensionNode(
+            **_columns(row, _DIMENSION_COLUMNS),
+            indicators=tuple(sorted(indicators_by_dimension.get(row.id, []), key=_display_key)),
+        )
+        dimensions_by_id[node.id] = node
+        dimensions_by_pillar.setdefault(node.pillar_id, []).append(node)
+
+    pillars = tuple(sorted(
+        (
+            PillarNode(
+                **_columns(row, _PILLAR_COLUMNS),
+                dimensions=tuple(sorted(dimensions_by_pillar.get(row.id, []), key=_display_key)),
+            )
+            for row in pillar_rows
+        ),
+        key=_display_key,
+    ))
+
+    return Taxonomy(
+        version=version,
+        loaded_at=time.monotonic(),
+        pillars=pillars,
+        pillars_by_id={pillar.id: pillar for pillar in pillars},
+        dimensions_by_id=dimensions_by_id,
+        indicators_by_id=indicators_by_id,
+        active_indicators=tuple(sorted(
+            (node for node in indicators_by_id.values() if node.is_active),
+            key=_display_key,
+        )),
+    )
+
+
+class TaxonomyCache:
+    """
+    Holds the current taxonomy and reloads it on version change or TTL expiry.
+
+    As with the indicator cube, the lock never spans the reload query, which
+    under ``AsyncSession.run_sync`` yields to the event loop. While one request
+    reloads, others keep serving the previous taxonomy.
+    """
+
+    def __init__(self, ttl_seconds: float):
+        self.ttl_seconds = ttl_seconds
+        self._taxonomy: Taxonomy | None = None
+        self._loading = False
+        self._lock = threading.Lock()
+
+    def _is_stale(self, taxonomy: Taxonomy) -> bool:
+        return (
+            taxonomy.version != data_version.current()
+            or time.monotonic() - taxonomy.loaded_at > self.ttl_seconds
+        )
+
+    def get(self, db: Session) -> Taxonomy:
+        """Get the current taxonomy, reloading it if stale."""
+        taxonomy = self._taxonomy
+        if taxonomy is not None and not self._is_stale(taxonomy):
+            return taxonomy
+
+        with self._lock:
+            owner = not self._loading
+            self._loading = True
+        if not owner and taxonomy is not None:
+            return taxonomy
+
+        try:
+            taxonomy = load_taxonomy(db)
+            self._taxonomy = taxonomy
+        finally:
+            if owner:
+                with self._lock:
+                    self._loading = False
+        return taxonomy
+
+    def invalidate(self) -> None:
+        """Drop the cached taxonomy so the next read reloads it."""
+        self._taxonomy = None
+
+
+taxonomy_cache = TaxonomyCache(ttl_seconds=settings.TAXONOMY_CACHE_TTL_SECONDS)
@@ -0,0 +1,50 @@
+// Streaming AI insights
+
+// Buttons marked data-stream-insight stream instead of issuing their htmx
+// request when the browser supports EventSource; otherwise htmx goes ahead
+// with the background job and polling
+document.addEventListener('htmx:confirm', (event) => {
+    const button = event.detail.elt;
+    if (!button.hasAttribute('data-stream-insight') || typeof EventSource === 'undefined') return;
+    event.preventDefault();
+    streamInsight(button);
+});
+
+/**
+ * Stream an insight for the current filters into the insight panel.
+ *
+ * Text is shown as the model produces it; once the insight is stored the
+ * server sends the rendered result, which replaces the streamed text.
+ */
+function streamInsight(button) {
+    const target = document.getElementById('insight-content');
+    if (!target || typeof EventSource === 'undefined') return;
+
+    const params = new URLSearchParams(getFilterValues());
+    const source = new EventSource(`/htmx/insights/stream?${params}`);
+
+    target.innerHTML = '<div class="insight-result"><div class="insight-text insight-streaming"></div></div>';
+    const text = target.querySelector('.insight-text');
+    if (button) button.disabled = true;
+
+    const finish = (html) => {
+        source.close();
+        target.innerHTML = html;
+        htmx.process(target);  // activate the feedback buttons
+        if (button) button.disabled = false;
+    };
+
+    source.addEventListener('token', (event) => {
+        text.textContent += event.data;
+    });
+    source.addEventListener('done', (event) => finish(event.data));
+    source.addEventListener('failed', (event) => {
+        finish(`<p class="insight-error">${event.data}</p>`);
+    });
+    // Connection errors: stop instead of letting EventSource reconnect and regenerate
+    source.onerror = () => {
+        if (source.readyState !== EventSource.CLOSED) {
+            finish('<p class="insight-error">Insight generation failed, please try again.</p>');
+        }
+    };
+}
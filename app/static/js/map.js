@@ -92,6 +92,11 @@ function updateMapData() {
         return;
     }
 
+    if (mapData && mapData.format === 'columnar') {
+        addColumnarMarkers(mapData);
+        return;
+    }
+
     if (!mapData || mapData.length === 0) {
         console.log('No map data available');
         return;
@@ -99,38 +104,72 @@ function updateMapData() {
 
     // Add markers for each data point
     mapData.forEach(point => {
-        if (!point.latitude || !point.longitude) {
-            return;
-        }
-
-        const color = getColorForValue(point.value, point.unit);
-
-        // Create circle marker
-        const marker = L.circleMarker([point.latitude, point.longitude], {
-            radius: 8,
-            fillColor: color,
-            color: '#fff',
-            weight: 2,
-            opacity: 1,
-            fillOpacity: 0.8
-        });
-
-        // Create popup content
-        const popupContent = `
-            <div class="map-popup">
-                <h4>${point.country_name}</h4>
-                <p><strong>Value:</strong> ${point.value !== null ? point.value.toFixed(2) : 'N/A'} ${point.unit || ''}</p>
-                <p><small>${point.country_code}</small></p>
-            </div>
-        `;
-
-        marker.bindPopup(popupContent);
-        marker.addTo(markersLayer);
+        addMarker(point.country_code, point.country_name, point.latitude, point.longitude, point.value, point.unit);
     });
 
     console.log(`Loaded ${mapData.length} data points on map`);
 }
 
+/**
+ * Fast path for the columnar payload: parallel arrays, one unit, and
+ * optionally integers scaled by `scale`
+ */
+function addColumnarMarkers(data) {
+    if (!data.count) {
+        console.log('No map data available');
+        return;
+    }
+
+    const scale = data.scale || 1;
+    const decode = (v) => (v === null || v === undefined ? null : v / scale);
+
+    for (let i = 0; i < data.count; i++) {
+        addMarker(
+            data.country_code[i],
+            data.country_name[i],
+            decode(data.latitude[i]),
+            decode(data.longitude[i]),
+            decode(data.value[i]),
+            data.unit
+        );
+    }
+
+    console.log(`Loaded ${data.count} data points on map`);
+}
+
+/**
+ * Add one country marker to the markers layer
+ */
+function addMarker(countryCode, countryName, latitude, longitude, value, unit) {
+    if (!latitude || !longitude) {
+        return;
+    }
+
+    const color = getColorForValue(value, unit);
+
+    // Create circle marker
+    const marker = L.circleMarker([latitude, longitude], {
+        radius: 8,
+        fillColor: color,
+        color: '#fff',
+        weight: 2,
+        opacity: 1,
+        fillOpacity: 0.8
+    });
+
+    // Create popup content
+    const popupContent = `
+        <div class="map-popup">
+            <h4>${countryName}</h4>
+            <p><strong>Value:</strong> ${value !== null ? value.toFixed(2) : 'N/A'} ${unit || ''}</p>
+            <p><small>${countryCode}</small></p>
+        </div>
+    `;
+
+    marker.bindPopup(popupContent);
+    marker.addTo(markersLayer);
+}
+
 /**
  * Listen for htmx events to update map
  */
@@ -1,30 +1,54 @@
 """htmx-specific endpoints for dynamic updates."""
 
+import asyncio
+from contextlib import aclosing
+from typing import AsyncIterator
+
 from fastapi import APIRouter, Request, Depends, Query
-from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
-from sqlalchemy.orm import Session
-
-from app.core.database import get_db
-from app.services.indicator_service import IndicatorService
-from app.services.filter_service import FilterService
-from app.services.ai_service import AIService
+from fastapi.responses import HTMLResponse, StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.config import settings
+from app.core.cache import fragment_cache
+from app.core.database import get_async_db
+from app.core.logging import logger
+from app.services.indicator_service import AsyncIndicatorService
+from app.services.filter_service import AsyncFilterService, columnar_map_data
+from app.services.ai_service import (
+    AsyncAIService,
+    find_similar_insight,
+    find_stored_insight,
+    insight_cache_key,
+    save_insight,
+    stream_insight,
+)
+from app.services.insight_jobs import insight_jobs
 from app.schemas.filter import FilterParams
-from app.schemas.insight import InsightGenerateRequest
+from app.schemas.insight import InsightGenerateRequest, InsightJob
+from app.web.templates import templates
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/templates")
+# Decimal places kept in the embedded map payload (values are shown to 2)
+MAP_PRECISION = 2
 
 
 @router.get("/dimensions", response_class=HTMLResponse)
 async def get_dimensions(
     request: Request,
     pillar_id: int = Query(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get dimensions for a pillar (htmx endpoint)."""
-    service = IndicatorService(db)
-    dimensions = service.get_dimensions_by_pillar(pillar_id)
+    return await fragment_cache.get_or_render(
+        "htmx_dimensions",
+        {"pillar_id": pillar_id},
+        lambda: _render_dimensions(pillar_id, db),
+    )
+
+
+async def _render_dimensions(pillar_id: int, db: AsyncSession) -> HTMLResponse:
+    service = AsyncIndicatorService(db)
+    dimensions = await service.get_dimensions_by_pillar(pillar_id)
 
     # Return just the select element
     html = '<select id="dimension-select" name="dimension_id" hx-get="/htmx/indicators" hx-target="#indicator-select-container" hx-trigger="change">'
@@ -40,11 +64,19 @@ async def get_dimensions(
 async def get_indicators(
     request: Request,
     dimension_id: int = Query(...),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get indicators for a dimension (htmx endpoint)."""
-    service = IndicatorService(db)
-    indicators = service.get_indicators_by_dimension(dimension_id)
+    return await fragment_cache.get_or_render(
+        "htmx_indicators",
+        {"dimension_id": dimension_id},
+        lambda: _render_indicators(dimension_id, db),
+    )
+
+
+async def _render_indicators(dimension_id: int, db: AsyncSession) -> HTMLResponse:
+    service = AsyncIndicatorService(db)
+    indicators = await service.get_indicators_by_dimension(dimension_id)
 
     # Return just the select element with htmx attributes
     html = '''<select id="indicator-select"
@@ -70,34 +102,49 @@ async def get_filter_results(
     dimension_id: int | None = Query(None),
     indicator_id: int | None = Query(None),
     year: int = Query(2023),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Get filtered map data (htmx endpoint)."""
+    params = {"indicator_id": indicator_id, "year": year}
+    return await fragment_cache.get_or_render(
+        "htmx_filter_results",
+        params,
+        lambda: _render_filter_results(request, indicator_id, year, db),
+    )
+
+
+async def _render_filter_results(
+    request: Request,
+    indicator_id: int | None,
+    year: int,
+    db: AsyncSession,
+) -> HTMLResponse:
+    """Render the filter results partial."""
     if not indicator_id:
         # If no indicator selected, return empty map
         return templates.TemplateResponse(
             "partials/filter_results.html",
             {
                 "request": request,
-                "map_data": [],
+                "map_data": columnar_map_data([]),
                 "total": 0,
             }
         )
 
     # Get map data
-    filter_service = FilterService(db)
-    map_data = filter_service.get_map_data(indicator_id, year)
+    filter_service = AsyncFilterService(db)
+    map_data = await filter_service.get_map_data(indicator_id, year)
 
     # Get indicator name
-    indicator_service = IndicatorService(db)
-    indicator = indicator_service.get_indicator_by_id(indicator_id)
+    indicator_service = AsyncIndicatorService(db)
+    indicator = await indicator_service.get_indicator_by_id(indicator_id)
     indicator_name = indicator.name if indicator else None
 
     return templates.TemplateResponse(
         "partials/filter_results.html",
         {
             "request": request,
-            "map_data": map_data,
+            "map_data": columnar_map_data(map_data, MAP_PRECISION),
             "indicator_name": indicator_name,
             "total": len(map_data),
         }
@@ -112,10 +159,10 @@ async def generate_insight(
     indicator_id: int | None = Query(None),
     year_start: int | None = Query(None),
     year_end: int | None = Query(None),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Generate AI insight (htmx endpoint)."""
-    service = AIService(db)
+    service = AsyncAIService(db)
 
     # Create request
     insight_request = InsightGenerateRequest(
@@ -126,14 +173,98 @@ async def generate_insight(
         year_end=year_end,
     )
 
-    # Generate insight
-    insight = service.generate_insight(insight_request)
+    # Generate in the background and let the panel poll for the result
+    try:
+        job = await insight_jobs.submit(insight_request)
+    except asyncio.QueueFull:
+        insight = await service.get_or_generate_insight(insight_request)
+        job = InsightJob(job_id=insight_cache_key(insight_request), status="done", insight=insight)
+
+    return _render_insight_job(request, job)
+
 
+@router.get("/insights/stream")
+async def get_insight_stream(
+    insight_type: str = Query("country"),
+    country_code: str | None = Query(None),
+    indicator_id: int | None = Query(None),
+    year_start: int | None = Query(None),
+    year_end: int | None = Query(None),
+):
+    """
+    Stream an AI insight as server-sent events (htmx insight panel).
+
+    ``token`` events carry text as the model produces it; a final ``done``
+    event carries the rendered insight once it has been stored.
+    """
+    insight_request = InsightGenerateRequest(
+        insight_type=insight_type,
+        country_code=country_code,
+        indicator_ids=[indicator_id] if indicator_id else None,
+        year_start=year_start,
+        year_end=year_end,
+    )
+    return StreamingResponse(
+        _insight_events(insight_request),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _insight_events(insight_request: InsightGenerateRequest) -> AsyncIterator[str]:
+    # Runs after the route returns, so the helpers open their own sessions
+    try:
+        insight = await find_stored_insight(insight_cache_key(insight_request))
+        if insight is None:
+            insight = await find_similar_insight(insight_request)
+        if insight is None:
+            stream = await stream_insight(insight_request)
+            # Closed when the client disconnects too, so the model request ends
+            async with aclosing(stream):
+                async for chunk in stream:
+                    yield _sse_event("token", chunk)
+            insight = await save_insight(insight_request, stream.completion)
+    except Exception:
+        logger.exception("Insight stream failed")
+        yield _sse_event("failed", "Insight generation failed, please try again.")
+        return
+
+    html = templates.get_template("partials/insight_content.html").render(insight=insight)
+    yield _sse_event("done", html)
+
+
+def _sse_event(event: str, data: str) -> str:
+    """Format a server-sent event; every line of data gets its own data: field."""
+    lines = "".join(f"data: {line}\n" for line in data.split("\n"))
+    return f"event: {event}\n{lines}\n"
+
+
+@router.get("/insights/jobs/{job_id}", response_class=HTMLResponse)
+async def get_insight_job(request: Request, job_id: str):
+    """Poll a background insight job (htmx endpoint)."""
+    job = await insight_jobs.get(job_id)
+    if job is None:
+        return HTMLResponse(content='<p class="insight-error">Insight request expired, please try again.</p>')
+    return _render_insight_job(request, job)
+
+
+def _render_insight_job(request: Request, job: InsightJob) -> HTMLResponse:
+    if job.status == "done":
+        return templates.TemplateResponse(
+            "partials/insight_content.html",
+            {
+                "request": request,
+                "insight": job.insight,
+            }
+        )
+    if job.status == "failed":
+        return HTMLResponse(content='<p class="insight-error">Insight generation failed, please try again.</p>')
     return templates.TemplateResponse(
-        "partials/insight_content.html",
+        "partials/insight_pending.html",
         {
             "request": request,
-            "insight": insight,
+            "job": job,
+            "poll_seconds": settings.INSIGHT_JOB_POLL_SECONDS,
         }
     )
 
@@ -143,11 +274,11 @@ async def submit_feedback(
     request: Request,
     insight_id: int,
     rating: int = Query(..., ge=1, le=5),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """Submit feedback for an insight (htmx endpoint)."""
-    service = AIService(db)
-    service.submit_feedback(insight_id, rating)
+    service = AsyncAIService(db)
+    await service.submit_feedback(insight_id, rating)
 
     # Return a simple confirmation message
     return HTMLResponse(content='<p class="feedback-success">✓ Thank you for your feedback!</p>')
@@ -2,21 +2,20 @@
 
 from fastapi import APIRouter, Request, Depends
 from fastapi.responses import HTMLResponse
-from fastapi.templating import Jinja2Templates
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
-from app.services.indicator_service import IndicatorService
+from app.core.database import get_async_db
+from app.services.indicator_service import AsyncIndicatorService
+from app.web.templates import templates
 
 router = APIRouter()
-templates = Jinja2Templates(directory="app/templates")
 
 
 @router.get("/", response_class=HTMLResponse)
-async def index(request: Request, db: Session = Depends(get_db)):
+async def index(request: Request, db: AsyncSession = Depends(get_async_db)):
     """Homepage with interactive map and filters."""
-    service = IndicatorService(db)
-    pillars = service.get_all_pillars()
+    service = AsyncIndicatorService(db)
+    pillars = await service.get_all_pillars()
 
     return templates.TemplateResponse(
         "index.html",
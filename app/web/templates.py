@@ -0,0 +1,38 @@
+"""Shared Jinja2 templates.
+
+One environment for the app, the page routes and the htmx endpoints, so
+compiled templates are cached once per process. Compiled bytecode is also
+kept on disk so new workers skip compiling, and outside DEBUG templates are
+not re-checked for changes on every render.
+"""
+
+import tempfile
+from pathlib import Path
+
+import jinja2
+from fastapi.templating import Jinja2Templates
+
+from app.config import settings
+from app.core.static_files import static_url
+
+TEMPLATES_DIR = Path(__file__).resolve().parent.parent / "templates"
+
+
+def _bytecode_cache_dir() -> str:
+    directory = Path(
+        settings.JINJA_BYTECODE_CACHE_DIR
+        or Path(tempfile.gettempdir()) / "brain-capital-jinja"
+    )
+    directory.mkdir(parents=True, exist_ok=True)
+    return str(directory)
+
+
+env = jinja2.Environment(
+    loader=jinja2.FileSystemLoader(TEMPLATES_DIR),
+    autoescape=True,
+    auto_reload=settings.DEBUG,
+    bytecode_cache=jinja2.FileSystemBytecodeCache(_bytecode_cache_dir()),
+)
+env.globals["static_url"] = static_url
+
+templates = Jinja2Templates(env=env)
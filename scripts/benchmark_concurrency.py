@@ -0,0 +1,85 @@
+"""Benchmark concurrent request throughput against a running server.
+
+Fires a fixed number of requests with bounded concurrency and reports
+throughput and latency percentiles. Run it once against a build that uses the
+synchronous session path and once against the async path to compare:
+
+    uv run python scripts/benchmark_concurrency.py --requests 2000 --concurrency 50
+"""
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import httpx
+
+DEFAULT_PATHS = [
+    "/api/v1/map/data?indicator_id=1&year=2023",
+    "/api/v1/indicators/values?limit=100",
+    "/api/v1/pillars",
+    "/htmx/filter-results?indicator_id=1&year=2023",
+]
+
+
+async def run_benchmark(base_url: str, paths: list[str], requests: int, concurrency: int) -> dict:
+    """Issue requests round-robin over paths and collect latencies."""
+    latencies: list[float] = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+
+        async def fetch(n: int) -> None:
+            nonlocal errors
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    response = await client.get(paths[n % len(paths)])
+                    if response.status_code >= 400:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append(time.perf_counter() - started)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(fetch(n) for n in range(requests)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "requests": requests,
+        "errors": errors,
+        "seconds": elapsed,
+        "rps": requests / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "max_ms": latencies[-1] * 1000,
+    }
+
+
+def main():
+    """Parse arguments and run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default="http://localhost:8000")
+    parser.add_argument("--path", action="append", dest="paths", help="Path to request (repeatable)")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    paths = args.paths or DEFAULT_PATHS
+    print(f"Benchmarking {args.base_url} with {args.requests} requests, concurrency {args.concurrency}")
+    for path in paths:
+        print(f"  {path}")
+    print()
+
+    result = asyncio.run(run_benchmark(args.base_url, paths, args.requests, args.concurrency))
+
+    print(f"✓ {result['requests']} requests in {result['seconds']:.2f}s ({result['errors']} errors)")
+    print(f"  Throughput: {result['rps']:.1f} req/s")
+    print(f"  Latency p50: {result['p50_ms']:.1f} ms, p95: {result['p95_ms']:.1f} ms, max: {result['max_ms']:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+"""Benchmark JSON serialization paths on synthetic 10k-row responses."""
+
+import argparse
+import sys
+import time
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+from types import SimpleNamespace
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from fastapi.responses import JSONResponse
+from pydantic import TypeAdapter
+
+from app.core.responses import FastJSONResponse, trusted_response
+from app.schemas.country import Country
+
+
+def _value_rows(n: int, as_decimal: bool) -> list[SimpleNamespace]:
+    """Rows shaped like the filter query results, with DECIMAL or float columns."""
+    number = (lambda v: Decimal(f"{v:.4f}")) if as_decimal else (lambda v: round(v, 4))
+    return [
+        SimpleNamespace(
+            id=k,
+            country_code=f"C{k % 200:03}",
+            country_name=f"Country {k % 200}",
+            latitude=number(k % 90),
+            longitude=number(k % 180),
+            indicator_name=f"Indicator {k % 50}",
+            unit="score 0-100",
+            dimension_name=f"Dimension {k % 10}",
+            pillar_name=f"Pillar {k % 3}",
+            year=1990 + k % 30,
+            value=number(k * 0.37 % 100),
+            confidence_score=number(0.85),
+        )
+        for k in range(n)
+    ]
+
+
+def _to_dicts(rows, convert) -> list[dict]:
+    return [
+        {
+            "id": row.id,
+            "country_code": row.country_code,
+            "country_name": row.country_name,
+            "latitude": convert(row.latitude),
+            "longitude": convert(row.longitude),
+            "indicator_name": row.indicator_name,
+            "unit": row.unit,
+            "dimension_name": row.dimension_name,
+            "pillar_name": row.pillar_name,
+            "year": row.year,
+            "value": convert(row.value),
+            "confidence_score": convert(row.confidence_score),
+        }
+        for row in rows
+    ]
+
+
+def _countries(n: int) -> list[SimpleNamespace]:
+    now = datetime.now()
+    return [
+        SimpleNamespace(
+            id=k,
+            code=f"{k % 1000:03}",
+            name=f"Country {k}",
+            region="Europe",
+            latitude=48.8566,
+            longitude=2.3522,
+            population=67000000,
+            gdp_usd=2716000.0,
+            created_at=now,
+            updated_at=now,
+        )
+        for k in range(n)
+    ]
+
+
+def _time(label: str, fn, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        body = fn()
+        best = min(best, time.perf_counter() - started)
+    print(f"  {label:<52} {best * 1000:8.1f} ms  {len(body) / 1024:8.0f} KB")
+    return best
+
+
+def main():
+    """Run the benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"Filter values ({args.rows:,} rows)")
+    decimal_rows = _value_rows(args.rows, as_decimal=True)
+    float_rows = _value_rows(args.rows, as_decimal=False)
+    baseline = _time(
+        "Decimal columns + float() per row + stdlib json",
+        lambda: JSONResponse(
+            _to_dicts(decimal_rows, lambda v: float(v) if v is not None else None)
+        ).body,
+        args.repeat,
+    )
+    fast = _time(
+        "float columns + orjson",
+        lambda: FastJSONResponse(_to_dicts(float_rows, lambda v: v)).body,
+        args.repeat,
+    )
+    print(f"  speedup: {baseline / fast:.1f}x")
+
+    print(f"Countries with response_model ({args.rows:,} rows)")
+    countries = _countries(args.rows)
+    adapter = TypeAdapter(list[Country])
+    baseline = _time(
+        "response_model validation + stdlib json",
+        lambda: JSONResponse(
+            adapter.dump_python(adapter.validate_python(countries, from_attributes=True), mode="json")
+        ).body,
+        args.repeat,
+    )
+    fast = _time(
+        "trusted_response (no validation) + orjson",
+        lambda: trusted_response(Country, countries).body,
+        args.repeat,
+    )
+    print(f"  speedup: {baseline / fast:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,54 @@
+"""Precompress static assets and write the content-hash manifest."""
+
+import json
+import sys
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.compression import compress_file, brotli
+from app.core.static_files import STATIC_DIR, MANIFEST_NAME, PRECOMPRESSED_SUFFIXES, file_hash
+
+# Text assets worth compressing; images and fonts are already compressed
+COMPRESSIBLE_SUFFIXES = {".js", ".css", ".html", ".svg", ".json", ".map", ".txt"}
+
+
+def main():
+    """Write .br/.gz variants next to each text asset and the manifest of hashes."""
+    encodings = [e for e in PRECOMPRESSED_SUFFIXES if e != "br" or brotli is not None]
+    if "br" not in encodings:
+        print("! brotli is not installed, writing .gz variants only")
+
+    manifest = {}
+    original_bytes = compressed_bytes = 0
+    for path in sorted(STATIC_DIR.rglob("*")):
+        if (
+            not path.is_file()
+            or path.name == MANIFEST_NAME
+            or path.suffix in PRECOMPRESSED_SUFFIXES.values()
+        ):
+            continue
+
+        relative = path.relative_to(STATIC_DIR).as_posix()
+        manifest[relative] = file_hash(path)
+
+        if path.suffix not in COMPRESSIBLE_SUFFIXES:
+            continue
+        data = path.read_bytes()
+        original_bytes += len(data)
+        for encoding in encodings:
+            compressed = compress_file(data, encoding)
+            path.with_name(path.name + PRECOMPRESSED_SUFFIXES[encoding]).write_bytes(compressed)
+            if encoding == encodings[0]:
+                compressed_bytes += len(compressed)
+
+    (STATIC_DIR / MANIFEST_NAME).write_text(json.dumps(manifest, indent=2, sort_keys=True) + "\n")
+    print(
+        f"✓ Hashed {len(manifest)} files; precompressed {original_bytes:,} bytes "
+        f"to {compressed_bytes:,} ({encodings[0]})"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""Local stand-in for an OpenAI-compatible chat completions API.
+
+Answers /v1/chat/completions (plain and streamed) with canned text after a
+configurable time-to-first-token and token rate, and can fail a share of
+requests with 429/503 to exercise retries. Use it to measure insight
+throughput offline:
+
+    uv run python scripts/fake_llm_server.py --port 9000 --ttft-ms 300 --tokens-per-second 50
+    AI_PROVIDER=openai AI_BASE_URL=http://127.0.0.1:9000/v1 \\
+        uv run python scripts/pregenerate_insights.py --concurrency 32
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+import uuid
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import uvicorn
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+from app.services.llm import estimate_tokens
+
+WORDS = (
+    "Brain capital indicators for the selected countries show steady progress in "
+    "education access and digital skills, while brain health outcomes vary widely. "
+    "Investment in early childhood development and mental health services remains "
+    "the strongest predictor of long-term gains across dimensions."
+).split()
+
+
+def create_app(ttft_ms: float, tokens_per_second: float, error_rate: float) -> FastAPI:
+    """The fake API with the given latency profile."""
+    app = FastAPI(title="Fake LLM")
+
+    def _answer(max_tokens: int) -> list[str]:
+        count = min(max_tokens, len(WORDS))
+        return [word + " " for word in WORDS[:count]]
+
+    def _usage(messages: list[dict], words: list[str]) -> dict:
+        prompt_tokens = sum(estimate_tokens(m.get("content") or "") for m in messages)
+        completion_tokens = len(words)
+        return {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+        }
+
+    @app.post("/v1/chat/completions")
+    async def chat_completions(request: Request):
+        body = await request.json()
+        if random.random() < error_rate:
+            status = random.choice((429, 503))
+            return JSONResponse(
+                {"error": {"message": "Simulated failure", "type": "server_error"}},
+                status_code=status,
+                headers={"Retry-After": "0.1"} if status == 429 else None,
+            )
+
+        model = body.get("model", "fake-model")
+        messages = body.get("messages", [])
+        words = _answer(body.get("max_tokens") or 400)
+        completion_id = f"chatcmpl-{uuid.uuid4().hex[:12]}"
+        created = int(time.time())
+        delay = 1 / tokens_per_second if tokens_per_second > 0 else 0
+
+        if not body.get("stream"):
+            await asyncio.sleep(ttft_ms / 1000 + delay * len(words))
+            return {
+                "id": completion_id,
+                "object": "chat.completion",
+                "created": created,
+                "model": model,
+                "choices": [{
+                    "index": 0,
+                    "message": {"role": "assistant", "content": "".join(words).strip()},
+                    "finish_reason": "stop",
+                }],
+                "usage": _usage(messages, words),
+            }
+
+        async def events():
+            def chunk(delta: dict, finish_reason: str | None = None, **extra) -> str:
+                event = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": created,
+                    "model": model,
+                    "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+                    **extra,
+                }
+                return f"data: {json.dumps(event)}\n\n"
+
+            await asyncio.sleep(ttft_ms / 1000)
+            for word in words:
+                yield chunk({"content": word})
+                await asyncio.sleep(delay)
+            yield chunk({}, "stop")
+            if (body.get("stream_options") or {}).get("include_usage"):
+                usage_event = {
+                    "id": completion_id,
+                    "object": "chat.completion.chunk",
+                    "created": created,
+                    "model": model,
+                    "choices": [],
+                    "usage": _usage(messages, words),
+                }
+                yield f"data: {json.dumps(usage_event)}\n\n"
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(events(), media_type="text/event-stream")
+
+    return app
+
+
+def main():
+    """Run the fake server."""
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9000)
+    parser.add_argument("--ttft-ms", type=float, default=300.0, help="Time to first token")
+    parser.add_argument("--tokens-per-second", type=float, default=50.0)
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="Share of requests failed with 429/503"
+    )
+    args = parser.parse_args()
+
+    app = create_app(args.ttft_ms, args.tokens_per_second, args.error_rate)
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+"""Bulk-load indicator values from a CSV or Parquet file."""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.database import SessionLocal
+from app.services.ingest_service import (
+    read_indicator_file,
+    validate_indicator_values,
+    load_indicator_values,
+)
+
+
+def _rate(rows: int, seconds: float) -> str:
+    return f"{rows / seconds:,.0f} rows/s" if seconds > 0 else "n/a"
+
+
+def main():
+    """Read, validate and load an indicator values file."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("path", help="CSV or Parquet file")
+    parser.add_argument(
+        "--rejects",
+        help="Write rejected rows with a reason column to this CSV file",
+    )
+    parser.add_argument(
+        "--keep-existing",
+        action="store_true",
+        help="Only insert new (country, indicator, year) rows; leave existing ones untouched",
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Validate only, load nothing")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        frame = read_indicator_file(args.path)
+        read_seconds = time.perf_counter() - started
+        print(f"✓ Read {len(frame):,} rows in {read_seconds:.2f}s ({_rate(len(frame), read_seconds)})")
+
+        started = time.perf_counter()
+        valid, rejected = validate_indicator_values(db, frame)
+        validate_seconds = time.perf_counter() - started
+        print(
+            f"✓ Validated in {validate_seconds:.2f}s ({_rate(len(frame), validate_seconds)}): "
+            f"{len(valid):,} valid, {len(rejected):,} rejected"
+        )
+        if len(rejected):
+            for reason, count in rejected["reason"].value_counts().items():
+                print(f"  - {reason}: {count:,}")
+            if args.rejects:
+                rejected.to_csv(args.rejects, index=False)
+                print(f"  Rejected rows written to {args.rejects}")
+
+        if args.dry_run or valid.empty:
+            return
+
+        update_columns = [] if args.keep_existing else [
+            column for column in ("value", "confidence_score", "notes") if column in frame.columns
+        ]
+
+        started = time.perf_counter()
+        result = load_indicator_values(db, valid, update_columns=update_columns)
+        load_seconds = time.perf_counter() - started
+        print(
+            f"✓ Loaded {result['staged']:,} rows ({result['written']:,} inserted or changed) "
+            f"in {load_seconds:.2f}s ({_rate(result['staged'], load_seconds)})"
+        )
+    except Exception as e:
+        print(f"✗ Error ingesting indicator values: {e}")
+        db.rollback()
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
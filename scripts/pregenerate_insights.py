@@ -0,0 +1,112 @@
+"""Pre-generate AI insights for every country x pillar x insight type.
+
+With the rule-based model, run it with --refresh after each data load to
+rewrite every insight from the new data.
+"""
+
+import argparse
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.config import settings
+from app.core.database import SessionLocal
+from app.services.insight_pregeneration import (
+    DEFAULT_INSIGHT_TYPES,
+    enumerate_targets,
+    generate_all,
+    generate_rule_based,
+    live_cache_keys,
+    upsert_insights,
+)
+from app.services.llm import close_llm_provider, get_llm_provider
+
+
+async def _generate(targets, concurrency):
+    try:
+        return await generate_all(targets, concurrency)
+    finally:
+        await close_llm_provider()
+
+
+def main():
+    """Generate and store the insights that are missing or expired."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--types",
+        default=",".join(DEFAULT_INSIGHT_TYPES),
+        help="Comma-separated insight types (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--by-dimension",
+        action="store_true",
+        help="One insight per dimension instead of per pillar",
+    )
+    parser.add_argument("--concurrency", type=int, default=8, help="Generations in flight")
+    parser.add_argument("--batch-size", type=int, default=500, help="Rows per INSERT")
+    parser.add_argument(
+        "--cost-per-1k-tokens",
+        type=float,
+        default=settings.AI_COST_PER_1K_TOKENS,
+        help="Model price used for the cost estimate (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--refresh", action="store_true", help="Regenerate insights that are still cached"
+    )
+    parser.add_argument("--dry-run", action="store_true", help="Count what would be generated")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        insight_types = tuple(t.strip() for t in args.types.split(",") if t.strip())
+        targets = enumerate_targets(db, insight_types, by_dimension=args.by_dimension)
+        live = set() if args.refresh else live_cache_keys(db, [t.cache_key for t in targets])
+        pending = [target for target in targets if target.cache_key not in live]
+        print(f"✓ {len(targets)} combinations, {len(live)} still cached, {len(pending)} to generate")
+        if args.dry_run or not pending:
+            return
+
+        started = time.perf_counter()
+        if get_llm_provider() is None:
+            generated = generate_rule_based(db, pending)
+        else:
+            generated = asyncio.run(_generate(pending, args.concurrency))
+        generate_seconds = time.perf_counter() - started
+        failed = [item for item in generated if item.error is not None]
+        for item in failed[:10]:
+            print(f"✗ {item.target.request.model_dump(exclude_none=True)}: {item.error}")
+
+        started = time.perf_counter()
+        written = upsert_insights(db, generated, batch_size=args.batch_size)
+        write_seconds = time.perf_counter() - started
+
+        completions = [item.completion for item in generated if item.completion is not None]
+        tokens = sum(completion.total_tokens for completion in completions)
+        latencies = sorted(completion.latency_ms for completion in completions)
+        rate = len(generated) / generate_seconds if generate_seconds > 0 else float("inf")
+        print(
+            f"✓ Generated {len(generated) - len(failed)} insights ({len(failed)} failed) "
+            f"in {generate_seconds:.2f}s ({rate:,.1f}/s), wrote {written} rows in {write_seconds:.2f}s"
+        )
+        if latencies:
+            print(
+                f"  model latency p50 {latencies[len(latencies) // 2]:,.0f} ms, "
+                f"max {latencies[-1]:,.0f} ms"
+            )
+        print(f"  {tokens:,} tokens, estimated cost ${tokens / 1000 * args.cost_per_1k_tokens:,.4f}")
+        if failed:
+            sys.exit(1)
+    except Exception as e:
+        print(f"✗ Error pre-generating insights: {e}")
+        db.rollback()
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,40 @@
+"""Refresh the denormalized indicator_facts table."""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.core.database import SessionLocal
+from app.services.fact_service import refresh_indicator_facts
+
+
+def main():
+    """Run an incremental (default) or full refresh."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--full", action="store_true", help="Re-upsert every fact row")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        result = refresh_indicator_facts(db, full=args.full)
+        elapsed = time.perf_counter() - started
+        mode = "full" if result["full"] else "incremental"
+        print(
+            f"✓ Refreshed indicator facts ({mode}): {result['upserted']} upserted, "
+            f"{result['deleted']} deleted in {elapsed:.2f}s"
+        )
+    except Exception as e:
+        print(f"✗ Error refreshing indicator facts: {e}")
+        db.rollback()
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -3,11 +3,16 @@
 import sys
 from pathlib import Path
 
+import numpy as np
+import pandas as pd
+
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from app.core.database import SessionLocal
-from app.models import Country, Pillar, Dimension, Indicator, IndicatorValue
+from app.models import Country, Pillar, Dimension, Indicator
+from app.services.fact_service import refresh_indicator_facts
+from app.services.ingest_service import load_indicator_values
 
 
 def seed_countries():
@@ -175,45 +180,33 @@ def seed_indicators():
 
 def seed_indicator_values():
     """Seed sample indicator values."""
-    import random
-
     db = SessionLocal()
     try:
-        countries = db.query(Country).all()
-        indicators = db.query(Indicator).all()
+        countries = db.query(Country.id).all()
+        indicators = db.query(Indicator.id, Indicator.name).all()
         years = [2020, 2021, 2022, 2023]
 
-        count = 0
-        for country in countries:
-            for indicator in indicators:
-                for year in years:
-                    existing = db.query(IndicatorValue).filter(
-                        IndicatorValue.country_id == country.id,
-                        IndicatorValue.indicator_id == indicator.id,
-                        IndicatorValue.year == year
-                    ).first()
-
-                    if not existing:
-                        # Generate semi-realistic random values
-                        if "rate" in indicator.name.lower() or "index" in indicator.name.lower():
-                            value = random.uniform(40, 95)
-                        elif "prevalence" in indicator.name.lower():
-                            value = random.uniform(500, 5000)
-                        else:
-                            value = random.uniform(50, 90)
-
-                        indicator_value = IndicatorValue(
-                            country_id=country.id,
-                            indicator_id=indicator.id,
-                            year=year,
-                            value=round(value, 2),
-                            confidence_score=round(random.uniform(0.7, 0.95), 2),
-                        )
-                        db.add(indicator_value)
-                        count += 1
-
-        db.commit()
-        print(f"✓ Seeded {count} indicator values")
+        grid = pd.MultiIndex.from_product(
+            [[c.id for c in countries], [i.id for i in indicators], years],
+            names=["country_id", "indicator_id", "year"],
+        ).to_frame(index=False)
+
+        # Generate semi-realistic random values
+        rng = np.random.default_rng()
+        names = grid["indicator_id"].map({i.id: i.name.lower() for i in indicators})
+        low = np.select(
+            [names.str.contains("rate|index"), names.str.contains("prevalence")], [40, 500], 50
+        )
+        high = np.select(
+            [names.str.contains("rate|index"), names.str.contains("prevalence")], [95, 5000], 90
+        )
+        grid["value"] = rng.uniform(low, high).round(2)
+        grid["confidence_score"] = rng.uniform(0.7, 0.95, len(grid)).round(2)
+        grid["notes"] = None
+
+        # Existing values are kept, as before
+        result = load_indicator_values(db, grid, update_columns=[])
+        print(f"✓ Seeded {result['written']} indicator values")
     except Exception as e:
         print(f"✗ Error seeding indicator values: {e}")
         db.rollback()
@@ -221,6 +214,19 @@ def seed_indicator_values():
         db.close()
 
 
+def refresh_facts():
+    """Bring the denormalized indicator_facts table up to date."""
+    db = SessionLocal()
+    try:
+        result = refresh_indicator_facts(db)
+        print(f"✓ Refreshed {result['upserted']} indicator facts")
+    except Exception as e:
+        print(f"✗ Error refreshing indicator facts: {e}")
+        db.rollback()
+    finally:
+        db.close()
+
+
 def main():
     """Run all seed functions."""
     print("Starting database seeding...")
@@ -231,6 +237,7 @@ def main():
     seed_dimensions()
     seed_indicators()
     seed_indicator_values()
+    refresh_facts()
 
     print()
     print("✓ Database seeding completed!")
@@ -0,0 +1,65 @@
+"""Delete expired AI insights and maintain the ai_insights partitions."""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+# Add project root to path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.config import settings
+from app.core.database import SessionLocal
+from app.services.insight_sweeper import sweep_insights
+
+
+def main():
+    """Run one sweep."""
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--retention-hours",
+        type=float,
+        default=settings.INSIGHT_RETENTION_HOURS,
+        help="Keep insights this long after they expire (default: %(default)s)",
+    )
+    parser.add_argument(
+        "--batch-size", type=int, default=settings.INSIGHT_SWEEP_BATCH_SIZE, help="Rows per DELETE"
+    )
+    parser.add_argument(
+        "--months-ahead",
+        type=int,
+        default=settings.INSIGHT_PARTITION_MONTHS_AHEAD,
+        help="Monthly partitions to create in advance (default: %(default)s)",
+    )
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        result = sweep_insights(
+            db,
+            retention_hours=args.retention_hours,
+            batch_size=args.batch_size,
+            months_ahead=args.months_ahead,
+        )
+        elapsed = time.perf_counter() - started
+        if result.skipped:
+            print("✓ Another worker is sweeping, nothing done")
+            return
+        print(f"✓ Deleted {result.deleted_rows} expired insights in {elapsed:.2f}s")
+        if result.deleted_duplicates:
+            print(f"  deleted {result.deleted_duplicates} superseded duplicates")
+        for name in result.dropped_partitions:
+            print(f"  dropped partition {name}")
+        for name in result.created_partitions:
+            print(f"  created partition {name}")
+    except Exception as e:
+        print(f"✗ Error sweeping insights: {e}")
+        db.rollback()
+        sys.exit(1)
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""Tests for response compression."""
+
+import gzip
+
+import pytest
+from fastapi import FastAPI, Response
+from fastapi.testclient import TestClient
+
+from app.core.compression import CompressionMiddleware
+
+BODY = b'{"data": [' + b'{"value": 1.0}, ' * 200 + b'{}]}'
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware, minimum_size=100)
+
+    @app.get("/full")
+    async def full():
+        return Response(BODY, media_type="application/json")
+
+    @app.get("/partial")
+    async def partial():
+        return Response(
+            BODY[:500],
+            status_code=206,
+            media_type="application/json",
+            headers={"Content-Range": f"bytes 0-499/{len(BODY)}"},
+        )
+
+    @app.get("/encoded")
+    async def encoded():
+        return Response(
+            gzip.compress(BODY), media_type="application/json", headers={"Content-Encoding": "gzip"}
+        )
+
+    return TestClient(app)
+
+
+def test_compresses_large_text_responses(client):
+    response = client.get("/full", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert int(response.headers["content-length"]) < len(BODY)
+    assert response.content == BODY
+
+
+def test_partial_content_is_not_compressed(client):
+    response = client.get("/partial", headers={"Accept-Encoding": "gzip"})
+
+    assert response.status_code == 206
+    assert "content-encoding" not in response.headers
+    assert response.content == BODY[:500]
+
+
+def test_encoded_response_is_not_compressed_again(client):
+    response = client.get("/encoded", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.content == BODY
@@ -0,0 +1,77 @@
+"""Tests for conditional GETs."""
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+from app.api.dependencies import conditional_get
+from app.config import settings
+from app.core import data_version
+from app.core.conditional import Validators
+from app.core.database import get_async_db
+from app.models import Country, Dimension, Indicator, IndicatorValue, Pillar
+from app.services.indicator_cube import cube_manager
+
+
+@pytest.fixture
+def database(tmp_path, monkeypatch):
+    """A SQLite file database with the tables the fingerprint covers."""
+    path = tmp_path / "brain_capital.db"
+    engine = create_engine(f"sqlite:///{path}")
+    tables = [model.__table__ for model in (Pillar, Dimension, Indicator, Country, IndicatorValue)]
+    Pillar.metadata.create_all(engine, tables=tables)
+
+    monkeypatch.setattr(settings, "REDIS_ENABLED", False)
+    monkeypatch.setattr(data_version, "_version", 0)
+    monkeypatch.setattr(cube_manager, "refresh_seconds", 0)
+    monkeypatch.setattr(cube_manager, "_fingerprint", None)
+    monkeypatch.setattr(cube_manager, "_checked_at", 0.0)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def client(database):
+    app = FastAPI()
+    sessions = async_sessionmaker(create_async_engine(f"sqlite+aiosqlite:///{database.url.database}"))
+
+    async def get_db():
+        async with sessions() as db:
+            yield db
+
+    @app.get("/pillars")
+    async def list_pillars(validators: Validators = Depends(conditional_get())):
+        return []
+
+    app.dependency_overrides[get_async_db] = get_db
+    with TestClient(app) as client:
+        yield client
+
+
+def test_matching_etag_is_not_modified(client):
+    etag = client.get("/pillars").headers["etag"]
+
+    response = client.get("/pillars", headers={"If-None-Match": etag})
+
+    assert response.status_code == 304
+    assert response.headers["etag"] == etag
+
+
+@pytest.mark.parametrize("table, values", [
+    (IndicatorValue.__table__, {"country_id": 1, "indicator_id": 1, "year": 2020, "value": 0.5}),
+    (Country.__table__, {"code": "KEN", "name": "Kenya"}),
+    (Pillar.__table__, {"name": "Brain Health"}),
+])
+def test_outside_write_changes_etag(client, database, table, values):
+    etag = client.get("/pillars").headers["etag"]
+
+    # Raw SQL from another process bypasses the session hooks that bump the version
+    with database.begin() as connection:
+        connection.execute(insert(table).values(**values))
+
+    response = client.get("/pillars", headers={"If-None-Match": etag})
+
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
@@ -0,0 +1,137 @@
+"""Tests for the two-tier response cache."""
+
+import asyncio
+import time
+
+import fakeredis
+import pytest
+from fastapi import Response
+
+from app.config import settings
+from app.core import data_version
+from app.core.cache import LRUCache, ResponseCache, cache_key, normalize_params
+from app.core.redis import set_redis_clients
+
+
+@pytest.fixture
+def server(monkeypatch):
+    """A fake Redis shared by this process and simulated other workers."""
+    server = fakeredis.FakeServer()
+    set_redis_clients(fakeredis.FakeRedis(server=server), fakeredis.FakeAsyncRedis(server=server))
+    monkeypatch.setattr(settings, "REDIS_ENABLED", True)
+    monkeypatch.setattr(settings, "RESPONSE_CACHE_ENABLED", True)
+    monkeypatch.setattr(settings, "DATA_VERSION_CHECK_SECONDS", 0.0)
+    monkeypatch.setattr(data_version, "_version", 0)
+    monkeypatch.setattr(data_version, "_checked_at", 0.0)
+    yield server
+    set_redis_clients(None, None)
+
+
+def make_cache() -> ResponseCache:
+    return ResponseCache(local_size=8, local_ttl_seconds=60, ttl_seconds=60)
+
+
+class Renderer:
+    """Counts renders of a fixed response."""
+
+    def __init__(self, body: bytes = b'{"data":[]}', status_code: int = 200):
+        self.body = body
+        self.status_code = status_code
+        self.calls = 0
+
+    async def __call__(self) -> Response:
+        self.calls += 1
+        return Response(self.body, status_code=self.status_code, media_type="application/json")
+
+
+async def _settle():
+    """Let background Redis calls started by data_version finish."""
+    await asyncio.gather(*data_version._tasks)
+
+
+def test_lru_evicts_least_recently_used_at_capacity():
+    cache = LRUCache(maxsize=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+
+    cache.set("c", 3)
+
+    assert len(cache) == 2
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+
+
+def test_lru_entries_expire_after_ttl():
+    cache = LRUCache(maxsize=2, ttl_seconds=0.01)
+    cache.set("a", 1)
+    time.sleep(0.02)
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_normalize_params_ignores_order_and_none_values():
+    assert normalize_params({"year": 2020, "pillar_id": 1, "country_codes": None}) == normalize_params(
+        {"pillar_id": 1, "year": 2020}
+    )
+    assert cache_key("values", {"a": 1, "b": 2}, 3) == cache_key("values", {"b": 2, "a": 1}, 3)
+    assert cache_key("values", {"a": 1}, 3) != cache_key("values", {"a": 1}, 4)
+    assert cache_key("values", {"a": 1}, 3) != cache_key("map", {"a": 1}, 3)
+
+
+async def test_second_request_is_served_from_local_tier(server):
+    cache = make_cache()
+    render = Renderer()
+
+    first = await cache.get_or_render("values", {"pillar_id": 1}, render)
+    second = await cache.get_or_render("values", {"pillar_id": 1}, render)
+
+    assert first.headers["X-Cache"] == "MISS"
+    assert second.headers["X-Cache"] == "HIT"
+    assert second.body == render.body
+    assert second.media_type == "application/json"
+    assert render.calls == 1
+    assert cache.stats["values"].local_hits == 1
+
+
+async def test_other_worker_is_served_from_redis_tier(server):
+    render = Renderer()
+    await make_cache().get_or_render("values", {"pillar_id": 1, "year": 2020}, render)
+
+    other_worker = make_cache()
+    response = await other_worker.get_or_render("values", {"year": 2020, "pillar_id": 1}, render)
+
+    assert response.headers["X-Cache"] == "HIT"
+    assert response.body == render.body
+    assert render.calls == 1
+    assert other_worker.stats["values"].redis_hits == 1
+    # Promoted into the local tier
+    assert len(other_worker.local) == 1
+
+
+async def test_version_bump_invalidates_entries(server):
+    cache = make_cache()
+    render = Renderer()
+    await cache.get_or_render("values", {"pillar_id": 1}, render)
+
+    data_version.bump()
+    await _settle()
+    response = await cache.get_or_render("values", {"pillar_id": 1}, render)
+
+    assert response.headers["X-Cache"] == "MISS"
+    assert render.calls == 2
+
+
+async def test_error_responses_are_not_cached(server):
+    cache = make_cache()
+    render = Renderer(b'{"detail":"Not Found"}', status_code=404)
+
+    for _ in range(2):
+        response = await cache.get_or_render("values", {"pillar_id": 99}, render)
+        assert response.status_code == 404
+        assert response.headers["X-Cache"] == "MISS"
+
+    assert render.calls == 2
+    assert len(cache.local) == 0
+    assert not fakeredis.FakeRedis(server=server).keys("bc:values:*")
@@ -0,0 +1,105 @@
+"""Tests for dataset version tracking across workers."""
+
+import asyncio
+
+import fakeredis
+import pytest
+
+from app.config import settings
+from app.core import data_version
+from app.core.redis import redis_available, set_redis_clients
+
+
+@pytest.fixture
+def server(monkeypatch):
+    """A fake Redis shared by this process and simulated other workers."""
+    server = fakeredis.FakeServer()
+    set_redis_clients(fakeredis.FakeRedis(server=server), fakeredis.FakeAsyncRedis(server=server))
+    monkeypatch.setattr(settings, "REDIS_ENABLED", True)
+    monkeypatch.setattr(settings, "DATA_VERSION_CHECK_SECONDS", 0.0)
+    monkeypatch.setattr(data_version, "_version", 0)
+    monkeypatch.setattr(data_version, "_checked_at", 0.0)
+    yield server
+    set_redis_clients(None, None)
+
+
+@pytest.fixture
+def other_worker(server):
+    """Sync client of another process sharing the Redis server."""
+    return fakeredis.FakeRedis(server=server)
+
+
+async def _settle():
+    """Let background Redis calls started by the module finish."""
+    await asyncio.gather(*data_version._tasks)
+
+
+def test_bump_without_event_loop_increments_shared_version(other_worker):
+    assert data_version.bump() == 1
+    assert data_version.bump() == 2
+    assert int(other_worker.get(data_version.VERSION_KEY)) == 2
+
+
+def test_current_without_event_loop_sees_other_workers_bump(other_worker):
+    other_worker.set(data_version.VERSION_KEY, 7)
+    other_worker.set(data_version.UPDATED_AT_KEY, 1234.5)
+    assert data_version.current() == 7
+    assert data_version.updated_at() == 1234.5
+
+
+async def test_refresh_sees_other_workers_bump(other_worker):
+    other_worker.set(data_version.VERSION_KEY, 5)
+    assert await data_version.refresh() == 5
+
+
+async def test_bump_on_event_loop_publishes_in_background(other_worker):
+    assert data_version.bump() == 1
+    await _settle()
+    assert int(other_worker.get(data_version.VERSION_KEY)) == 1
+
+    other_worker.set(data_version.VERSION_KEY, 10)
+    data_version.bump()
+    await _settle()
+    # Adopts the shared counter once Redis answers
+    assert data_version.current() == 11
+
+
+async def test_current_on_event_loop_never_calls_sync_client(other_worker, monkeypatch):
+    def blocking_call():
+        raise AssertionError("sync Redis client used on the event loop")
+
+    monkeypatch.setattr(data_version, "get_redis", blocking_call)
+    other_worker.set(data_version.VERSION_KEY, 3)
+    assert data_version.current() == 0  # refreshed in the background
+    await _settle()
+    assert data_version.current() == 3
+
+
+async def test_version_never_moves_backwards(other_worker):
+    other_worker.set(data_version.VERSION_KEY, 2)
+    data_version._version = 4
+    assert await data_version.refresh() == 4
+
+    data_version.bump()
+    await _settle()
+    # Redis was behind, so it is brought up to the local version
+    assert int(other_worker.get(data_version.VERSION_KEY)) == 5
+
+
+def test_bump_falls_back_to_local_version_when_redis_is_down(server):
+    server.connected = False
+    assert data_version.bump() == 1
+    assert not redis_available()
+    assert data_version.bump() == 2
+    assert data_version.current() == 2
+
+
+async def test_refresh_falls_back_to_local_version_when_redis_is_down(server):
+    data_version._version = 3
+    server.connected = False
+    assert await data_version.refresh() == 3
+    assert not redis_available()
+
+    data_version.bump()
+    await _settle()
+    assert data_version.current() == 4
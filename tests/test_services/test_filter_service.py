@@ -0,0 +1,64 @@
+"""Tests for the filter service's query paths."""
+
+import json
+from types import SimpleNamespace
+
+from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models import IndicatorFact
+from app.schemas.filter import FilterParams
+from app.services.filter_service import Explain, FilterService
+
+
+class PlanResult:
+    def __init__(self, rows: int):
+        self.rows = rows
+
+    def scalar(self):
+        return json.dumps([{"Plan": {"Plan Rows": self.rows}}])
+
+
+def postgres_session(executed: list) -> Session:
+    """A session that builds queries normally but plans them as Postgres would."""
+    session = Session(bind=create_engine("sqlite://"))
+    dialect = postgresql.dialect()
+    session.get_bind = lambda *args, **kwargs: SimpleNamespace(dialect=dialect)
+
+    def execute(statement, *args, **kwargs):
+        executed.append(statement)
+        return PlanResult(42)
+
+    session.execute = execute
+    return session
+
+
+def test_estimate_keeps_filter_values_as_bound_parameters():
+    executed = []
+    service = FilterService(postgres_session(executed))
+    filters = FilterParams(country_codes=":x,KEN'; --", year_start=2020)
+
+    assert service.estimate_filtered_values(filters) == 42
+
+    [statement] = executed
+    assert isinstance(statement, Explain)
+    compiled = statement.compile(dialect=postgresql.dialect())
+    sql = str(compiled)
+    assert sql.startswith("EXPLAIN (FORMAT JSON) SELECT")
+    assert ":x" not in sql and "KEN" not in sql
+    params = compiled.construct_params()
+    assert sorted(params[name] for name in params if name.startswith("country_code")) == [
+        [":X", "KEN'; --"]
+    ]
+    assert 2020 in params.values()
+
+
+def test_estimate_falls_back_to_exact_count_off_postgres(monkeypatch):
+    monkeypatch.setattr(settings, "CUBE_ENABLED", False)
+    engine = create_engine("sqlite://")
+    IndicatorFact.__table__.create(engine)
+    with Session(engine) as session:
+        filters = FilterParams(country_codes=":x")
+        assert FilterService(session).estimate_filtered_values(filters) == 0
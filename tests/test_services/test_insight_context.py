@@ -0,0 +1,39 @@
+"""Tests for building insight prompt context from a data slice."""
+
+import warnings
+
+import numpy as np
+
+from app.services.insight_context import ContextSlice, _country_lines, summarize
+
+
+def make_slice() -> ContextSlice:
+    """Two countries, one indicator with data and one nobody reports."""
+    values = np.full((2, 2, 3), np.nan)
+    values[0, 0] = [50.0, 55.0, 60.0]
+    values[1, 0] = [40.0, np.nan, 45.0]
+    return ContextSlice(
+        country_codes=np.array(["KEN", "UGA"], dtype=object),
+        country_names=np.array(["Kenya", "Uganda"], dtype=object),
+        regions=np.array(["Africa", "Africa"], dtype=object),
+        indicator_names=np.array(["Literacy", "Sleep"], dtype=object),
+        units=np.array(["%", "hours"], dtype=object),
+        dimension_names=np.array(["Skills", "Health"], dtype=object),
+        pillar_names=np.array(["Drivers", "Health"], dtype=object),
+        years=np.array([2020, 2021, 2022]),
+        values=values,
+    )
+
+
+def test_country_lines_skip_unreported_indicators_without_warnings():
+    data = make_slice()
+    stats = summarize(data)
+
+    with warnings.catch_warnings():
+        warnings.simplefilter("error")
+        header, lines = _country_lines(data, stats, 0)
+
+    assert header.startswith("Kenya (KEN), Africa, 2020-2022.")
+    assert len(lines) == 1
+    assert lines[0].startswith("- Literacy (%): 60 in 2022")
+    assert "rank 1/2" in lines[0]
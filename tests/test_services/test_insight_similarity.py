@@ -0,0 +1,70 @@
+"""Tests for the near-duplicate insight index."""
+
+import threading
+
+from app.services import insight_similarity
+from app.services.insight_similarity import InsightSimilarityIndex
+from app.services.taxonomy_cache import Taxonomy
+
+TAXONOMY = Taxonomy(version=1, loaded_at=0.0, pillars=())
+STORED = [
+    ("kenya-2015", {"insight_type": "country", "country_code": "KEN", "year_start": 2015, "year_end": 2022}),
+    ("uganda-2015", {"insight_type": "country", "country_code": "UGA", "year_start": 2015, "year_end": 2022}),
+]
+
+
+class FakeSession:
+    """Runs sync callables like AsyncSession.run_sync, counting calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def run_sync(self, fn, *args):
+        self.calls += 1
+        return fn(None, *args)
+
+
+def make_index(monkeypatch, rows=STORED) -> InsightSimilarityIndex:
+    monkeypatch.setattr(insight_similarity.taxonomy_cache, "get", lambda db: TAXONOMY)
+    index = InsightSimilarityIndex(threshold=0.8, text_weight=0.3, reload_seconds=60)
+    monkeypatch.setattr(index, "_fetch", lambda db: (rows, TAXONOMY))
+    return index
+
+
+async def test_refresh_builds_off_the_event_loop(monkeypatch):
+    index = make_index(monkeypatch)
+    build = index._build
+    threads = []
+
+    def recording_build(rows, taxonomy):
+        threads.append(threading.get_ident())
+        return build(rows, taxonomy)
+
+    monkeypatch.setattr(index, "_build", recording_build)
+    await index.refresh(FakeSession())
+
+    assert threads and threads[0] != threading.get_ident()
+    assert index.stats_dict()["entries"] == 2
+
+
+async def test_refresh_only_reloads_when_due(monkeypatch):
+    index = make_index(monkeypatch)
+    db = FakeSession()
+
+    await index.refresh(db)
+    await index.refresh(db)
+
+    assert db.calls == 1
+
+
+async def test_finds_overlapping_request_after_refresh(monkeypatch):
+    index = make_index(monkeypatch)
+    params = {"insight_type": "country", "country_code": "KEN", "year_start": 2016, "year_end": 2022}
+    assert index.find(None, params) is None  # not loaded yet
+
+    await index.refresh(FakeSession())
+    cache_key, score = index.find(None, params)
+
+    assert cache_key == "kenya-2015"
+    assert score >= 0.8
+    assert index.find(None, {**params, "year_start": 2021}) is None
@@ -0,0 +1,80 @@
+"""Tests for creating monthly insight partitions."""
+
+from datetime import datetime
+
+from sqlalchemy.exc import OperationalError
+
+from app.services import insight_sweeper
+from app.services.insight_sweeper import DEFAULT_PARTITION, create_partitions, partition_name
+
+
+class PartitionedSession:
+    """Records the SQL a sweep runs against a partitioned ai_insights."""
+
+    def __init__(self, stranded: bool = False, failing: str | None = None):
+        self.stranded = stranded  # rows for new months are in the default partition
+        self.failing = failing  # partition whose creation fails
+        self.statements: list[str] = []
+        self.commits = 0
+        self.rollbacks = 0
+
+    def execute(self, statement, params=None):
+        sql = str(statement)
+        if self.failing and f'"{self.failing}" PARTITION OF' in sql:
+            raise OperationalError(sql, params, Exception("lock timeout"))
+        self.statements.append(sql)
+        return self
+
+    def scalar(self):
+        return self.stranded
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        self.rollbacks += 1
+
+
+def months(monkeypatch, n: int) -> list[str]:
+    """Names of the partitions from this month to n months on, with none existing."""
+    monkeypatch.setattr(insight_sweeper, "_partitions", lambda db: {})
+    this_month = datetime.utcnow().date().replace(day=1)
+    return [partition_name(insight_sweeper._add_months(this_month, k)) for k in range(n + 1)]
+
+
+def test_creates_missing_partitions(monkeypatch):
+    names = months(monkeypatch, 1)
+    db = PartitionedSession()
+
+    assert create_partitions(db, months_ahead=1) == names
+
+    creates = [sql for sql in db.statements if sql.startswith("CREATE TABLE")]
+    assert [f'"{name}" PARTITION OF' in sql for name, sql in zip(names, creates)] == [True, True]
+    assert not any("DETACH" in sql for sql in db.statements)
+    assert db.commits == 2
+
+
+def test_moves_rows_out_of_default_partition(monkeypatch):
+    [name] = months(monkeypatch, 0)
+    db = PartitionedSession(stranded=True)
+
+    assert create_partitions(db, months_ahead=0) == [name]
+
+    steps = [sql.split(" (")[0] for sql in db.statements[1:]]
+    assert steps == [
+        f'ALTER TABLE ai_insights DETACH PARTITION "{DEFAULT_PARTITION}"',
+        f'CREATE TABLE IF NOT EXISTS "{name}" PARTITION OF ai_insights FOR VALUES FROM',
+        f'INSERT INTO "{name}" SELECT * FROM "{DEFAULT_PARTITION}" WHERE generated_at >= :start AND generated_at < :end',
+        f'DELETE FROM "{DEFAULT_PARTITION}" WHERE generated_at >= :start AND generated_at < :end',
+        f'ALTER TABLE ai_insights ATTACH PARTITION "{DEFAULT_PARTITION}" DEFAULT',
+    ]
+    assert db.commits == 1
+
+
+def test_failed_month_is_skipped(monkeypatch):
+    first, second = months(monkeypatch, 1)
+    db = PartitionedSession(failing=first)
+
+    assert create_partitions(db, months_ahead=1) == [second]
+    assert db.rollbacks == 1
+    assert db.commits == 1
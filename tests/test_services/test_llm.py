@@ -0,0 +1,83 @@
+"""Tests for streamed completions."""
+
+from typing import AsyncIterator
+
+import pytest
+
+from app.services.llm import Completion, CompletionStream, RuleBasedProvider
+
+MESSAGES = [{"role": "user", "content": "Summarize the data."}]
+
+
+def fake_model(chunks: list[str], closed: list[bool]) -> CompletionStream:
+    """A model yielding fixed chunks, recording whether its generator was closed."""
+
+    async def generate(stream: CompletionStream) -> AsyncIterator[str]:
+        try:
+            for chunk in chunks:
+                yield chunk
+            stream.completion = Completion(
+                text="".join(chunks),
+                provider="fake",
+                model="test",
+                prompt_tokens=5,
+                completion_tokens=len(chunks),
+                latency_ms=1.0,
+            )
+        finally:
+            closed.append(True)
+
+    return CompletionStream(generate)
+
+
+async def test_completion_is_set_once_stream_is_exhausted():
+    closed = []
+    stream = fake_model(["Brain ", "capital ", "rose."], closed)
+    assert stream.completion is None
+
+    received = [chunk async for chunk in stream]
+
+    assert received == ["Brain ", "capital ", "rose."]
+    assert stream.completion.text == "Brain capital rose."
+    assert stream.completion.model_version == "fake:test"
+    assert closed == [True]
+
+
+async def test_closing_stream_early_leaves_completion_unset():
+    closed = []
+    stream = fake_model(["Brain ", "capital ", "rose."], closed)
+
+    assert await anext(aiter(stream)) == "Brain "
+    await stream.aclose()  # what the server does when the client disconnects
+
+    assert stream.completion is None
+    assert closed == [True]
+
+
+async def test_rule_based_provider_streams_word_by_word():
+    stream = RuleBasedProvider("Scores rose in 2022.").stream(MESSAGES)
+
+    received = [chunk async for chunk in stream]
+
+    assert received == ["Scores ", "rose ", "in ", "2022."]
+    assert stream.completion.text == "Scores rose in 2022."
+    assert stream.completion.provider == "rule-based"
+    assert stream.completion.prompt_tokens > 0
+
+
+async def test_rule_based_completion_matches_stream():
+    provider = RuleBasedProvider("Scores rose in 2022.")
+    stream = provider.stream(MESSAGES)
+    async for _ in stream:
+        pass
+
+    completion = await provider.complete(MESSAGES)
+    assert stream.completion.text == completion.text
+    assert stream.completion.completion_tokens == completion.completion_tokens
+
+
+@pytest.mark.parametrize("text", ["", "   "])
+async def test_rule_based_stream_of_empty_text(text):
+    stream = RuleBasedProvider(text).stream(MESSAGES)
+    assert [chunk async for chunk in stream] == []
+    assert stream.completion.text == text
@@ -0,0 +1,150 @@
+"""Tests for streaming insights to the insight panel over server-sent events."""
+
+from datetime import datetime
+from typing import AsyncIterator
+
+import pytest
+
+from app.schemas.insight import Insight, InsightGenerateRequest
+from app.services.llm import Completion, CompletionStream
+from app.web import htmx
+from app.web.templates import templates
+
+REQUEST = InsightGenerateRequest(insight_type="country", country_code="KEN")
+
+
+def make_insight(text: str, insight_id: int = 1) -> Insight:
+    return Insight(
+        id=insight_id,
+        insight_type="country",
+        insight_text=text,
+        confidence_score=0.75,
+        model_version="fake:test",
+        country_id=None,
+        indicator_id=None,
+        pillar_id=None,
+        dimension_id=None,
+        year_start=None,
+        year_end=None,
+        generated_at=datetime(2026, 1, 1),
+        expires_at=None,
+        user_feedback=None,
+    )
+
+
+def parse_events(raw: list[str]) -> list[tuple[str, str]]:
+    """(event, data) pairs from formatted server-sent events."""
+    events = []
+    for block in raw:
+        lines = block.rstrip("\n").split("\n")
+        event = lines[0].removeprefix("event: ")
+        data = "\n".join(line.removeprefix("data: ") for line in lines[1:])
+        events.append((event, data))
+    return events
+
+
+class FakeModel:
+    """Stands in for the insight helpers the event stream calls."""
+
+    def __init__(self, chunks: list[str], stored: Insight | None = None, fail_after: int | None = None):
+        self.chunks = chunks
+        self.stored = stored
+        self.fail_after = fail_after
+        self.saved: list[Completion] = []
+        self.closed = False
+
+    async def find_stored_insight(self, cache_key: str) -> Insight | None:
+        return self.stored
+
+    async def find_similar_insight(self, request: InsightGenerateRequest) -> Insight | None:
+        return None
+
+    async def stream_insight(self, request: InsightGenerateRequest) -> CompletionStream:
+        async def generate(stream: CompletionStream) -> AsyncIterator[str]:
+            try:
+                for n, chunk in enumerate(self.chunks):
+                    if n == self.fail_after:
+                        raise RuntimeError("model went away")
+                    yield chunk
+                stream.completion = Completion(
+                    text="".join(self.chunks),
+                    provider="fake",
+                    model="test",
+                    prompt_tokens=5,
+                    completion_tokens=len(self.chunks),
+                    latency_ms=1.0,
+                )
+            finally:
+                self.closed = True
+
+        return CompletionStream(generate)
+
+    async def save_insight(self, request: InsightGenerateRequest, completion: Completion) -> Insight:
+        self.saved.append(completion)
+        return make_insight(completion.text, insight_id=7)
+
+
+@pytest.fixture
+def install(monkeypatch):
+    def install(model: FakeModel) -> FakeModel:
+        for name in ("find_stored_insight", "find_similar_insight", "stream_insight", "save_insight"):
+            monkeypatch.setattr(htmx, name, getattr(model, name))
+        return model
+
+    return install
+
+
+async def test_streams_tokens_then_stored_insight(install):
+    model = install(FakeModel(["Kenya ", "ranks ", "third."]))
+
+    events = parse_events([event async for event in htmx._insight_events(REQUEST)])
+
+    assert events[:3] == [("token", "Kenya "), ("token", "ranks "), ("token", "third.")]
+    assert events[3][0] == "done"
+    assert "Kenya ranks third." in events[3][1]
+    assert "/htmx/insights/7/feedback" in events[3][1]
+    assert [completion.text for completion in model.saved] == ["Kenya ranks third."]
+
+
+async def test_stored_insight_is_sent_without_streaming(install):
+    model = install(FakeModel(["unused"], stored=make_insight("Already stored.")))
+
+    events = parse_events([event async for event in htmx._insight_events(REQUEST)])
+
+    assert [event for event, _ in events] == ["done"]
+    assert "Already stored." in events[0][1]
+    assert model.saved == []
+
+
+async def test_disconnect_mid_stream_stores_nothing(install):
+    model = install(FakeModel(["Kenya ", "ranks ", "third."]))
+    events = htmx._insight_events(REQUEST)
+
+    first = await anext(events)
+    await events.aclose()  # the client went away
+
+    assert parse_events([first]) == [("token", "Kenya ")]
+    assert model.closed
+    assert model.saved == []
+
+
+async def test_model_failure_sends_failed_event(install):
+    model = install(FakeModel(["Kenya ", "ranks ", "third."], fail_after=1))
+
+    events = parse_events([event async for event in htmx._insight_events(REQUEST)])
+
+    assert events[0] == ("token", "Kenya ")
+    assert events[-1] == ("failed", "Insight generation failed, please try again.")
+    assert model.saved == []
+
+
+def test_sse_event_splits_multiline_data():
+    assert htmx._sse_event("done", "<p>\n</p>") == "event: done\ndata: <p>\ndata: </p>\n\n"
+
+
+def test_panel_keeps_htmx_job_path_as_fallback():
+    html = templates.get_template("components/insight_panel.html").render()
+
+    assert 'hx-post="/htmx/insights/generate"' in html
+    assert "data-stream-insight" in html
+    assert "onclick" not in html